@@ -20,5 +20,8 @@ def stop(context):
         # This will run the start function in each of your commands as defined in commands/__init__.py
         commands.stop()
 
+        # Writes the log messages that are still in memory
+        futil.logger.close()
+
     except:
         futil.handle_error("stop")
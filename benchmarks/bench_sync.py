@@ -0,0 +1,162 @@
+"""Measures the sync engine against fake designs of 10 to 10 000 user parameters
+
+Runs on any Python 3 install without Fusion 360:
+
+    python benchmarks/bench_sync.py [--latency SECONDS] [--sizes 10 100 ...] [--json]
+
+For each size it reports the time, API calls and peak memory of a tick in these scenarios:
+initial full sync, idle tick, writing one moved slider, rereading the parameters computed from
+it, resyncing after an external change and switching back to a design from the document cache.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+from fake_adsk import FakeDesign, FakeValueInput
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "commands",
+    "AdvancedParameters",
+)
+
+
+def load_package():
+    """Imports the engine's modules without running the add-in's __init__ or importing adsk"""
+
+    package = types.ModuleType("advanced_parameters")
+    package.__path__ = [ADDIN_DIR]
+    sys.modules["advanced_parameters"] = package
+
+    sync_engine = importlib.import_module("advanced_parameters.sync_engine")
+    ranges = importlib.import_module("advanced_parameters.ranges")
+
+    return sync_engine.ParameterSyncEngine, ranges.SliderRange
+
+
+ParameterSyncEngine, SliderRange = load_package()
+
+
+class ActiveDesign:
+    """Stands in for the active product so the benchmark can switch designs"""
+
+    def __init__(self, design):
+        self.active = design
+
+
+def create_engine(design):
+    return ParameterSyncEngine(
+        lambda: design.active if isinstance(design, ActiveDesign) else design,
+        FakeValueInput.createByReal,
+        SliderRange(0, 1000, 1),
+    )
+
+
+def measure(engine, design, now):
+    """Runs one tick and returns its time in milliseconds, engine and fake API calls and peak KiB"""
+
+    calls_before = design.calls
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    engine.tick(now)
+
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "ms": duration * 1000,
+        "engine calls": engine.api_calls.last_tick,
+        "fake calls": design.calls - calls_before,
+        "peak KiB": peak / 1024,
+    }
+
+
+def run_size(size, latency):
+    design = FakeDesign.with_parameters(size, latency)
+    active_design = ActiveDesign(design)
+    engine = create_engine(active_design)
+    now = 100.0
+    results = {}
+
+    engine.change_tracker.mark_all()
+    results["initial full sync"] = measure(engine, design, now)
+
+    now += 0.05
+    results["idle tick"] = measure(engine, design, now)
+
+    # Moves a length slider that another parameter is computed from, the write is released
+    # as soon as the scheduler allows
+    key = engine.table.names[min(8, size - 1)]
+    engine.move_slider(key, engine.slider_values[key] + 1)
+    now += 1
+    results["single slider write"] = measure(engine, design, now)
+
+    # Only the parameters computed from the written one are reread
+    now += 0.05
+    results["dependent refresh"] = measure(engine, design, now)
+
+    design.change_externally(size // 2, 12.3)
+    engine.change_tracker.mark_all()
+    now += 0.05
+    results["external change resync"] = measure(engine, design, now)
+
+    # Switching back to a design that was active recently restores its cached state
+    active_design.active = FakeDesign.with_parameters(10, latency)
+    engine.change_tracker.mark_all()
+    now += 0.05
+    engine.tick(now)
+
+    active_design.active = design
+    engine.change_tracker.mark_all()
+    now += 0.05
+    results["switch back to design"] = measure(engine, design, now)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--latency", type=float, default=0, help="Simulated recompute seconds"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000]
+    )
+    parser.add_argument("--json", action="store_true", help="Prints results as JSON")
+    args = parser.parse_args()
+
+    results = {size: run_size(size, args.latency) for size in args.sizes}
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return
+
+    print(
+        "%8s  %-24s %10s %13s %11s %10s"
+        % ("size", "scenario", "ms", "engine calls", "fake calls", "peak KiB")
+    )
+    for size, scenarios in results.items():
+        for scenario, values in scenarios.items():
+            print(
+                "%8d  %-24s %10.3f %13d %11d %10.1f"
+                % (
+                    size,
+                    scenario,
+                    values["ms"],
+                    values["engine calls"],
+                    values["fake calls"],
+                    values["peak KiB"],
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
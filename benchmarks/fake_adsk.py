@@ -0,0 +1,234 @@
+"""Pure Python stand-in for the parts of a Fusion 360 design that the sync engine uses
+
+Every property read or write of a fake object is counted in calls, and writing a value
+sleeps for the design's recompute latency unless compute is deferred.
+"""
+
+import itertools
+import time
+
+
+class FakeValueInput:
+    __slots__ = ("realValue",)
+
+    def __init__(self, value):
+        self.realValue = value
+
+    @staticmethod
+    def createByReal(value):
+        return FakeValueInput(value)
+
+
+class FakeUserParameter:
+    def __init__(self, design, name, value, unit, comment=""):
+        self._design = design
+        self._name = name
+        self._value = value
+        self._unit = unit
+        self._comment = comment
+        self._source = None  # Parameter this one's expression multiplies, if it is derived
+        self._factor = 1
+
+    @property
+    def name(self):
+        self._design.calls += 1
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._design.calls += 1
+        self._name = name
+
+    @property
+    def value(self):
+        self._design.calls += 1
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._design.calls += 1
+        self._set(value)
+        self._design.compute()
+
+    @property
+    def unit(self):
+        self._design.calls += 1
+        return self._unit
+
+    @property
+    def expression(self):
+        self._design.calls += 1
+        if self._source is not None:
+            return "%s * %g" % (self._source._name, self._factor)
+        return "%g %s" % (self._value * (10 if self._unit == "mm" else 1), self._unit)
+
+    @property
+    def comment(self):
+        self._design.calls += 1
+        return self._comment
+
+    @comment.setter
+    def comment(self, comment):
+        self._design.calls += 1
+        self._comment = comment
+
+    def _set(self, value):
+        """Sets a literal value, which replaces the expression of a derived parameter"""
+
+        self._value = value
+        self._source = None
+
+    def deleteMe(self):
+        self._design.calls += 1
+        self._design.userParameters._items.remove(self)
+        return True
+
+
+class FakeUserParameters:
+    def __init__(self, design):
+        self._design = design
+        self._items = []
+
+    @property
+    def count(self):
+        self._design.calls += 1
+        return len(self._items)
+
+    def item(self, index):
+        self._design.calls += 1
+        return self._items[index]
+
+    def itemByName(self, name):
+        self._design.calls += 1
+        for parameter in self._items:
+            if parameter._name == name:
+                return parameter
+        return None
+
+    def add(self, name, value_input, unit, comment):
+        self._design.calls += 1
+        parameter = FakeUserParameter(self._design, name, value_input.realValue, unit, comment)
+        self._items.append(parameter)
+        return parameter
+
+
+class FakeAttribute:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeAttributes:
+    def __init__(self, design):
+        self._design = design
+        self._items = {}
+
+    def itemByName(self, group, name):
+        self._design.calls += 1
+        return self._items.get((group, name))
+
+    def add(self, group, name, value):
+        self._design.calls += 1
+        attribute = self._items[(group, name)] = FakeAttribute(value)
+        return attribute
+
+
+class FakeDocument:
+    _ids = itertools.count()
+
+    def __init__(self):
+        self.creationId = "document-%d" % next(self._ids)
+
+
+class FakeUnitsManager:
+    # One of each unit in internal units
+    _INTERNAL_VALUES = {"mm": 0.1, "cm": 1, "m": 100, "in": 2.54, "ft": 30.48, "deg": 0.0174533}
+
+    def __init__(self, design):
+        self._design = design
+
+    @property
+    def defaultLengthUnits(self):
+        self._design.calls += 1
+        return "mm"
+
+    def evaluateExpression(self, expression, units):
+        self._design.calls += 1
+        return float(expression) * self._INTERNAL_VALUES.get(units, 1)
+
+
+class FakeDesign:
+    """A design with user parameters that takes latency seconds to recompute"""
+
+    def __init__(self, latency=0):
+        self.latency = latency
+        self.calls = 0
+        self.computes = 0
+        self.userParameters = FakeUserParameters(self)
+        self.attributes = FakeAttributes(self)
+        self.unitsManager = FakeUnitsManager(self)
+        self.parentDocument = FakeDocument()
+        self._is_compute_deferred = False
+
+    @classmethod
+    def with_parameters(cls, count, latency=0, derived_every=10):
+        """Creates a design with count length and angle parameters
+
+        Every derived_every-th length parameter is twice the one before it.
+        """
+
+        design = cls(latency)
+        items = design.userParameters._items
+        for index in range(count):
+            unit = "deg" if index % 4 == 3 else "mm"
+            parameter = FakeUserParameter(design, "p%d" % index, (index % 100) / 10, unit)
+
+            if derived_every and index % derived_every == derived_every - 1 and unit == "mm":
+                source = items[index - 1]
+                if source._unit == "mm":
+                    parameter._source = source
+                    parameter._factor = 2
+
+            items.append(parameter)
+
+        design.compute()
+        return design
+
+    @property
+    def isComputeDeferred(self):
+        return self._is_compute_deferred
+
+    @isComputeDeferred.setter
+    def isComputeDeferred(self, is_deferred):
+        self.calls += 1
+        was_deferred = self._is_compute_deferred
+        self._is_compute_deferred = is_deferred
+        if was_deferred and not is_deferred:
+            self.compute()
+
+    def modifyParameters(self, parameters, value_inputs):
+        """Sets several values with one recompute"""
+
+        self.calls += 1
+        for parameter, value_input in zip(parameters, value_inputs):
+            parameter._set(value_input.realValue)
+        self.compute()
+        return True
+
+    def compute(self):
+        # Derived parameters are created after their sources, so one pass updates them all
+        for parameter in self.userParameters._items:
+            if parameter._source is not None:
+                parameter._value = parameter._source._value * parameter._factor
+
+        if not self._is_compute_deferred:
+            self.computes += 1
+            if self.latency > 0:
+                time.sleep(self.latency)
+
+    def change_externally(self, index, value):
+        """Changes a value as the parameters dialog would, without counting it as a call"""
+
+        self.userParameters._items[index]._set(value)
+        self.compute()
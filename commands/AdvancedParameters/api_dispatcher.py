@@ -0,0 +1,109 @@
+import queue
+import threading
+import time
+
+from .instrumentation import Instrumentation
+
+
+class ApiDispatcher:
+    """Runs Fusion API calls posted by the window thread on Fusion's main thread
+
+    The window thread submits functions, which are queued and all run the next time the custom
+    event fires on the main thread, so one event carries every operation posted since the last.
+    Results are queued back and handed to their callbacks when the window thread polls.
+
+    Arguments:
+    fire -- Fires the custom event that calls run() on the main thread.
+    on_error -- Called with the exception of an operation that was submitted without its own
+    on_error, so an error the window does not handle does not escape poll().
+    """
+
+    def __init__(self, fire, instrumentation=None, on_error=None):
+        self._fire = fire
+        self.on_error = on_error
+        self._requests = queue.SimpleQueue()
+        self._results = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._is_fired = False
+        self.instrumentation = instrumentation or Instrumentation()
+        self.fires = 0
+        self.operations = 0
+
+    @property
+    def operations_per_fire(self):
+        return self.operations / self.fires if self.fires > 0 else 0
+
+    def submit(self, function, callback=None, on_error=None):
+        """Queues a function to run on the main thread, firing the event if it is not already pending
+
+        Arguments:
+        function -- Called with no arguments on the main thread.
+        callback -- Called with the function's result when the window thread polls.
+        on_error -- Called with the exception if the function raises, otherwise the dispatcher's
+        on_error is, or poll() raises it if there is neither.
+        """
+
+        self._requests.put((function, callback, on_error, time.perf_counter()))
+
+        with self._lock:
+            if self._is_fired:
+                return
+            self._is_fired = True
+
+        try:
+            self._fire()
+        except:
+            with self._lock:
+                self._is_fired = False
+            raise
+
+    def run(self):
+        """Runs every queued operation, called by the custom event handler on the main thread"""
+
+        # Operations submitted while these run fire another event
+        with self._lock:
+            self._is_fired = False
+
+        instrumentation = self.instrumentation
+        count = 0
+
+        while True:
+            try:
+                function, callback, on_error, submitted = self._requests.get_nowait()
+            except queue.Empty:
+                break
+
+            if instrumentation.enabled:
+                instrumentation.observe(
+                    "dispatch wait ms", (time.perf_counter() - submitted) * 1000
+                )
+
+            try:
+                self._results.put((callback, on_error, function(), None))
+            except Exception as err:
+                self._results.put((callback, on_error, None, err))
+
+            count += 1
+
+        if count > 0:
+            self.fires += 1
+            self.operations += count
+            instrumentation.observe("operations per fire", count)
+
+    def poll(self):
+        """Hands finished operations to their callbacks, called on the window thread"""
+
+        while True:
+            try:
+                callback, on_error, result, error = self._results.get_nowait()
+            except queue.Empty:
+                return
+
+            if error is not None:
+                on_error = on_error or self.on_error
+                if on_error is None:
+                    raise error
+                on_error(error)
+
+            elif callback is not None:
+                callback(result)
@@ -0,0 +1,31 @@
+import contextlib
+
+
+@contextlib.contextmanager
+def deferred_compute(design):
+    """Holds back the design's recompute while the block changes it, then computes it once"""
+
+    design.isComputeDeferred = True
+
+    try:
+        yield
+    finally:
+        design.isComputeDeferred = False  # Turning deferral off computes the design once
+
+
+def write_values(design, items, values, create_value_input):
+    """Writes real values to user parameters with one recompute, returns whether they were batched
+
+    Several parameters are written with modifyParameters, which older versions of Fusion 360 do
+    not have, so they are then written one at a time.
+    """
+
+    if len(items) > 1 and hasattr(design, "modifyParameters"):
+        value_inputs = [create_value_input(value) for value in values]
+        if design.modifyParameters(items, value_inputs):
+            return True
+
+    for item, value in zip(items, values):
+        item.value = value
+
+    return False
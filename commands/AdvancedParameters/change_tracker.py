@@ -0,0 +1,43 @@
+import threading
+
+
+class ChangeTracker:
+    """Collects rows marked dirty by Fusion events and slider callbacks
+
+    Fusion event handlers run on the main thread while the window runs on its own thread,
+    so all access goes through a lock. The window takes the pending changes once per tick.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = set()
+        self._all = True
+
+    def mark(self, row):
+        """Marks a single row as needing to be synced"""
+
+        with self._lock:
+            self._rows.add(row)
+
+    def mark_all(self):
+        """Marks every row as needing to be synced, e.g. after a document switch"""
+
+        with self._lock:
+            self._all = True
+
+    @property
+    def pending(self):
+        """Whether anything has been marked since the last take"""
+
+        with self._lock:
+            return self._all or len(self._rows) > 0
+
+    def take(self):
+        """Returns (all_dirty, dirty_rows) and clears the pending changes"""
+
+        with self._lock:
+            all_dirty, rows = self._all, self._rows
+            self._all = False
+            self._rows = set()
+
+        return all_dirty, rows
@@ -0,0 +1,93 @@
+import time
+
+
+class ComputeDeferral:
+    """Defers the model compute while a slider is dragged or scrolled on designs that recompute slowly
+
+    The recompute latency of each design is measured from the writes made to it. Once it goes
+    past latency_limit, writes made during a slider gesture are sent with the compute deferred
+    and one compute is run when the slider is released or left idle for idle_time.
+    """
+
+    def __init__(self, latency_limit, idle_time, smoothing=0.3):
+        self.latency_limit = latency_limit  # Seconds
+        self.idle_time = idle_time  # Seconds
+        self.smoothing = smoothing
+        self.latencies = {}  # Smoothed recompute seconds of each design
+        self._design = None
+        self._design_key = None
+        self._is_pressed = False
+        self._is_released = False
+        self._last_activity = 0
+
+    @property
+    def is_deferred(self):
+        return self._design is not None
+
+    def is_enabled(self, design_key):
+        """Returns whether compute is deferred during gestures on a design"""
+
+        return self.latencies.get(design_key, 0) > self.latency_limit
+
+    def record(self, design_key, duration):
+        """Records how long a design took to recompute"""
+
+        latency = self.latencies.get(design_key)
+        if latency is None:
+            self.latencies[design_key] = duration
+        else:
+            self.latencies[design_key] = latency + self.smoothing * (duration - latency)
+
+    def press(self, now):
+        """Starts a drag gesture"""
+
+        self._is_pressed = True
+        self._is_released = False
+        self._last_activity = now
+
+    def touch(self, now):
+        """Records slider movement, including mouse wheel scrolling outside of a drag"""
+
+        self._is_released = False
+        self._last_activity = now
+
+    def release(self):
+        """Ends a drag gesture so the deferred compute runs straight away"""
+
+        self._is_pressed = False
+        self._is_released = True
+
+    def should_defer(self, design_key, now):
+        """Returns whether writes made now are part of a gesture on a slow design"""
+
+        is_gesture = self._is_pressed or now - self._last_activity < self.idle_time
+        return is_gesture and self.is_enabled(design_key)
+
+    def defer(self, design, design_key):
+        """Stops the design recomputing until finish() is called"""
+
+        if self._design is None:
+            design.isComputeDeferred = True
+            self._design = design
+            self._design_key = design_key
+
+    def is_due(self, now):
+        """Returns whether the gesture has been released or left idle long enough to compute"""
+
+        return self.is_deferred and (
+            self._is_released or now - self._last_activity >= self.idle_time
+        )
+
+    def finish(self):
+        """Runs the deferred compute and returns the time it took"""
+
+        design, self._design = self._design, None
+        self._is_released = False
+
+        start = time.perf_counter()
+        design.isComputeDeferred = False  # Turning deferral off computes the design
+        duration = time.perf_counter() - start
+
+        self.record(self._design_key, duration)
+
+        return duration
@@ -0,0 +1,110 @@
+import re
+
+from .expression_evaluator import is_literal
+
+# Names in an expression, not counting exponents such as the e3 in 1e3
+IDENTIFIER = re.compile(r"(?<![\w.])[^\W\d]\w*")
+
+
+def parse_references(expression, names):
+    """Returns the user parameter names that an expression refers to"""
+
+    return {name for name in IDENTIFIER.findall(expression) if name in names}
+
+
+class DependencyGraph:
+    """Which user parameters each user parameter's expression refers to, keyed by name
+
+    Only the expressions that changed since the last update are parsed again, unless a
+    parameter has been added, removed or renamed, which can change what any name refers to.
+    """
+
+    def __init__(self):
+        self.references = {}  # Keys of the parameters each expression refers to
+        self._dependents = {}  # Keys of the parameters whose expressions refer to each one
+        self._expressions = {}  # Expression each key's references were parsed from
+        self._derived = set()  # Keys of the parameters whose expressions are not plain numbers
+        self._names = set()
+
+    def update(self, table):
+        """Brings the graph up to date with a parameter table"""
+
+        names = set(table.names)
+        is_rebuilt = names != self._names
+        is_changed = is_rebuilt
+
+        if is_rebuilt:
+            self._names = names
+            self.references = {}
+            self._expressions = {}
+            self._derived = set()
+
+        for key, expression, unit in zip(table.names, table.expressions, table.units):
+            if self._expressions.get(key) == expression:
+                continue
+
+            self._expressions[key] = expression
+            self.references[key] = parse_references(expression, names) - {key}
+            is_changed = True
+
+            if len(self.references[key]) > 0 or not is_literal(expression, unit):
+                self._derived.add(key)
+            else:
+                self._derived.discard(key)
+
+        if is_changed:
+            self._dependents = {}
+            for key, references in self.references.items():
+                for reference in references:
+                    self._dependents.setdefault(reference, set()).add(key)
+
+    def is_derived(self, key):
+        """Returns whether a parameter's expression is computed rather than a plain number
+
+        Besides other user parameters, an expression can refer to model parameters such as d3 or
+        use functions. Writing a value to the parameter would replace its expression either way.
+        """
+
+        return key in self._derived
+
+    def ordered(self, keys):
+        """Returns the given keys ordered so each comes after the parameters it refers to
+
+        Sorted without recursion, so a long chain of parameters cannot exceed the recursion limit.
+        """
+
+        keys = set(keys)
+
+        # Number of the given keys each key still has to come after
+        waiting = {key: len(self.references.get(key, set()) & keys) for key in keys}
+        ready = [key for key, count in waiting.items() if count == 0]
+        ordered = []
+
+        while len(ready) > 0:
+            key = ready.pop()
+            ordered.append(key)
+
+            for dependent in self._dependents.get(key, ()):
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        ready.append(dependent)
+
+        # Fusion 360 does not allow cycles, but any are kept at the end rather than dropped
+        ordered.extend(key for key, count in waiting.items() if count > 0)
+
+        return ordered
+
+    def dependents_of(self, keys):
+        """Returns the keys of every parameter computed from the given ones, directly or not"""
+
+        dependents = set()
+        pending = list(keys)
+
+        while len(pending) > 0:
+            for dependent in self._dependents.get(pending.pop(), ()):
+                if dependent not in dependents:
+                    dependents.add(dependent)
+                    pending.append(dependent)
+
+        return dependents
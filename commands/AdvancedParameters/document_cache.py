@@ -0,0 +1,62 @@
+import collections
+
+
+class DocumentState:
+    """The slider state of one design, kept while another design is active"""
+
+    __slots__ = (
+        "table",
+        "dependency_graph",
+        "slider_values",
+        "sliders_moved",
+        "slider_ranges",
+        "base_range",
+        "top_key",
+        "saved_layout",
+        "undo_stack",
+        "units",
+    )
+
+    def __init__(
+        self,
+        table,
+        dependency_graph,
+        slider_values,
+        sliders_moved,
+        slider_ranges,
+        base_range,
+        top_key,
+        saved_layout,
+        undo_stack,
+        units,
+    ):
+        self.table = table
+        self.dependency_graph = dependency_graph
+        self.slider_values = slider_values
+        self.sliders_moved = sliders_moved
+        self.slider_ranges = slider_ranges
+        self.base_range = base_range
+        self.top_key = top_key
+        self.saved_layout = saved_layout
+        self.undo_stack = undo_stack
+        self.units = units
+
+
+class DocumentCache:
+    """Least recently used DocumentStates keyed by document, so switching back only needs a diff"""
+
+    def __init__(self, size=8):
+        self.size = size
+        self._states = collections.OrderedDict()
+
+    def store(self, key, state):
+        self._states[key] = state
+        self._states.move_to_end(key)
+
+        if len(self._states) > self.size:
+            self._states.popitem(last=False)
+
+    def take(self, key):
+        """Removes and returns the state of a document, or None if it is not cached"""
+
+        return self._states.pop(key, None)
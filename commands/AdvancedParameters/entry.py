@@ -3,16 +3,17 @@ import adsk.fusion
 import os
 from ... import config
 from ...lib import fusion360utils as futil
-from tkinter import *
-from tkinter import ttk
-from tkinter import messagebox
-import threading
+import time
 import traceback
-import math
+from .api_dispatcher import ApiDispatcher
+from .instrumentation import Instrumentation
+from .ranges import SliderRange
+from .probe_cache import ProbeCache
+from .selection_tracker import SelectionTracker
+from .sync_engine import ParameterSyncEngine
 
 app = adsk.core.Application.get()
 ui = app.userInterface
-isWindowOpen = False
 
 CMD_NAME = "Advanced Parameters"
 CMD_ID = f"{config.COMPANY_NAME}_{config.ADDIN_NAME}_{CMD_NAME}"
@@ -34,685 +35,61 @@ ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resource
 # Holds references to event handlers
 local_handlers = []
 
-
-def addParameter(name, value, comment):
-    """Adds a user parameter"""
-
-    try:
-        global parameters, entry_add_name, entry_add_value, entry_add_comment
-
-        if len(ui.activeSelections) > 0:
-            raise ValueError("Cannot update with selections in the workspace.")
-
-        unit_type = "mm"
-        if "deg" in value:
-            unit_type = "deg"
-
-        parameters.add(
-            name.strip(),
-            adsk.core.ValueInput.createByString(value),
-            unit_type,
-            comment,
-        )
-
-        entry_add_name.delete(0, "end")
-        entry_add_value.delete(0, "end")
-        entry_add_comment.delete(0, "end")
-
-    except ValueError as err:
-        messagebox.showwarning("Value Error", err)
-
-    except Exception as err:
-        messagebox.showwarning("Error", err)
-
-
-def deleteParameter(row_number):
-    """Removes a user parameter"""
-
-    global parameters
-
-    delete_succesful = parameters[row_number].deleteMe()
-
-    if not delete_succesful:
-        messagebox.showinfo(
-            "Info",
-            "Deletion of this parameter was unsuccessful. This is likely due to it being used in the workspace.",
-        )
-
-
-def updateParameter(row_number, slider, comment, name):
-    """Update the value/comment/name of a parameter"""
-
-    if len(ui.activeSelections) == 0:
-
-        global scaleBlocks, parameters, entry_add_value, entry_add_comment
-        global entry_add_name, spinbox_max, spinbox_min, spinbox_min_value, spinbox_max_value
-
-        name_input = entry_add_name.get().strip()
-        if len(name_input) > 0:
-            try:
-                # Check to see if a parameter with this name already exists
-                for local_row_number, _ in enumerate(scaleBlocks):
-                    if name_input == parameters[local_row_number].name:
-                        raise TypeError
-
-                # Update the parameter name in the workspace
-                parameters[row_number].name = name_input
-
-                # Check to see if parameter name change successful
-                if parameters[row_number].name != name_input:
-                    raise TypeError
-
-                # Update parameter name in gui
-                name.configure(text=name_input)
-
-                # Remove text in text entry field
-                entry_add_name.delete(0, "end")
-            except TypeError:
-                messagebox.showwarning(
-                    "Type Error", "Parameter name already exists or is invalid."
-                )
-
-        value_input = entry_add_value.get().strip()
-        if len(value_input) > 0:
-            try:
-                parameters.item(row_number).expression = value_input
-
-                if parameters.item(row_number).value * 10 > float(spinbox_max.get()):
-                    spinbox_max.delete(0, "end")
-                    spinbox_max.insert(0, parameters.item(row_number).value * 10)
-                    updateSettings()
-                elif parameters.item(row_number).value * 10 < float(spinbox_min.get()):
-                    spinbox_min.delete(0, "end")
-                    spinbox_min.insert(0, parameters.item(row_number).value * 10)
-                    updateSettings()
-
-                spinbox_increment_value_tmp = spinbox_increment.get()
-                spinbox_increment_value_tmp_n = spinbox_increment_value_tmp[::-1].find(
-                    "."
-                )
-                spinbox_increment_value_tmp_dp = (
-                    1 * 10**-spinbox_increment_value_tmp_n
-                )
-                entry_add_value_tmp = "%g" % (
-                    round(parameters.item(row_number).value * 10, 5)
-                )
-                entry_add_value_tmp_n = entry_add_value_tmp[::-1].find(".")
-                entry_add_value_tmp_dp = 1 * 10**-entry_add_value_tmp_n
-
-                if entry_add_value_tmp_dp < spinbox_increment_value_tmp_dp:
-                    spinbox_increment.delete(0, "end")
-                    spinbox_increment.insert(0, entry_add_value_tmp_dp)
-                    updateSettings()
-
-                if parameters.item(row_number).unit == "deg":
-                    slider.set(parameters.item(row_number).value * 180 / math.pi)
-                else:
-                    slider.set(parameters.item(row_number).value * 10)
-
-                entry_add_value.delete(0, "end")
-
-            except NameError as err:
-                messagebox.showwarning("Name Error", err)
-            except TypeError as err:
-                messagebox.showwarning("Type Error", err)
-            except RuntimeError as err:
-                messagebox.showwarning("Runtime Error", err)
-
-        comment_input = entry_add_comment.get()
-        if comment_input == " ":
-            scaleBlocks[row_number][3].grid_remove()
-            entry_add_comment.delete(0, "end")
-        elif len(comment_input) > 0:
-            comment.configure(text=comment_input)
-            parameters[row_number].comment = comment_input
-            scaleBlocks[row_number][3].grid(
-                row=1,
-                column=0,
-                sticky=W,
-                pady=(0, 0),
-                padx=(0, 0),
-                columnspan=10,
-            )
-            entry_add_comment.delete(0, "end")
-
-    else:
-        messagebox.showwarning(
-            "Warning", "Cannot update with selections in the workspace."
-        )
-
-
-def updateSettings():
-    """Updates window to reflect changed settings"""
-
-    global scaleBlocks, spinbox_min, spinbox_max, spinbox_increment
-
-    try:
-        if (
-            scaleBlocks != None
-            and spinbox_min != None
-            and spinbox_max != None
-            and spinbox_increment != None
-        ):
-            spinbox_min.configure(increment=float(spinbox_increment.get()))
-            spinbox_max.configure(increment=float(spinbox_increment.get()))
-
-            for row_number, _ in enumerate(scaleBlocks):
-                sliderMoved(row_number)  # Updates the rounding of workspace parameters
-
-                scaleBlocks[row_number][0].configure(
-                    from_=float(spinbox_min.get()),
-                    to=float(spinbox_max.get()),
-                    resolution=float(spinbox_increment.get()),
-                )
-                scaleBlocks[row_number][1].configure(
-                    text="%g" % (float(spinbox_min.get()))
-                )
-                scaleBlocks[row_number][2].configure(
-                    text="%g" % (float(spinbox_max.get()))
-                )
-
-    except ValueError as err:
-        messagebox.showwarning("Value Error", err)
-
-
-def queueSettingsUpdate():
-    """Queues an update for min/min/increment settings in the mainloop"""
-
-    global is_settings_update
-
-    is_settings_update = True
-
-
-def sliderMoved(row_number):
-    """Records whether a slider is moved by the user"""
-
-    global sliders_moved
-
-    sliders_moved[row_number] = True  # Records whether a slider has been moved
-
-
-def createScaleBlock(row_number):
-    """Generates a row of information and controls for a parameter"""
-
-    global parameters, entry_add_value, spinbox_min, spinbox_max, spinbox_increment, window_bottom
-
-    length_details = Frame(window_bottom)
-    length_details.grid(
-        row=row_number, column=0, sticky=W, pady=(17, 0), padx=(0, 20), columnspan=10
-    )
-    length_label = Label(
-        length_details, text=parameters.item(row_number).name, width=8, anchor="w"
-    )
-    length_label.grid(
-        row=0, column=0, sticky=W, pady=(0, 0), padx=(0, 0), columnspan=10
+# Custom event that runs the Fusion API calls posted by the window thread on the main thread
+DISPATCH_EVENT_ID = f"{CMD_ID}_dispatch"
+
+# The fast tick only checks for pending changes, the slow safety net re-reads every parameter
+SYNC_INTERVAL_MS = 50
+SAFETY_NET_INTERVAL = 5  # Seconds
+
+# Timing and counts shown in the status strip, only recorded if enabled in /config.py
+instrumentation = Instrumentation(config.INSTRUMENTATION)
+
+# Whether anything is selected in the workspace, kept up to date by the active selection event
+selection_tracker = SelectionTracker()
+
+# Range that the sliders of every unit start from, until a layout saved in the design is loaded
+BASE_RANGE = SliderRange(0, 1000, 1)
+
+# Syncs the sliders with the active design, kept while the window is hidden so reopening only needs a diff
+engine = ParameterSyncEngine(
+    lambda: adsk.fusion.Design.cast(app.activeProduct),
+    adsk.core.ValueInput.createByReal,
+    BASE_RANGE,
+    selection_tracker=selection_tracker,
+    instrumentation=instrumentation,
+    sync_interval=SYNC_INTERVAL_MS / 1000,
+    safety_net_interval=SAFETY_NET_INTERVAL,
+    defer_compute_latency=config.DEFER_COMPUTE_LATENCY,
+    defer_compute_idle_time=config.DEFER_COMPUTE_IDLE_TIME,
+    write_on_release=config.WRITE_ON_RELEASE,
+)
+
+# Metrics of parameter values that have been measured before, only used on the main thread
+probe_cache = ProbeCache(
+    os.path.join(os.path.expanduser("~"), ".advanced_parameters", "probes.sqlite"),
+    config.PROBE_CACHE_MEMORY_SIZE,
+    config.PROBE_CACHE_DISK_SIZE,
+)
+
+
+def log_dispatch_error(err):
+    """Logs an error raised on the main thread by an operation whose error the window does not show"""
+
+    futil.logger.error(
+        "Operation posted by the window failed\n%s",
+        "".join(traceback.format_exception(type(err), err, err.__traceback__)),
     )
 
-    comment_label = Label(
-        length_details,
-        text=parameters.item(row_number).comment,
-        font=("Arial", 7),
-        width=8,
-        state="disabled",
-        anchor="w",
-    )
 
-    # Only show comment if one exists
-    if len(parameters.item(row_number).comment) > 0:
-        comment_label.grid(
-            row=1,
-            column=0,
-            sticky=W,
-            pady=(0, 0),
-            padx=(0, 0),
-            columnspan=10,
-        )
-
-    slider_min = Label(window_bottom, text="%g" % float(spinbox_min.get()), width=4)
-    slider_min.grid(row=row_number, column=10, pady=(17, 0), columnspan=10)
-
-    slider_value = DoubleVar()
-    slider = Scale(
-        window_bottom,
-        from_=float(spinbox_min.get()),
-        to=float(spinbox_max.get()),
-        resolution=float(spinbox_increment.get()),
-        orient="horizontal",
-        command=lambda _: sliderMoved(row_number),
-        length=260,
-        variable=slider_value,
-    )
-    slider.grid(row=row_number, column=20, columnspan=10)
-
-    slider.bind(
-        "<MouseWheel>",
-        lambda event: slider.set(slider.get() - float(spinbox_increment.get()))
-        if event.delta == -120
-        else slider.set(slider.get() + float(spinbox_increment.get()))
-        if event.delta == 120
-        else ...,
-    )
+# The window runs on its own thread, so every call to the Fusion API is posted to the main thread
+dispatcher = ApiDispatcher(
+    lambda: app.fireCustomEvent(DISPATCH_EVENT_ID), instrumentation, log_dispatch_error
+)
 
-    slider_max = Label(window_bottom, text="%g" % float(spinbox_max.get()), width=4)
-    slider_max.grid(
-        row=row_number, column=30, padx=(0, 17), pady=(17, 0), columnspan=10
-    )
-
-    button_delete = Button(
-        window_bottom,
-        text="Delete",
-        width=6,
-        command=lambda: deleteParameter(row_number),
-    )
-    button_delete.grid(
-        row=row_number, column=40, pady=(17, 0), padx=(0, 20), columnspan=10
-    )
-
-    button_update = Button(
-        window_bottom,
-        text="Update",
-        width=6,
-        command=lambda: updateParameter(
-            row_number, slider, comment_label, length_label
-        ),
-    )
-    button_update.grid(
-        row=row_number, column=50, pady=(17, 0), padx=(0, 0), columnspan=10
-    )
-
-    return slider, slider_min, slider_max, comment_label, slider_value
-
-
-def loadToolbar():
-    """Loads the toolbar with text input fields and buttons at the top of the window"""
-
-    global entry_add_value, entry_add_name, window_top
-    global spinbox_min, spinbox_max, spinbox_increment, entry_add_comment
-    global spinbox_min_value, spinbox_max_value, spinbox_increment_value
-
-    window_top.grid(row=0, column=0, columnspan=70, padx=(10, 10), pady=(10, 0))
-
-    label_add_name = Label(window_top, text="Name:", anchor="w")
-    label_add_name.grid(row=0, column=0, sticky=W, padx=(0, 5), columnspan=10)
-
-    entry_add_name = Entry(
-        window_top,
-        width=15,
-        relief=FLAT,
-        highlightbackground="grey",
-        highlightthickness=1,
-    )
-    entry_add_name.grid(row=0, column=10, sticky=W, padx=(0, 20), columnspan=10)
-
-    label_add_value = Label(window_top, text="Value:", anchor="w")
-    label_add_value.grid(row=0, column=20, sticky=W, padx=(0, 5), columnspan=10)
-
-    entry_add_value = Entry(
-        window_top,
-        width=15,
-        relief=FLAT,
-        highlightbackground="grey",
-        highlightthickness=1,
-    )
-    entry_add_value.grid(row=0, column=30, sticky=W, padx=(0, 20), columnspan=10)
-
-    label_add_comment = Label(window_top, text="Comment:", anchor="w")
-    label_add_comment.grid(row=0, column=40, sticky=W, padx=(0, 5), columnspan=10)
-
-    entry_add_comment = Entry(
-        window_top,
-        width=15,
-        relief=FLAT,
-        highlightbackground="grey",
-        highlightthickness=1,
-    )
-    entry_add_comment.grid(row=0, column=50, sticky=W, padx=(0, 20), columnspan=10)
-
-    button_add = Button(
-        window_top,
-        text="Add",
-        width=6,
-        command=lambda: addParameter(
-            entry_add_name.get(),
-            entry_add_value.get(),
-            entry_add_comment.get(),
-        ),
-    )
-    button_add.grid(row=0, column=60, padx=(0, 0), columnspan=10)
-
-    entry_add_name.bind(
-        "<Return>",
-        lambda _: addParameter(
-            entry_add_name.get(),
-            entry_add_value.get(),
-            entry_add_comment.get(),
-        ),
-    )
-    entry_add_value.bind(
-        "<Return>",
-        lambda _: addParameter(
-            entry_add_name.get(),
-            entry_add_value.get(),
-            entry_add_comment.get(),
-        ),
-    )
-    entry_add_comment.bind(
-        "<Return>",
-        lambda _: addParameter(
-            entry_add_name.get(),
-            entry_add_value.get(),
-            entry_add_comment.get(),
-        ),
-    )
-
-    spinbox_increment = ttk.Spinbox(
-        window_top,
-        width=12,
-        command=queueSettingsUpdate,
-        from_=-10000,
-        to=10000,
-    )
-    spinbox_increment.grid(
-        row=1,
-        column=50,
-        sticky=W + E,
-        padx=(0, 20),
-        pady=(6, 0),
-        columnspan=10,
-    )
-    spinbox_increment.delete(0)
-    spinbox_increment.insert(0, str(spinbox_increment_value))
-
-    label_add_min = Label(window_top, text="Min:", anchor="w")
-    label_add_min.grid(
-        row=1, column=0, sticky=W, padx=(0, 5), pady=(6, 0), columnspan=10
-    )
-
-    spinbox_min = ttk.Spinbox(
-        window_top,
-        width=12,
-        command=queueSettingsUpdate,
-        from_=-10000,
-        to=10000,
-        increment=float(spinbox_increment.get()),
-    )
-    spinbox_min.grid(
-        row=1,
-        column=10,
-        sticky=W + E,
-        padx=(0, 20),
-        pady=(6, 0),
-        columnspan=10,
-    )
-    spinbox_min.delete(0)
-    spinbox_min.insert(0, str(spinbox_min_value))
-
-    label_add_max = Label(window_top, text="Max:", anchor="w")
-    label_add_max.grid(
-        row=1,
-        column=20,
-        sticky=W,
-        padx=(0, 5),
-        pady=(6, 0),
-        columnspan=10,
-    )
-
-    spinbox_max = ttk.Spinbox(
-        window_top,
-        width=12,
-        command=queueSettingsUpdate,
-        from_=-10000,
-        to=10000,
-        increment=float(spinbox_increment.get()),
-    )
-    spinbox_max.grid(
-        row=1,
-        column=30,
-        sticky=W + E,
-        padx=(0, 20),
-        pady=(6, 0),
-        columnspan=10,
-    )
-    spinbox_max.delete(0)
-    spinbox_max.insert(0, str(spinbox_max_value))
-
-    label_add_increment = Label(window_top, text="Increment:", anchor="w")
-    label_add_increment.grid(
-        row=1,
-        column=40,
-        sticky=W,
-        padx=(0, 5),
-        pady=(6, 0),
-        columnspan=10,
-    )
-
-    button_apply = Button(window_top, text="Apply", width=6, command=updateSettings)
-    button_apply.grid(row=1, column=60, padx=(0, 0), pady=(6, 0), columnspan=10)
-
-    spinbox_min.bind("<Return>", lambda _: updateSettings())
-    spinbox_max.bind("<Return>", lambda _: updateSettings())
-    spinbox_increment.bind("<Return>", lambda _: updateSettings())
-
-
-def updateWindow():
-    """Syncs parameters between the Fusion360 workspace and the external window GUI"""
-
-    global scaleBlocks, parameters, window, last_num_parameters, entry_add_value, entry_add_name
-    global spinbox_min, spinbox_max, spinbox_increment, is_settings_update, entry_add_comment
-    global sliders_moved, selected_flag, window_bottom, shift_key_pushed
-
-    try:
-        product = app.activeProduct
-        design = adsk.fusion.Design.cast(product)
-        parameters = design.userParameters
-
-        if is_settings_update:
-            updateSettings()
-            is_settings_update = False
-
-        # Checks if there is a change in the number of parameters
-        if last_num_parameters != len(parameters):
-            last_num_parameters = len(parameters)
-
-            for widget in window_bottom.grid_slaves():
-                widget.destroy()
-
-            scaleBlocks = []
-
-            if len(parameters) > 0:
-
-                window_bottom.grid(
-                    row=1, column=0, columnspan=70, padx=(10, 10), pady=(0, 10)
-                )
-
-                for row_number, _ in enumerate(parameters):
-                    scaleBlocks.append(createScaleBlock(row_number))
-                    sliders_moved.append(True)
-
-                    param_val = parameters.item(row_number)
-
-                    if param_val.value * 10 > float(spinbox_max.get()):
-                        spinbox_max.delete(0, "end")
-                        spinbox_max.insert(0, "%g" % (param_val.value * 10))
-                        updateSettings()
-                        scaleBlocks[row_number][0].set(param_val.value * 10)
-                    elif param_val.value * 10 < float(spinbox_min.get()):
-                        spinbox_min.delete(0, "end")
-                        spinbox_min.insert(0, "%g" % (param_val.value * 10))
-                        updateSettings()
-                        scaleBlocks[row_number][0].set(param_val.value * 10)
-
-                    spinbox_increment_value_tmp = spinbox_increment.get()
-                    spinbox_increment_value_tmp_n = spinbox_increment_value_tmp[
-                        ::-1
-                    ].find(".")
-                    spinbox_increment_value_tmp_dp = (
-                        1 * 10**-spinbox_increment_value_tmp_n
-                    )
-                    entry_add_value_tmp = "%g" % (round(param_val.value * 10, 5))
-                    entry_add_value_tmp_n = entry_add_value_tmp[::-1].find(".")
-                    entry_add_value_tmp_dp = 1 * 10**-entry_add_value_tmp_n
-
-                    if entry_add_value_tmp_dp < spinbox_increment_value_tmp_dp:
-                        spinbox_increment.delete(0, "end")
-                        spinbox_increment.insert(0, entry_add_value_tmp_dp)
-                        updateSettings()
-
-                    if parameters.item(row_number).unit == "deg":
-                        scaleBlocks[row_number][0].set(
-                            parameters.item(row_number).value * 180 / math.pi
-                        )
-                    else:
-                        scaleBlocks[row_number][0].set(
-                            parameters.item(row_number).value * 10
-                        )
-
-            else:
-                window_bottom.grid_remove()
-
-        if len(parameters) == len(scaleBlocks):
-            for row_number, _ in enumerate(parameters):
-                if parameters.item(row_number).unit == "deg":
-                    multiplier = 180 / math.pi
-                else:
-                    multiplier = 10
-
-                if (
-                    round(parameters.item(row_number).value, 5)
-                    != round(scaleBlocks[row_number][0].get() / multiplier, 5)
-                    and len(ui.activeSelections) == 0
-                    and sliders_moved[row_number]
-                ):
-                    if not shift_key_pushed:
-                        param_val = parameters.item(row_number)
-                        slider_val = scaleBlocks[row_number][0].get() / multiplier
-                        param_val.value = round(slider_val, 5)
-                    selected_flag = False
-
-                elif (
-                    round(parameters.item(row_number).value, 5)
-                    != round(scaleBlocks[row_number][0].get() / multiplier, 5)
-                    and len(ui.activeSelections) > 0
-                    and not selected_flag
-                ):
-                    messagebox.showwarning(
-                        "Warning", "Cannot update with selections in the workspace."
-                    )
-                    selected_flag = True
-                elif round(parameters.item(row_number).value, 5) == round(
-                    scaleBlocks[row_number][0].get() / multiplier, 5
-                ):
-                    sliders_moved[row_number] = False
-
-                elif not sliders_moved[row_number]:
-                    param_val = parameters.item(row_number)
-                    scaleBlocks[row_number][4].set(param_val.value * multiplier)
-
-        window.after(150, updateWindow)  # Runs the function again after a time
-
-    except RuntimeError:
-        window.destroy()  # This closes the window when Fusion 360 is closed
-
-
-def onClosing():
-    """Window state updated and object destroyed so another instance can be opened"""
-
-    global window, isWindowOpen
-
-    isWindowOpen = False
-    window.destroy()
-
-
-def down(e):
-    """Callback for when the shift key is pressed down"""
-
-    global shift_key_pushed
-
-    if shift_key_pushed == 0 and e.keycode == 16:
-        shift_key_pushed = 1
-
-
-def up(e):
-    """Callback for when the shift key is released"""
-
-    global shift_key_pushed
-
-    if shift_key_pushed == 1 and e.keycode == 16:
-        shift_key_pushed = 0
-
-
-def externalWindow():
-    """Opens and intialises an external window"""
-
-    try:
-
-        global parameters, scaleBlocks, window, last_num_parameters, entry_add_value, spinbox_min_value, spinbox_max_value
-        global spinbox_increment_value, selected_flag, spinbox_min, spinbox_max, spinbox_increment, is_settings_update
-        global entry_add_comment, entry_add_name, sliders_moved, window_top, window_bottom, shift_key_pushed
-
-        # Default values for global variables
-        entry_add_value = None
-        spinbox_max = None
-        spinbox_min = None
-        spinbox_increment = None
-        parameters = None
-        scaleBlocks = None
-        is_settings_update = False
-        entry_add_comment = None
-        entry_add_name = None
-        sliders_moved = []
-        spinbox_min_value = 0
-        spinbox_max_value = 1000
-        spinbox_increment_value = 1
-        selected_flag = False
-        last_num_parameters = None
-
-        window = Tk()
-        window_top = Frame(window)
-        window_bottom = Frame(window)
-
-        window.title("Advanced Parameters")
-        window.iconbitmap(
-            os.path.dirname(os.path.abspath(__file__)) + "\\resources\\16x16.ico"
-        )
-        window.resizable(width=False, height=False)
-        window.attributes("-topmost", True)
-        window.protocol("WM_DELETE_WINDOW", onClosing)
-
-        shift_key_pushed = 0
-        window.bind("<KeyPress>", down)
-        window.bind("<KeyRelease>", up)
-
-        loadToolbar()
-
-        updateWindow()
-
-        window.mainloop()  # Starts the gui (blocking method)
-
-        # Resets created global variables after the gui is closed
-        del (
-            scaleBlocks,
-            window,
-            last_num_parameters,
-            entry_add_value,
-            parameters,
-            spinbox_min,
-            spinbox_max,
-            spinbox_increment,
-            is_settings_update,
-            entry_add_comment,
-            entry_add_name,
-            sliders_moved,
-            spinbox_min_value,
-            spinbox_max_value,
-            spinbox_increment_value,
-            selected_flag,
-            window_top,
-            window_bottom,
-        )
-
-    except:
-        messagebox.showerror("Error", traceback.format_exc())
+# The window and tkinter are only imported the first time the button is clicked, so they do not slow
+# down Fusion 360 starting up
+window = None
 
 
 # Executed when add-in is run.
@@ -746,6 +123,17 @@ def start():
     # Now you can set various options on the control such as promoting it to always be shown.
     control.isPromoted = IS_PROMOTED
 
+    # Events that can change user parameters outside of the window
+    # Opening several documents only needs one resync, for the one left active
+    futil.add_handler(app.documentActivated, document_activated, coalesce=0.1)
+    futil.add_handler(ui.commandTerminated, command_terminated)
+    futil.add_handler(ui.activeSelectionChanged, active_selection_changed)
+    selection_tracker.update(len(ui.activeSelections))
+
+    # Runs the Fusion API calls posted by the window thread
+    dispatch_event = app.registerCustomEvent(DISPATCH_EVENT_ID)
+    futil.add_handler(dispatch_event, dispatch_event_fired)
+
 
 # Executed when add-in is stopped.
 def stop():
@@ -772,13 +160,30 @@ def stop():
     if toolbar_tab.toolbarPanels.count == 0:
         toolbar_tab.deleteMe()
 
+    # A gesture may still be holding the compute back, and the layout is saved in the design, as
+    # closing the window from here does not reach the engine
+    try:
+        engine.finish(time.monotonic())
+    except RuntimeError:
+        pass  # The design has already been closed
+
+    # The window is closed as the add-in's modules are about to be unloaded
+    if window is not None:
+        window.close()
+
+    app.unregisterCustomEvent(DISPATCH_EVENT_ID)
+    probe_cache.close()
+
+    if config.DEBUG:
+        futil.log_handler_stats()
+
 
 # Function to be called when a user clicks the corresponding button in the UI
 # Here you define the User Interface for your command and identify other command events to potentially handle
 def command_created(args: adsk.core.CommandCreatedEventArgs):
 
     # General logging for debug
-    futil.log(f"{CMD_NAME} Command Created Event")
+    futil.logger.debug("%s Command Created Event", CMD_NAME)
 
     # Connect to the events that are needed by this command.
     futil.add_handler(
@@ -791,16 +196,18 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 
 
 def command_execute(args: adsk.core.CommandEventArgs):
-    """Opens the Advanced Parameters window if another istance is not already open"""
+    """Opens the Advanced Parameters window, or shows it again if it has been hidden"""
+
+    global window
+
+    clicked = time.perf_counter()
 
-    global isWindowOpen
+    if window is None:
+        from . import window
 
-    if not isWindowOpen:
-        window_process = threading.Thread(target=externalWindow)
-        window_process.start()
-        isWindowOpen = True
+    window.show(clicked)
 
-    futil.log(f"{CMD_NAME} Command Execute Event")
+    futil.logger.debug("%s Command Execute Event", CMD_NAME)
 
 
 def command_destroy(args: adsk.core.CommandEventArgs):
@@ -810,4 +217,40 @@ def command_destroy(args: adsk.core.CommandEventArgs):
 
     local_handlers = []
 
-    futil.log(f"{CMD_NAME} Command Destroy Event")
+    futil.logger.debug("%s Command Destroy Event", CMD_NAME)
+
+
+def document_activated(args: adsk.core.DocumentEventArgs):
+    """Resyncs the window when a design is switched/opened"""
+
+    engine.change_tracker.mark_all()
+
+
+def command_terminated(args: adsk.core.ApplicationCommandEventArgs):
+    """Resyncs the window after a command (e.g. the parameters dialog or undo) that may have changed parameters or geometry"""
+
+    if (
+        args.terminationReason
+        != adsk.core.CommandTerminationReason.CancelledTerminationReason
+    ):
+        engine.change_tracker.mark_all()
+
+        # Sketch and feature edits do not change the design's version, so its measured metrics are dropped
+        document = app.activeDocument
+        if document is not None:
+            probe_cache.clear(document.creationId)
+
+
+def active_selection_changed(args: adsk.core.ActiveSelectionEventArgs):
+    """Caches the selection count and sends the writes held back by a selection once it is cleared"""
+
+    blocked_keys = selection_tracker.update(len(args.currentSelection))
+
+    for key in blocked_keys:
+        engine.change_tracker.mark(key)
+
+
+def dispatch_event_fired(args: adsk.core.CustomEventArgs):
+    """Runs the Fusion API calls posted by the window thread, on the main thread"""
+
+    dispatcher.run()
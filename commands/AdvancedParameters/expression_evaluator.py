@@ -0,0 +1,371 @@
+import collections
+import math
+import re
+
+from .units import DEFAULT_FACTORS
+
+# Factors from each unit to Fusion 360's internal units (cm/rad)
+UNIT_FACTORS = {unit: 1 / factor for unit, factor in DEFAULT_FACTORS.items() if unit}
+
+FUNCTIONS = {
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "sinh": math.sinh,
+    "cosh": math.cosh,
+    "tanh": math.tanh,
+    "sqrt": math.sqrt,
+    "abs": abs,
+    "ceil": math.ceil,
+    "floor": math.floor,
+    "round": round,
+    "exp": math.exp,
+    "ln": math.log,
+    "log": math.log10,
+    "sign": lambda x: (x > 0) - (x < 0),
+    "min": min,
+    "max": max,
+}
+
+# Functions that return an angle
+ANGLE_FUNCTIONS = {"asin", "acos", "atan"}
+
+# Functions that return a value in the unit of their argument, e.g. abs(a) or sqrt(a * a)
+UNIT_FUNCTIONS = {"abs", "sqrt", "ceil", "floor", "round"}
+
+# Functions that round, which is done in the parameter's unit so round(a) of 10.4 mm is 10 mm
+ROUNDING_FUNCTIONS = {"ceil", "floor", "round"}
+
+CONSTANTS = {"PI": math.pi, "E": math.e}
+
+TOKEN = re.compile(
+    r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<name>[^\W\d]\w*)|(?P<operator>[-+*/^(),]))"
+)
+
+
+class UnsupportedExpression(Exception):
+    """Raised for expressions outside of the subset the evaluator understands"""
+
+
+class ExpressionEvaluator:
+    """Calculates user parameter values locally from a subset of Fusion 360's expression syntax
+
+    Supports arithmetic, the functions in FUNCTIONS, the units in UNIT_FACTORS and references to
+    other user parameters, which is enough to preview derived values while a slider moves. Values
+    are approximate as units are only tracked as present or not, the design's recompute is always
+    the final value. Expressions are compiled once and results are cached by their input values.
+    """
+
+    def __init__(self, cache_size=4096):
+        self.cache_size = cache_size
+        self._compiled = {}  # (names, function) of each expression, None if unsupported
+        self._results = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, expression, unit, values):
+        """Returns the value of an expression in internal units, or None if it cannot be evaluated
+
+        Arguments:
+        expression -- The expression of a user parameter.
+        unit -- The unit of the parameter, used for numbers written without one.
+        values -- Returns the internal value of a user parameter from its name.
+        """
+
+        compiled = self._compiled.get(expression, False)
+        if compiled is False:
+            compiled = self._compiled[expression] = _compile(expression)
+        if compiled is None:
+            return None
+
+        names, function = compiled
+
+        try:
+            inputs = tuple(values(name) for name in names)
+        except KeyError:
+            return None
+
+        cache_key = (expression, unit, inputs)
+        result = self._results.get(cache_key)
+
+        if result is not None:
+            self._results.move_to_end(cache_key)
+            self.hits += 1
+            return result
+
+        self.misses += 1
+
+        factor = UNIT_FACTORS.get(unit, 1)
+
+        try:
+            value, has_unit = function(dict(zip(names, inputs)), factor)
+        except (ArithmeticError, ValueError, TypeError):
+            return None
+
+        # A negative number to a fractional power, e.g. (-8)^(1/3), has no real value
+        if isinstance(value, complex):
+            return None
+
+        result = value if has_unit else value * factor
+
+        self._results[cache_key] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+
+        return result
+
+
+def is_literal(expression, unit=""):
+    """Returns whether an expression is a plain number such as 10 mm, not computed from anything
+
+    A number in the parameter's own unit is a literal even if the unit is not in UNIT_FACTORS,
+    e.g. 5 kg.
+    """
+
+    expression = expression.rstrip()
+    if unit and expression.endswith(unit):
+        expression = expression[: -len(unit)]
+
+    compiled = _compile(expression)
+    return compiled is not None and len(compiled[0]) == 0
+
+
+def _compile(expression):
+    """Returns (names, function) for an expression, or None if it is not supported"""
+
+    try:
+        parser = _Parser(expression)
+        function = parser.parse()
+    except UnsupportedExpression:
+        return None
+
+    return tuple(sorted(parser.names)), function
+
+
+class _Parser:
+    """Recursive descent parser that turns an expression into nested closures
+
+    Each closure takes the referenced values and the factor of the parameter's unit, and returns
+    (value, has_unit).
+    """
+
+    def __init__(self, expression):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.names = set()
+
+    def parse(self):
+        function = self._sum()
+        if self._peek() is not None:
+            raise UnsupportedExpression(self._peek())
+        return function
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise UnsupportedExpression("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def _expect(self, operator):
+        if self._next() != ("operator", operator):
+            raise UnsupportedExpression("Expected " + operator)
+
+    def _sum(self):
+        function = self._product()
+
+        while self._peek() in (("operator", "+"), ("operator", "-")):
+            operator = self._next()[1]
+            function = _binary(operator, function, self._product())
+
+        return function
+
+    def _product(self):
+        function = self._unary()
+
+        while self._peek() in (("operator", "*"), ("operator", "/")):
+            operator = self._next()[1]
+            function = _binary(operator, function, self._unary())
+
+        return function
+
+    def _unary(self):
+        if self._peek() == ("operator", "-"):
+            self._next()
+            operand = self._unary()
+            return lambda values, factor: _negate(operand(values, factor))
+
+        if self._peek() == ("operator", "+"):
+            self._next()
+
+        return self._power()
+
+    def _power(self):
+        function = self._united()
+
+        if self._peek() == ("operator", "^"):
+            self._next()
+            exponent = self._unary()  # Right associative
+            return _binary("^", function, exponent)
+
+        return function
+
+    def _united(self):
+        """A primary followed by an optional unit, e.g. 10 mm or (a + b) deg"""
+
+        function = self._primary()
+        token = self._peek()
+
+        if token is not None and token[0] == "name" and token[1] in UNIT_FACTORS:
+            self._next()
+            unit_factor = UNIT_FACTORS[token[1]]
+            return lambda values, factor: (
+                function(values, factor)[0] * unit_factor,
+                True,
+            )
+
+        return function
+
+    def _primary(self):
+        kind, text = self._next()
+
+        if kind == "number":
+            number = float(text)
+            return lambda values, factor: (number, False)
+
+        if (kind, text) == ("operator", "("):
+            function = self._sum()
+            self._expect(")")
+            return function
+
+        if kind != "name":
+            raise UnsupportedExpression(text)
+
+        if self._peek() == ("operator", "("):
+            return self._call(text)
+
+        if text in CONSTANTS:
+            constant = CONSTANTS[text]
+            return lambda values, factor: (constant, False)
+
+        if text in UNIT_FACTORS:
+            raise UnsupportedExpression(text)
+
+        self.names.add(text)
+        return lambda values, factor: (values[text], True)
+
+    def _call(self, name):
+        if name not in FUNCTIONS:
+            raise UnsupportedExpression(name)
+
+        self._expect("(")
+        arguments = [self._sum()]
+        while self._peek() == ("operator", ","):
+            self._next()
+            arguments.append(self._sum())
+        self._expect(")")
+
+        function = FUNCTIONS[name]
+        has_unit = name in ANGLE_FUNCTIONS
+
+        def operands(values, factor):
+            return [argument(values, factor) for argument in arguments]
+
+        if name in ("min", "max"):
+            return lambda values, factor: _select(function, operands(values, factor), factor)
+        if name in ROUNDING_FUNCTIONS:
+            return lambda values, factor: _round(function, operands(values, factor), factor)
+        if name in UNIT_FUNCTIONS:
+            return lambda values, factor: _keep_unit(function, operands(values, factor))
+
+        return lambda values, factor: (
+            function(*[operand[0] for operand in operands(values, factor)]),
+            has_unit,
+        )
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+
+    while position < len(expression):
+        match = TOKEN.match(expression, position)
+        if match is None:
+            raise UnsupportedExpression(expression[position:])
+
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+
+    return tokens
+
+
+def _negate(operand):
+    return -operand[0], operand[1]
+
+
+def _select(function, operands, factor):
+    """Picks min or max, comparing numbers without a unit in the parameter's unit like _add()"""
+
+    has_unit = any(operand[1] for operand in operands)
+    value = function(
+        operand[0] * factor if has_unit and not operand[1] else operand[0] for operand in operands
+    )
+    return value, has_unit
+
+
+def _round(function, operands, factor):
+    """Rounds a value with a unit in the parameter's unit rather than in internal units"""
+
+    (value, has_unit), = operands
+
+    if has_unit:
+        return function(value / factor) * factor, True
+    return function(value), False
+
+
+def _keep_unit(function, operands):
+    (value, has_unit), = operands
+    return function(value), has_unit
+
+
+def _binary(operator, left, right):
+    if operator == "+":
+        return lambda values, factor: _add(left(values, factor), right(values, factor), factor)
+    if operator == "-":
+        return lambda values, factor: _add(
+            left(values, factor), _negate(right(values, factor)), factor
+        )
+    if operator == "*":
+        return lambda values, factor: _combine(
+            left(values, factor), right(values, factor), float.__mul__
+        )
+    if operator == "/":
+        return lambda values, factor: _combine(
+            left(values, factor), right(values, factor), float.__truediv__
+        )
+    return lambda values, factor: _combine(
+        left(values, factor), right(values, factor), float.__pow__
+    )
+
+
+def _add(left, right, factor):
+    """Adds two values, a number without a unit added to one with a unit is in the parameter's unit"""
+
+    if left[1] and not right[1]:
+        right = (right[0] * factor, True)
+    elif right[1] and not left[1]:
+        left = (left[0] * factor, True)
+
+    return float(left[0]) + float(right[0]), left[1] or right[1]
+
+
+def _combine(left, right, operation):
+    return operation(float(left[0]), float(right[0])), left[1] or right[1]
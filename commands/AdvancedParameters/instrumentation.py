@@ -0,0 +1,127 @@
+import collections
+import csv
+import json
+
+
+class Histogram:
+    """Keeps the most recent samples of a measurement to report percentiles"""
+
+    __slots__ = ("samples", "count", "total", "max")
+
+    def __init__(self, size=1000):
+        self.samples = collections.deque(maxlen=size)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """Returns the nearest-rank percentile of the kept samples"""
+
+        if len(self.samples) == 0:
+            return 0
+
+        ordered = sorted(self.samples)
+        rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count > 0 else 0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class Instrumentation:
+    """Counters and histograms describing how the window syncs with the workspace
+
+    Callers check enabled before timing anything, so nothing is measured or stored when it is off.
+    Times are stored in milliseconds.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.counters = collections.Counter()
+        self.histograms = {}
+        self.parameter_histograms = {}  # Write to recompute time of each parameter
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] += amount
+
+    def observe(self, name, value):
+        if self.enabled:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(value)
+
+    def observe_parameters(self, names, value):
+        """Adds a write to recompute time to the histogram of each parameter in a commit"""
+
+        if self.enabled:
+            for name in names:
+                histogram = self.parameter_histograms.get(name)
+                if histogram is None:
+                    histogram = self.parameter_histograms[name] = Histogram(size=100)
+                histogram.add(value)
+
+    def percentile(self, name, percent):
+        histogram = self.histograms.get(name)
+        return histogram.percentile(percent) if histogram is not None else 0
+
+    def summary(self):
+        return {
+            "counters": dict(self.counters),
+            "histograms": {
+                name: histogram.summary() for name, histogram in self.histograms.items()
+            },
+            "parameters": {
+                name: histogram.summary()
+                for name, histogram in self.parameter_histograms.items()
+            },
+        }
+
+    def export(self, path):
+        """Writes the summary to a .json file, or to a .csv file with one row per metric"""
+
+        summary = self.summary()
+
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["metric", "count", "mean", "p50", "p90", "p99", "max"])
+
+                for name, count in summary["counters"].items():
+                    writer.writerow([name, count, "", "", "", "", ""])
+
+                histograms = list(summary["histograms"].items())
+                histograms += [
+                    ("parameter:" + name, values)
+                    for name, values in summary["parameters"].items()
+                ]
+                for name, values in histograms:
+                    writer.writerow(
+                        [
+                            name,
+                            values["count"],
+                            values["mean"],
+                            values["p50"],
+                            values["p90"],
+                            values["p99"],
+                            values["max"],
+                        ]
+                    )
+        else:
+            with open(path, "w") as file:
+                json.dump(summary, file, indent=4)
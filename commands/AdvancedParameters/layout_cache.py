@@ -0,0 +1,71 @@
+import json
+
+from .ranges import SliderRange
+
+ATTRIBUTE_GROUP = "AdvancedParameters"
+ATTRIBUTE_NAME = "layout"
+LAYOUT_VERSION = 1
+
+
+class Layout:
+    """Slider settings and scroll position of a design, stored in the design's attributes"""
+
+    __slots__ = ("base_range", "slider_ranges", "top_key")
+
+    def __init__(self, base_range, slider_ranges, top_key=None):
+        self.base_range = base_range
+        self.slider_ranges = slider_ranges
+        self.top_key = top_key  # Name of the parameter at the top of the list
+
+    def to_json(self):
+        return json.dumps(
+            {
+                "version": LAYOUT_VERSION,
+                "base": _range_to_list(self.base_range),
+                "ranges": {
+                    unit: _range_to_list(slider_range)
+                    for unit, slider_range in self.slider_ranges.items()
+                },
+                "top": self.top_key,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, text):
+        """Returns the layout stored in text, or None if it is invalid or from another version"""
+
+        try:
+            data = json.loads(text)
+
+            if data.get("version") != LAYOUT_VERSION:
+                return None
+
+            return cls(
+                SliderRange(*data["base"]),
+                {unit: SliderRange(*values) for unit, values in data["ranges"].items()},
+                data.get("top"),
+            )
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return None
+
+
+def load_layout(design):
+    """Reads the layout of a design in one call, returns None if the design has none"""
+
+    attribute = design.attributes.itemByName(ATTRIBUTE_GROUP, ATTRIBUTE_NAME)
+
+    if attribute is None:
+        return None
+
+    return Layout.from_json(attribute.value)
+
+
+def save_layout(design, layout):
+    """Stores the layout of a design, replacing any layout it already has"""
+
+    design.attributes.add(ATTRIBUTE_GROUP, ATTRIBUTE_NAME, layout.to_json())
+
+
+def _range_to_list(slider_range):
+    return [slider_range.minimum, slider_range.maximum, slider_range.increment]
@@ -0,0 +1,258 @@
+import csv
+import json
+import re
+
+from .batch_write import deferred_compute
+from .dependency_graph import parse_references
+
+FIELDS = ("name", "expression", "unit", "comment")
+
+NAME = re.compile(r"[^\W\d]\w*$")
+
+WHITESPACE = re.compile(r"\s*")
+
+
+class ImportRow:
+    """A validated row of an import file"""
+
+    __slots__ = ("line_number", "name", "expression", "unit", "comment")
+
+    def __init__(self, line_number, name, expression, unit, comment):
+        self.line_number = line_number
+        self.name = name
+        self.expression = expression
+        self.unit = unit
+        self.comment = comment
+
+
+def read_rows(path, errors):
+    """Yields (line number, {field: text}) for each parameter in a CSV, JSON or JSON Lines file
+
+    CSV and JSON Lines files are streamed. A JSON file holding one array is read at once, and each
+    item is numbered by the line it starts on. Lines that cannot be read are added to errors as
+    (line number, message), a JSON Lines file carries on with the next line.
+    """
+
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(file)
+            try:
+                for row in reader:
+                    yield reader.line_num, row
+            except csv.Error as err:
+                errors.append(
+                    (reader.line_num + 1, "Invalid CSV, the rest of the file was not read: %s" % err)
+                )
+            return
+
+        first = file.read(1)
+        line_number = 1
+        while first.isspace():
+            if first == "\n":
+                line_number += 1
+            first = file.read(1)
+
+        if first == "[":
+            try:
+                yield from _array_rows(first + file.read(), line_number)
+            except ValueError as err:
+                line_number += getattr(err, "lineno", 1) - 1
+                errors.append(
+                    (line_number, "Invalid JSON, the rest of the file was not read: %s" % err)
+                )
+            return
+
+        line = first + file.readline()
+        while line:
+            if line.strip():
+                try:
+                    row = json.loads(line)
+                except ValueError as err:
+                    errors.append((line_number, "Invalid JSON: %s" % err))
+                else:
+                    yield line_number, row
+            line = file.readline()
+            line_number += 1
+
+
+def _array_rows(text, line_number):
+    """Yields (line number, item) for each item of a JSON array, raises ValueError if it is invalid
+
+    line_number is the line the array starts on.
+    """
+
+    decoder = json.JSONDecoder()
+    position = WHITESPACE.match(text, 1).end()
+    counted = 0  # Position up to which newlines have been added to line_number
+
+    if text.startswith("]", position):
+        position += 1
+    else:
+        while True:
+            row, end = decoder.raw_decode(text, position)
+            line_number += text.count("\n", counted, position)
+            counted = position
+            yield line_number, row
+
+            position = WHITESPACE.match(text, end).end()
+            if text.startswith("]", position):
+                position += 1
+                break
+            if not text.startswith(",", position):
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, position)
+            position = WHITESPACE.match(text, position + 1).end()
+
+    if WHITESPACE.match(text, position).end() != len(text):
+        raise json.JSONDecodeError("Extra data", text, position)
+
+
+def validate(path, length_unit):
+    """Reads and checks every row of a file before anything is imported
+
+    Rows without a unit get length_unit, the design's default length unit, or deg if their
+    expression is in degrees. Returns (rows, errors), where errors is a list of (line number, message). Rows are ordered so
+    each comes after the rows its expression refers to.
+    """
+
+    rows = []
+    errors = []
+    names = set()
+
+    try:
+        for line_number, row in read_rows(path, errors):
+            if not isinstance(row, dict):
+                errors.append((line_number, "Expected an object with %s" % ", ".join(FIELDS)))
+                continue
+
+            name = str(row.get("name") or "").strip()
+            expression = str(row.get("expression") or row.get("value") or "").strip()
+            unit = str(row.get("unit") or "").strip()
+            comment = str(row.get("comment") or "")
+
+            if not NAME.match(name):
+                errors.append((line_number, "Invalid name %r" % name))
+            elif name in names:
+                errors.append((line_number, "%s is in the file more than once" % name))
+            elif len(expression) == 0:
+                errors.append((line_number, "%s has no expression" % name))
+            else:
+                # The same default as parameters added in the window
+                if len(unit) == 0:
+                    unit = "deg" if "deg" in expression else length_unit
+
+                names.add(name)
+                rows.append(ImportRow(line_number, name, expression, unit, comment))
+
+    except (OSError, ValueError) as err:
+        errors.append((0, str(err)))
+
+    return _ordered(rows, names, errors), errors
+
+
+def _ordered(rows, names, errors):
+    """Orders rows so parameters are created after the parameters their expressions use"""
+
+    by_name = {row.name: row for row in rows}
+    ordered = []
+    state = {}  # 1 while a row's references are being visited, 2 once it is ordered
+    invalid = set()  # Names of the rows that refer to themselves
+
+    def visit(row):
+        state[row.name] = 1
+        return row, iter(parse_references(row.expression, names))
+
+    # Depth first with a stack rather than recursion, so a long chain of rows cannot exceed the
+    # recursion limit
+    for row in rows:
+        if row.name in state:
+            continue
+
+        stack = [visit(row)]
+
+        while len(stack) > 0:
+            current, references = stack[-1]
+            name = next(references, None)
+
+            if name is None:
+                stack.pop()
+                state[current.name] = 2
+                if current.name not in invalid:
+                    ordered.append(current)
+            elif name == current.name or name not in by_name:
+                continue
+            elif state.get(name) == 1:
+                errors.append(
+                    (current.line_number, "%s refers to itself through %s" % (current.name, name))
+                )
+                invalid.add(current.name)
+            elif name not in state:
+                stack.append(visit(by_name[name]))
+
+    return ordered
+
+
+def import_rows(design, rows, existing, create_value_input):
+    """Creates or updates parameters with the compute deferred, then computes the design once
+
+    Arguments:
+    design -- The design to import into.
+    rows -- Validated ImportRows.
+    existing -- Dictionary of the user parameters already in the design by name.
+    create_value_input -- Creates a ValueInput from an expression string.
+
+    Returns (created, updated, errors), where errors is a list of (line number, message) of the
+    rows Fusion 360 rejected. A rejected row does not stop the rest of the import.
+    """
+
+    created = 0
+    updated = 0
+    errors = []
+    parameters = design.userParameters
+
+    with deferred_compute(design):
+        for row in rows:
+            try:
+                parameter = existing.get(row.name)
+
+                if parameter is None:
+                    parameters.add(
+                        row.name, create_value_input(row.expression), row.unit, row.comment
+                    )
+                    created += 1
+                else:
+                    parameter.expression = row.expression
+                    if len(row.comment) > 0:
+                        parameter.comment = row.comment
+                    updated += 1
+
+            except RuntimeError as err:
+                errors.append((row.line_number, "%s: %s" % (row.name, err)))
+
+    return created, updated, errors
+
+
+def export_rows(path, table):
+    """Streams the parameters of a ParameterTable to a CSV, JSON or JSON Lines file"""
+
+    rows = zip(table.names, table.expressions, table.units, table.comments)
+
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        if path.lower().endswith(".csv"):
+            writer = csv.writer(file)
+            writer.writerow(FIELDS)
+            writer.writerows(rows)
+            return
+
+        is_array = path.lower().endswith(".json")
+        if is_array:
+            file.write("[\n")
+
+        for index, row in enumerate(rows):
+            if is_array and index > 0:
+                file.write(",\n")
+            file.write(json.dumps(dict(zip(FIELDS, row))))
+            if not is_array:
+                file.write("\n")
+
+        if is_array:
+            file.write("\n]\n")
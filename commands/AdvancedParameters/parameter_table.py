@@ -0,0 +1,125 @@
+class ApiCallCounter:
+    """Counts calls across the Fusion API boundary made during a tick"""
+
+    __slots__ = ("count", "last_tick")
+
+    def __init__(self):
+        self.count = 0
+        self.last_tick = 0
+
+    def add(self, calls=1):
+        self.count += calls
+
+    def end_tick(self):
+        """Stores and resets the count for the tick that just finished"""
+
+        self.last_tick = self.count
+        self.count = 0
+        return self.last_tick
+
+
+class ParameterTable:
+    """Snapshot of the user parameters stored in parallel lists
+
+    Everything is read from the design in one pass so the rest of the add-in only reads
+    local memory. Each property read of a parameter is a separate API call.
+    """
+
+    __slots__ = (
+        "items",
+        "names",
+        "values",
+        "units",
+        "expressions",
+        "comments",
+        "index",
+    )
+
+    # Calls made per row when reading a parameter: item(), name, value, unit, expression, comment
+    CALLS_PER_ROW = 6
+
+    def __init__(self):
+        self.items = []
+        self.names = []  # Rows are keyed by name, which is unique within a design
+        self.values = []
+        self.units = []
+        self.expressions = []
+        self.comments = []
+        self.index = {}  # Row number of each parameter name
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def capture(cls, parameters, counter=None):
+        """Reads every user parameter of a design into a new table"""
+
+        table = cls()
+        count = parameters.count
+
+        for row_number in range(count):
+            table._append(parameters.item(row_number))
+
+        if counter is not None:
+            counter.add(1 + count * cls.CALLS_PER_ROW)
+
+        return table
+
+    def refresh(self, rows, counter=None):
+        """Re-reads the given rows from the parameter objects already held by the table
+
+        Returns (old name, new name) of each row whose parameter has been renamed.
+        """
+
+        renamed = []
+
+        for row_number in rows:
+            parameter = self.items[row_number]
+            name = parameter.name
+
+            if name != self.names[row_number]:
+                renamed.append((self.names[row_number], name))
+                del self.index[self.names[row_number]]
+                self.index[name] = row_number
+                self.names[row_number] = name
+
+            self.values[row_number] = parameter.value
+            self.units[row_number] = parameter.unit
+            self.expressions[row_number] = parameter.expression
+            self.comments[row_number] = parameter.comment
+
+        if counter is not None:
+            counter.add(len(rows) * (self.CALLS_PER_ROW - 1))
+
+        return renamed
+
+    def diff(self, previous):
+        """Returns the rows of parameters that also exist in a previous table but have changed"""
+
+        changed_rows = []
+
+        if previous is None:
+            return changed_rows
+
+        for row_number, name in enumerate(self.names):
+            old_row = previous.index.get(name)
+
+            if old_row is not None and (
+                self.values[row_number] != previous.values[old_row]
+                or self.units[row_number] != previous.units[old_row]
+                or self.expressions[row_number] != previous.expressions[old_row]
+                or self.comments[row_number] != previous.comments[old_row]
+            ):
+                changed_rows.append(row_number)
+
+        return changed_rows
+
+    def _append(self, parameter):
+        name = parameter.name
+        self.index[name] = len(self.names)
+        self.items.append(parameter)
+        self.names.append(name)
+        self.values.append(parameter.value)
+        self.units.append(parameter.unit)
+        self.expressions.append(parameter.expression)
+        self.comments.append(parameter.comment)
@@ -0,0 +1,86 @@
+import json
+
+from .layout_cache import ATTRIBUTE_GROUP
+
+ATTRIBUTE_NAME = "presets"
+PRESETS_VERSION = 1
+
+
+class Presets:
+    """Named snapshots of user parameter values, stored as differences from a shared base
+
+    The base is the first snapshot saved, so each preset only holds the parameters where it
+    differs from that snapshot and hundreds of variants stay small. Values are in Fusion 360's
+    internal units, keyed by parameter name.
+    """
+
+    __slots__ = ("base", "deltas")
+
+    def __init__(self, base=None, deltas=None):
+        self.base = base or {}
+        self.deltas = deltas or {}  # Changed values of each preset
+
+    def names(self):
+        return sorted(self.deltas)
+
+    def save(self, name, values):
+        """Stores the values of a preset, replacing any preset with the same name"""
+
+        if len(self.base) == 0:
+            self.base = dict(values)
+
+        self.deltas[name] = {
+            parameter: value
+            for parameter, value in values.items()
+            if self.base.get(parameter) != value
+        }
+
+    def values(self, name):
+        """Returns every value of a preset, raises KeyError if there is no preset with the name"""
+
+        values = dict(self.base)
+        values.update(self.deltas[name])
+        return values
+
+    def delete(self, name):
+        self.deltas.pop(name, None)
+
+    def to_json(self):
+        return json.dumps(
+            {"version": PRESETS_VERSION, "base": self.base, "presets": self.deltas},
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, text):
+        """Returns the presets stored in text, or None if they are invalid or from another version"""
+
+        try:
+            data = json.loads(text)
+
+            if data.get("version") != PRESETS_VERSION:
+                return None
+
+            return cls(
+                dict(data["base"]),
+                {name: dict(delta) for name, delta in data["presets"].items()},
+            )
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return None
+
+
+def load_presets(design):
+    """Reads the presets of a design in one call, returns empty Presets if the design has none"""
+
+    attribute = design.attributes.itemByName(ATTRIBUTE_GROUP, ATTRIBUTE_NAME)
+
+    if attribute is None:
+        return Presets()
+
+    return Presets.from_json(attribute.value) or Presets()
+
+
+def save_presets(design, presets):
+    """Stores the presets of a design, replacing any presets it already has"""
+
+    design.attributes.add(ATTRIBUTE_GROUP, ATTRIBUTE_NAME, presets.to_json())
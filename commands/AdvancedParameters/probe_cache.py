@@ -0,0 +1,197 @@
+import collections
+import json
+import os
+import sqlite3
+
+
+def design_version(design):
+    """Returns a string that changes whenever the design's timeline or saved version changes"""
+
+    parts = []
+
+    data_file = design.parentDocument.dataFile
+    if data_file is not None:
+        parts.append(str(data_file.versionNumber))
+
+    # Direct modeling designs have no timeline
+    timeline = getattr(design, "timeline", None)
+    if timeline is not None:
+        parts.append("%d:%d" % (timeline.count, timeline.markerPosition))
+
+    return "/".join(parts)
+
+
+class ProbeCache:
+    """Metrics measured at each parameter vector, in an in-memory LRU backed by a SQLite file
+
+    Entries are keyed by (design ID, design version, parameter vector). When a design is seen
+    at a new version, its entries from other versions are dropped from both tiers. Edits that
+    do not change the version, e.g. to a sketch or feature, are handled by clear(). The file
+    keeps the disk_size most recently used entries.
+
+    The connection is opened on first use, so the cache must only be used from one thread.
+    """
+
+    def __init__(self, path, memory_size=256, disk_size=10000):
+        self.path = path
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._memory = collections.OrderedDict()
+        self._versions = {}  # Last version seen of each design
+        self._cleared = set()  # Designs with no entries since they were last cleared
+        self._connection = None
+        self._clock = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, design_id, version, vector, is_counted=True):
+        """Returns the metrics stored for a parameter vector, or None if it has not been measured
+
+        Lookups made automatically, e.g. after each write, pass is_counted=False so the hit and
+        miss counts only show the lookups that were asked for.
+        """
+
+        self._check_version(design_id, version)
+        key = _encode_key(design_id, version, vector)
+
+        metrics = self._memory.get(key)
+        if metrics is not None:
+            self._memory.move_to_end(key)
+            if is_counted:
+                self.memory_hits += 1
+            return metrics
+
+        connection = self._connect()
+        row = connection.execute("SELECT metrics FROM probes WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            if is_counted:
+                self.misses += 1
+            return None
+
+        metrics = tuple(json.loads(row[0]))
+        connection.execute("UPDATE probes SET used = ? WHERE key = ?", (self._tick(), key))
+        connection.commit()
+        self._remember(key, metrics)
+        if is_counted:
+            self.disk_hits += 1
+        return metrics
+
+    def put(self, design_id, version, vector, metrics):
+        """Stores the metrics measured at a parameter vector"""
+
+        self._check_version(design_id, version)
+        key = _encode_key(design_id, version, vector)
+        metrics = tuple(metrics)
+        self._remember(key, metrics)
+        self._cleared.discard(design_id)
+
+        connection = self._connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?, ?)",
+            (key, design_id, version, json.dumps(metrics), self._tick()),
+        )
+
+        # Evicts the least recently used entries beyond the size of the file
+        connection.execute(
+            "DELETE FROM probes WHERE key IN "
+            "(SELECT key FROM probes ORDER BY used DESC LIMIT -1 OFFSET ?)",
+            (self.disk_size,),
+        )
+        connection.commit()
+
+    def invalidate(self, design_id, version):
+        """Drops the entries of a design from every version but the given one"""
+
+        self._memory = collections.OrderedDict(
+            (key, metrics)
+            for key, metrics in self._memory.items()
+            if not _is_stale(key, design_id, version)
+        )
+
+        connection = self._connect()
+        connection.execute(
+            "DELETE FROM probes WHERE design = ? AND version != ?", (design_id, version)
+        )
+        connection.commit()
+
+    def clear(self, design_id):
+        """Drops every entry of a design, e.g. after a command that may have changed its geometry"""
+
+        if design_id in self._cleared:
+            return
+
+        self._memory = collections.OrderedDict(
+            (key, metrics)
+            for key, metrics in self._memory.items()
+            if json.loads(key)[0] != design_id
+        )
+
+        connection = self._connect()
+        connection.execute("DELETE FROM probes WHERE design = ?", (design_id,))
+        connection.commit()
+        self._cleared.add(design_id)
+
+    def summary(self):
+        return {
+            "memory hits": self.memory_hits,
+            "disk hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _check_version(self, design_id, version):
+        previous = self._versions.get(design_id)
+        self._versions[design_id] = version
+
+        if previous is not None and previous != version:
+            self.invalidate(design_id, version)
+
+    def _remember(self, key, metrics):
+        self._memory[key] = metrics
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS probes "
+                "(key TEXT PRIMARY KEY, design TEXT, version TEXT, metrics TEXT, used INTEGER)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS probes_used ON probes (used)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS probes_design ON probes (design)"
+            )
+
+            # The use order carries on from the entries already in the file
+            self._clock = self._connection.execute(
+                "SELECT COALESCE(MAX(used), 0) FROM probes"
+            ).fetchone()[0]
+
+        return self._connection
+
+
+def _encode_key(design_id, version, vector):
+    return json.dumps([design_id, version, vector], separators=(",", ":"))
+
+
+def _is_stale(key, design_id, version):
+    key_design_id, key_version, _ = json.loads(key)
+    return key_design_id == design_id and key_version != version
@@ -0,0 +1,72 @@
+class SliderRange:
+    """Minimum, maximum and increment of the sliders of one unit, in display units"""
+
+    __slots__ = ("minimum", "maximum", "increment")
+
+    def __init__(self, minimum, maximum, increment):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increment = increment
+
+    def __eq__(self, other):
+        return isinstance(other, SliderRange) and (
+            self.minimum == other.minimum
+            and self.maximum == other.maximum
+            and self.increment == other.increment
+        )
+
+    def quantize(self, value):
+        """Returns a value moved to the nearest increment inside the range"""
+
+        value = round(value / self.increment) * self.increment
+        return round(min(max(value, self.minimum), self.maximum), 5)
+
+    def fits(self, value):
+        """Returns whether a value can be shown on the slider without widening the range or increment"""
+
+        value = round(value, 5)
+        step = precision(value)
+        return self.minimum <= value <= self.maximum and (
+            step is None or step >= self.increment
+        )
+
+
+def precision(value):
+    """Returns the increment needed to show a value to five decimal places, or None for whole numbers"""
+
+    value = round(value, 5)
+
+    for decimals in range(6):
+        if round(value, decimals) == value:
+            return 10**-decimals if decimals > 0 else None
+
+
+def compute_ranges(values, units, base):
+    """Returns a {unit: SliderRange} dictionary covering every parameter in one pass
+
+    The values are in the units shown on sliders, see UnitTable.to_display(). Each unit starts
+    from the base range and is widened to fit the values of that unit, and its increment is
+    reduced to the finest precision of those values.
+    """
+
+    ranges = {}
+
+    for value, unit in zip(values, units):
+        slider_range = ranges.get(unit)
+        if slider_range is None:
+            slider_range = ranges[unit] = SliderRange(
+                base.minimum, base.maximum, base.increment
+            )
+
+        value = round(value, 5)
+
+        if value < slider_range.minimum:
+            slider_range.minimum = value
+        elif value > slider_range.maximum:
+            slider_range.maximum = value
+
+        step = precision(value)
+        if step is not None and step < slider_range.increment:
+            slider_range.increment = step
+
+    return ranges
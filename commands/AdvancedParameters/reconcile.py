@@ -0,0 +1,20 @@
+def reconcile(old_keys, new_keys):
+    """Works out how to turn rows keyed by old_keys into rows keyed by new_keys
+
+    Returns (removed, added, moved) where removed and added are keys that only exist in one
+    of the lists and moved are keys in both lists whose position has changed. Rows that are
+    in both lists at the same position are left alone, so renames and edits keep their row.
+    """
+
+    old_positions = {key: position for position, key in enumerate(old_keys)}
+    new_positions = {key: position for position, key in enumerate(new_keys)}
+
+    removed = [key for key in old_keys if key not in new_positions]
+    added = [key for key in new_keys if key not in old_positions]
+    moved = [
+        key
+        for key in new_keys
+        if key in old_positions and old_positions[key] != new_positions[key]
+    ]
+
+    return removed, added, moved
@@ -0,0 +1,55 @@
+import threading
+
+
+class SelectionTracker:
+    """Caches whether anything is selected in the workspace, updated by the active selection event
+
+    Parameters cannot be written while there is a selection, so the writes that are blocked
+    are kept here and handed back as soon as the selection is cleared.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocked = set()
+        self.count = 0
+
+    @property
+    def has_selections(self):
+        return self.count > 0
+
+    def update(self, count):
+        """Records the number of selected entities, returns the blocked keys if the selection was cleared"""
+
+        with self._lock:
+            self.count = count
+
+            if count > 0 or len(self._blocked) == 0:
+                return set()
+
+            blocked, self._blocked = self._blocked, set()
+
+        return blocked
+
+    def block(self, key):
+        """Holds a write back until the selection is cleared, returns False if it already has been"""
+
+        with self._lock:
+            if self.count == 0:
+                return False
+
+            self._blocked.add(key)
+            return True
+
+    def rename(self, key, new_key):
+        """Moves a blocked write to the new key of a renamed parameter"""
+
+        with self._lock:
+            if key in self._blocked:
+                self._blocked.discard(key)
+                self._blocked.add(new_key)
+
+    def discard(self, key):
+        """Drops a blocked write, e.g. for a parameter that has been deleted"""
+
+        with self._lock:
+            self._blocked.discard(key)
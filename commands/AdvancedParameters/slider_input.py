@@ -0,0 +1,50 @@
+import threading
+
+
+class SliderInput:
+    """Slider input from the window thread, kept in order until the next tick applies it on the main thread
+
+    The window never changes the engine's state itself, so each call is queued here with the
+    name of the engine method that applies it. All access goes through a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = []
+
+    @property
+    def pending(self):
+        with self._lock:
+            return len(self._calls) > 0
+
+    def move(self, key, slider_value):
+        self._post("move_slider", key, slider_value)
+
+    def press(self, now):
+        self._post("press_slider", now)
+
+    def drag(self, now):
+        self._post("drag_slider", now)
+
+    def scroll(self, now):
+        self._post("scroll_slider", now)
+
+    def release(self):
+        self._post("release_slider")
+
+    def show_top(self, key):
+        """Records the parameter at the top of the window's list, which is saved with the layout"""
+
+        self._post("set_top_key", key)
+
+    def take(self):
+        """Returns the queued calls as (method name, arguments) tuples and clears them"""
+
+        with self._lock:
+            calls, self._calls = self._calls, []
+
+        return calls
+
+    def _post(self, method, *args):
+        with self._lock:
+            self._calls.append((method, args))
@@ -0,0 +1,273 @@
+import csv
+import itertools
+import json
+import os
+import random
+import time
+
+from .batch_write import deferred_compute, write_values
+
+METHODS = ("Grid", "Latin hypercube", "Random")
+
+# Measurements recorded for each point, in Fusion 360's internal units
+METRICS = ("volume_cm3", "mass_kg", "area_cm2", "size_x_cm", "size_y_cm", "size_z_cm")
+
+
+class SweepParameter:
+    """A parameter to sweep and its range, in the units shown on its slider"""
+
+    __slots__ = ("name", "minimum", "maximum")
+
+    def __init__(self, name, minimum, maximum):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+
+
+def parse_spec(text, names, derived=()):
+    """Reads "name minimum maximum" lines into SweepParameters, raises ValueError for invalid lines
+
+    Parameters in derived are computed from other parameters. Writing values to them would
+    replace their expressions, so they cannot be swept.
+    """
+
+    parameters = []
+
+    for line_number, line in enumerate(text.splitlines(), 1):
+        fields = line.split()
+
+        if len(fields) == 0 or fields[0].startswith("#"):
+            continue
+
+        if len(fields) != 3:
+            raise ValueError("Line %d should be: name minimum maximum" % line_number)
+
+        name = fields[0]
+        if name not in names:
+            raise ValueError("Line %d: there is no parameter called %s" % (line_number, name))
+        if name in derived:
+            raise ValueError(
+                "Line %d: %s is computed from other parameters and cannot be swept"
+                % (line_number, name)
+            )
+
+        try:
+            minimum, maximum = float(fields[1]), float(fields[2])
+        except ValueError:
+            raise ValueError("Line %d: the range must be two numbers" % line_number)
+
+        parameters.append(SweepParameter(name, minimum, maximum))
+
+    if len(parameters) == 0:
+        raise ValueError("No parameters to sweep.")
+
+    return parameters
+
+
+def point_count(method, parameters, count):
+    """Returns the number of points a sweep runs, count is the steps of each parameter for a grid"""
+
+    if method == "Grid":
+        return count ** len(parameters)
+    return count
+
+
+def generate_points(method, parameters, count, seed):
+    """Yields the points of a sweep one at a time, always in the same order for the same seed
+
+    Grid and random points are generated without keeping earlier points. A Latin hypercube keeps
+    one shuffled list of count row numbers for each parameter.
+    """
+
+    rng = random.Random(seed)
+
+    if method == "Grid":
+        axes = [
+            [
+                parameter.minimum
+                + (parameter.maximum - parameter.minimum) * step / max(count - 1, 1)
+                for step in range(count)
+            ]
+            for parameter in parameters
+        ]
+        return itertools.product(*axes)
+
+    if method == "Latin hypercube":
+        strata = [rng.sample(range(count), count) for _ in parameters]
+        return (
+            tuple(
+                parameter.minimum
+                + (parameter.maximum - parameter.minimum)
+                * (strata[column][index] + rng.random())
+                / count
+                for column, parameter in enumerate(parameters)
+            )
+            for index in range(count)
+        )
+
+    if method == "Random":
+        return (
+            tuple(rng.uniform(parameter.minimum, parameter.maximum) for parameter in parameters)
+            for _ in range(count)
+        )
+
+    raise ValueError("Unknown sweep method " + method)
+
+
+def measure(design, accuracy):
+    """Returns the METRICS of a design's root component"""
+
+    root = design.rootComponent
+    properties = root.getPhysicalProperties(accuracy)
+    box = root.boundingBox
+    low, high = box.minPoint, box.maxPoint
+
+    return (
+        properties.volume,
+        properties.mass,
+        properties.area,
+        high.x - low.x,
+        high.y - low.y,
+        high.z - low.z,
+    )
+
+
+class SweepFile:
+    """Streams the points of a sweep to a CSV file, one flushed row at a time
+
+    The first line is a # comment holding the sweep's method, seed, count and ranges, e.g. for
+    pandas.read_csv(path, comment="#"). If the file already holds rows of the same sweep, new rows
+    are appended after them so the sweep resumes where it stopped. The same points are only
+    generated again from the same spec, so a file of any other sweep is refused.
+    """
+
+    def __init__(self, path, method, parameters, count, seed):
+        self.path = path
+        self.spec = {
+            "method": method,
+            "seed": seed,
+            "count": count,
+            "ranges": [
+                [parameter.name, parameter.minimum, parameter.maximum]
+                for parameter in parameters
+            ],
+        }
+        self.header = (
+            ["point"] + [parameter.name for parameter in parameters] + list(METRICS)
+        )
+        self.resume_index = 0
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, newline="") as file:
+                spec = _read_spec(file.readline())
+                reader = csv.reader(file)
+
+                if spec != self.spec or next(reader, None) != self.header:
+                    raise ValueError(
+                        "%s holds a different sweep, choose another file." % os.path.basename(path)
+                    )
+                self.resume_index = sum(1 for _ in reader)
+
+            self._file = open(path, "a", newline="")
+            self._writer = csv.writer(self._file)
+        else:
+            self._file = open(path, "w", newline="")
+            self._file.write("# " + json.dumps(self.spec) + "\n")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.header)
+            self._file.flush()
+
+    def write(self, index, values, metrics):
+        self._writer.writerow([index] + list(values) + list(metrics))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _read_spec(line):
+    """Returns the spec from the comment on the first line of a sweep file, or None"""
+
+    if not line.startswith("# "):
+        return None
+
+    try:
+        return json.loads(line[2:])
+    except ValueError:
+        return None
+
+
+class SweepRunner:
+    """Writes each point of a sweep to the design and records its metrics
+
+    Each call to step() runs one point, so the caller can post every point as its own main-thread
+    operation and the window stays responsive and able to cancel between points. The values are
+    written with compute deferred so each point is computed once.
+
+    Arguments:
+    design -- The design to sweep.
+    items -- The user parameters being swept, in the order of the values of each point.
+    points -- Iterator of points in slider units, see generate_points().
+    total -- The number of points.
+    sweep_file -- The SweepFile the results are streamed to.
+    create_value_input -- Creates a ValueInput from a real value.
+    measure -- Returns the METRICS of the design.
+    units -- The UnitTable of the design, for the units shown on the sliders.
+    """
+
+    def __init__(
+        self, design, items, points, total, sweep_file, create_value_input, measure, units
+    ):
+        self.design = design
+        self.items = items
+        self.total = total
+        self.sweep_file = sweep_file
+        self.create_value_input = create_value_input
+        self.measure = measure
+
+        self.factors = [units.factor(item.unit) for item in items]
+        self.original_expressions = [item.expression for item in items]
+
+        # Points that are already in the file are skipped when resuming
+        self.index = sweep_file.resume_index
+        self.points = itertools.islice(points, self.index, None)
+
+        self.is_cancelled = False
+        self.points_run = 0
+        self.started = time.monotonic()
+
+    @property
+    def is_finished(self):
+        return self.is_cancelled or self.index >= self.total
+
+    @property
+    def points_per_minute(self):
+        elapsed = time.monotonic() - self.started
+        return self.points_run / elapsed * 60 if elapsed > 0 else 0
+
+    def step(self):
+        """Runs the next point and returns the number of points finished"""
+
+        point = next(self.points)
+        values = [value / factor for value, factor in zip(point, self.factors)]
+
+        self._set_values(values)
+        self.sweep_file.write(self.index, point, self.measure(self.design))
+
+        self.index += 1
+        self.points_run += 1
+        return self.index
+
+    def finish(self):
+        """Puts back the expressions the swept parameters had before the sweep and closes the file"""
+
+        try:
+            with deferred_compute(self.design):
+                for item, expression in zip(self.items, self.original_expressions):
+                    item.expression = expression
+        finally:
+            self.sweep_file.close()
+
+    def _set_values(self, values):
+        with deferred_compute(self.design):
+            write_values(self.design, self.items, values, self.create_value_input)
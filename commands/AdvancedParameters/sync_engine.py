@@ -0,0 +1,926 @@
+import time
+
+from .batch_write import write_values
+from .change_tracker import ChangeTracker
+from .compute_deferral import ComputeDeferral
+from .dependency_graph import DependencyGraph
+from .document_cache import DocumentCache, DocumentState
+from .expression_evaluator import ExpressionEvaluator
+from .instrumentation import Instrumentation
+from .layout_cache import Layout, load_layout, save_layout
+from .parameter_table import ApiCallCounter, ParameterTable
+from .presets import Presets, load_presets, save_presets
+from .ranges import compute_ranges
+from .reconcile import reconcile
+from .selection_tracker import SelectionTracker
+from .slider_input import SliderInput
+from .undo_stack import Change, Gesture, UndoStack
+from .units import UnitTable
+from .write_scheduler import WriteScheduler
+
+
+class SyncResult:
+    """What changed during a tick, so the window knows which widgets to update"""
+
+    __slots__ = (
+        "is_full_sync",
+        "is_rendered",
+        "slider_keys",
+        "is_selection_blocked",
+        "is_layout_loaded",
+        "is_design_switched",
+        "top_key",
+        "positions",
+        "view",
+        "is_write_pending",
+        "is_written",
+    )
+
+    def __init__(self, is_full_sync):
+        self.is_full_sync = is_full_sync
+        self.is_rendered = False  # Rows were added, removed, moved or relabelled
+        self.slider_keys = set()  # Sliders whose position was set by the engine
+        self.is_selection_blocked = False  # A write has just been held back by a selection
+        self.is_layout_loaded = False
+        self.is_design_switched = False
+        self.top_key = None  # Parameter to scroll to, from a loaded layout
+        self.positions = {}  # Position of each slider in slider_keys as (value, is_preview)
+        self.view = None  # SliderView of every parameter, if rows were rendered
+        self.is_write_pending = False
+        self.is_written = False  # Values were written to the design
+
+
+class SliderView:
+    """A copy of everything the window shows, made on the main thread
+
+    The window thread only reads views and SyncResults, never the engine's live state, which
+    the main thread may be replacing at the same time, e.g. while it switches designs.
+    """
+
+    __slots__ = (
+        "names",
+        "index",
+        "units",
+        "comments",
+        "derived",
+        "slider_ranges",
+        "base_range",
+        "length_unit",
+        "length_factor",
+        "preset_names",
+        "positions",
+    )
+
+    def __init__(
+        self,
+        names,
+        index,
+        units,
+        comments,
+        derived,
+        slider_ranges,
+        base_range,
+        length_unit,
+        length_factor,
+        preset_names,
+        positions,
+    ):
+        self.names = names
+        self.index = index  # Row of each parameter by key
+        self.units = units
+        self.comments = comments
+        self.derived = derived  # Keys of parameters computed from other parameters
+        self.slider_ranges = slider_ranges
+        self.base_range = base_range
+        self.length_unit = length_unit
+        self.length_factor = length_factor
+        self.preset_names = preset_names
+        self.positions = positions  # Position of each slider as (value, is_preview)
+
+
+class ParameterSyncEngine:
+    """Keeps the slider state of the window in sync with the user parameters of the active design
+
+    The engine has no widgets and only talks to Fusion 360 through the functions it is given,
+    so it can be run and measured against a fake design outside of Fusion 360.
+
+    Arguments:
+    get_design -- Returns the active design.
+    create_value_input -- Creates a ValueInput from a real value, used for batched writes.
+    base_range -- The SliderRange that the range of each unit starts from.
+    selection_tracker -- The SelectionTracker updated by the active selection event.
+    write_on_release -- Holds the writes of a slider gesture until it ends, so each gesture is one
+    write and one step in Fusion 360's undo history.
+    """
+
+    def __init__(
+        self,
+        get_design,
+        create_value_input,
+        base_range,
+        *,
+        selection_tracker=None,
+        instrumentation=None,
+        sync_interval=0.05,
+        safety_net_interval=5,
+        defer_compute_latency=0.3,
+        defer_compute_idle_time=0.6,
+        document_cache_size=8,
+        write_on_release=False,
+        undo_size=100,
+    ):
+        self.get_design = get_design
+        self.create_value_input = create_value_input
+        self.safety_net_interval = safety_net_interval
+        self.write_on_release = write_on_release
+        self.gesture_idle_time = defer_compute_idle_time
+
+        self.change_tracker = ChangeTracker()
+        self.selection_tracker = selection_tracker or SelectionTracker()
+        self.api_calls = ApiCallCounter()
+        self.instrumentation = instrumentation or Instrumentation()
+        self.write_scheduler = WriteScheduler(min_interval=sync_interval)
+        self.compute_deferral = ComputeDeferral(defer_compute_latency, defer_compute_idle_time)
+        self.dependency_graph = DependencyGraph()
+        self.evaluator = ExpressionEvaluator()
+        self.document_cache = DocumentCache(document_cache_size)
+        self.undo_stack = UndoStack(undo_size)
+
+        self.design = None
+        self.design_key = None
+        self.table = None
+        self.base_range = base_range
+        self.units = UnitTable()  # Read from the units manager of each design
+        self.slider_ranges = {}  # SliderRange of each unit
+        self.slider_values = {}  # Slider position of each parameter, in display units
+        self.sliders_moved = {}  # Whether each slider has been moved by the user
+        self.saved_layout = None
+        self.top_key = None  # Parameter at the top of the window's list, saved with the layout
+        self.selected_flag = False
+        self.last_full_sync = 0
+        self.stale_keys = set()  # Parameters computed from written values that need to be reread
+        self.previews = {}  # Provisional slider positions of derived parameters, until they are reread
+        self.presets = Presets()
+        self.gesture = None  # The slider gesture in progress
+        self.slider_input = SliderInput()  # Posted by the window thread, applied by the next tick
+        self.is_busy = False  # Whether a write, deferred compute or gesture is waiting for a tick
+
+    def tick(self, now):
+        """Syncs pending changes in both directions, returns None if there was nothing to do"""
+
+        instrumentation = self.instrumentation
+        if instrumentation.enabled:
+            tick_start = time.perf_counter()
+
+        previewed = self._apply_input()
+        all_dirty, dirty_keys = self.change_tracker.take()
+
+        # Safety net for changes that are not reported by any event
+        if now - self.last_full_sync > self.safety_net_interval:
+            all_dirty = True
+
+        # Nothing has changed so the workspace does not need to be read
+        if (
+            not all_dirty
+            and len(dirty_keys) == 0
+            and not self.write_scheduler.pending
+            and not self.compute_deferral.is_deferred
+            and self.gesture is None
+        ):
+            instrumentation.count("idle ticks")
+            self.api_calls.end_tick()
+            self.is_busy = False
+            return None
+
+        result = SyncResult(all_dirty)
+        result.slider_keys.update(previewed)
+        rows = set()
+
+        if all_dirty:
+            rows.update(self._full_sync(now, result))
+
+        table = self.table
+        rows.update(table.index[key] for key in dirty_keys if key in table.index)
+
+        # Parameters computed from written values are reread instead of the whole table
+        stale_keys, self.stale_keys = self.stale_keys, set()
+        if not all_dirty and len(stale_keys) > 0:
+            self._refresh_stale(stale_keys, result)
+            rows.update(table.index[key] for key in stale_keys if key in table.index)
+
+        if len(rows) > 0:
+            self._sync_rows(rows, result)
+
+        result.is_written = self._write(now)
+
+        result.positions = self.positions(result.slider_keys)
+        result.is_write_pending = self.write_scheduler.pending
+        if result.is_rendered:
+            result.view = self.view()
+
+        self.is_busy = (
+            self.write_scheduler.pending
+            or self.compute_deferral.is_deferred
+            or self.gesture is not None
+        )
+
+        calls = self.api_calls.end_tick()
+
+        if instrumentation.enabled:
+            instrumentation.count("ticks")
+            instrumentation.count("full syncs" if all_dirty else "row syncs")
+            instrumentation.observe("API calls per tick", calls)
+            instrumentation.observe("tick ms", (time.perf_counter() - tick_start) * 1000)
+
+        return result
+
+    def has_work(self, now):
+        """Returns whether a tick would have anything to do, without reading the design
+
+        Called from the window thread, so only flags that are set in one step are read.
+        """
+
+        return (
+            self.is_busy
+            or self.slider_input.pending
+            or self.change_tracker.pending
+            or now - self.last_full_sync > self.safety_net_interval
+        )
+
+    def view(self):
+        """Returns a SliderView of every parameter for the window, or None before the first sync"""
+
+        table = self.table
+        if table is None:
+            return None
+
+        graph = self.dependency_graph
+        units = self.units
+
+        return SliderView(
+            list(table.names),
+            dict(table.index),
+            list(table.units),
+            list(table.comments),
+            {key for key in table.names if graph.is_derived(key)},
+            dict(self.slider_ranges),
+            self.base_range,
+            units.length_unit,
+            units.factor(units.length_unit),
+            self.presets.names(),
+            self.positions(table.names),
+        )
+
+    def positions(self, keys):
+        """Returns the position of each slider as (value, is_preview), previews are shown until the parameter is reread"""
+
+        previews = self.previews
+        slider_values = self.slider_values
+
+        return {
+            key: (previews[key], True) if key in previews else (slider_values[key], False)
+            for key in keys
+            if key in slider_values
+        }
+
+    def move_slider(self, key, slider_value):
+        """Records a slider moved by the user so its value is written to the design"""
+
+        if self.dependency_graph.is_derived(key):
+            return
+
+        # The value before a gesture is what undoing the gesture goes back to
+        gesture = self.gesture
+        if gesture is not None and key not in gesture.before and key in self.table.index:
+            gesture.before[key] = round(self.table.values[self.table.index[key]], 5)
+
+        self.slider_values[key] = slider_value
+        self.sliders_moved[key] = True
+        self.change_tracker.mark(key)
+
+    def press_slider(self, now):
+        """Starts a drag gesture"""
+
+        self._begin_gesture(True, now)
+        self.compute_deferral.press(now)
+
+    def drag_slider(self, now):
+        """Records slider movement during a drag gesture"""
+
+        if self.gesture is not None:
+            self.gesture.last_activity = now
+
+        self.compute_deferral.touch(now)
+
+    def scroll_slider(self, now):
+        """Records a mouse wheel step, steps close together are one gesture"""
+
+        self._begin_gesture(False, now)
+        self.compute_deferral.touch(now)
+
+    def release_slider(self):
+        """Ends a drag gesture so its final values are written without waiting"""
+
+        if self.gesture is not None:
+            self.gesture.is_pressed = False
+            self.gesture.is_released = True
+
+        self.write_scheduler.release()
+        self.compute_deferral.release()
+
+    def set_top_key(self, key):
+        """Records the parameter at the top of the window's list, saved with the layout"""
+
+        self.top_key = key
+
+    def undo(self):
+        """Puts back the values from before the last change in one batch, returns the keys of the sliders that moved"""
+
+        change = self.undo_stack.undo()
+        return self.apply_values(change.before, False) if change is not None else []
+
+    def redo(self):
+        """Makes the last undone change again in one batch, returns the keys of the sliders that moved"""
+
+        change = self.undo_stack.redo()
+        return self.apply_values(change.after, False) if change is not None else []
+
+    def preview(self, key):
+        """Calculates the parameters computed from a moved slider locally, before the design recomputes
+
+        Returns the keys of the previewed parameters, whose provisional slider positions are kept
+        in previews until they are reread from the design.
+        """
+
+        graph = self.dependency_graph
+        dependents = graph.dependents_of([key])
+
+        if len(dependents) == 0:
+            return []
+
+        table = self.table
+        row_number = table.index[key]
+        values = {
+            table.names[row_number]: self.slider_values[key]
+            / self.units.factor(table.units[row_number])
+        }
+
+        def value_of(name):
+            value = values.get(name)
+            return value if value is not None else table.values[table.index[name]]
+
+        previewed = []
+
+        for dependent in graph.ordered(dependents):
+            row_number = table.index[dependent]
+            unit = table.units[row_number]
+            value = self.evaluator.evaluate(table.expressions[row_number], unit, value_of)
+
+            # Parameters that cannot be evaluated locally keep their last value from the design
+            if value is not None:
+                values[table.names[row_number]] = value
+                self.previews[dependent] = value * self.units.factor(unit)
+                previewed.append(dependent)
+
+        return previewed
+
+    def set_base_range(self, base_range):
+        """Changes the range that every unit starts from"""
+
+        self.base_range = base_range
+
+        if self.table is not None:
+            self.update_ranges()
+
+    def rename(self, key, name):
+        """Renames a parameter and keeps its slider state, returns whether Fusion 360 accepted the name"""
+
+        table = self.table
+        row_number = table.index[key]
+        table.items[row_number].name = name
+        self.api_calls.add(1)
+
+        for old_key, new_key in table.refresh([row_number], self.api_calls):
+            self._rename_key(old_key, new_key)
+
+        # Expressions that use the parameter are updated by Fusion 360 to the new name
+        self.change_tracker.mark_all()
+
+        return table.names[row_number] == name
+
+    def update_ranges(self):
+        """Recalculates the slider range of each unit and re-quantizes only the sliders whose range changed
+
+        Returns the keys of the sliders that were moved.
+        """
+
+        table = self.table
+        new_ranges = compute_ranges(
+            self.units.to_display(table.values, table.units), table.units, self.base_range
+        )
+        changed_units = [
+            unit
+            for unit, slider_range in new_ranges.items()
+            if slider_range != self.slider_ranges.get(unit)
+        ]
+        self.slider_ranges = new_ranges
+
+        moved_keys = []
+
+        if len(changed_units) == 0:
+            return moved_keys
+
+        # Updates the rounding of workspace parameters, only writing back values that actually move
+        for row_number, key in enumerate(table.names):
+            unit = table.units[row_number]
+
+            # Derived sliders are not written as that would replace their expressions
+            if unit in changed_units and not self.dependency_graph.is_derived(key):
+                slider_value = self.slider_values[key]
+                quantized_value = new_ranges[unit].quantize(slider_value)
+
+                if quantized_value != round(slider_value, 5):
+                    self.move_slider(key, quantized_value)
+                    moved_keys.append(key)
+
+        return moved_keys
+
+    def load_layout(self):
+        """Restores the slider settings saved in the design with one read, returns the layout or None"""
+
+        layout = load_layout(self.design)
+        self.api_calls.add(2)
+
+        self.saved_layout = layout.to_json() if layout is not None else None
+
+        if layout is not None:
+            self.base_range = layout.base_range
+            self.slider_ranges = layout.slider_ranges
+
+        return layout
+
+    def save_layout(self):
+        """Stores the slider settings and scroll position in the design if they have changed"""
+
+        if self.design is None or self.table is None:
+            return
+
+        layout = Layout(self.base_range, self.slider_ranges, self.top_key)
+        layout_json = layout.to_json()
+
+        if layout_json != self.saved_layout:
+            save_layout(self.design, layout)
+            self.api_calls.add(2)
+            self.saved_layout = layout_json
+
+    def parameter_vector(self):
+        """Returns the name and rounded value of every parameter with a slider, which identify a design state"""
+
+        table = self.table
+        graph = self.dependency_graph
+
+        return [
+            [name, round(value, 5)]
+            for key, name, value in zip(table.names, table.names, table.values)
+            if not graph.is_derived(key)
+        ]
+
+    def preset_values(self):
+        """Returns the rounded value of every parameter with a slider by name"""
+
+        return dict(self.parameter_vector())
+
+    def save_preset(self, name):
+        """Stores the current values as a named preset in the design's attributes"""
+
+        self.presets.save(name, self.preset_values())
+        save_presets(self.design, self.presets)
+        self.api_calls.add(2)
+
+    def delete_preset(self, name):
+        self.presets.delete(name)
+        save_presets(self.design, self.presets)
+        self.api_calls.add(2)
+
+    def apply_preset(self, name):
+        """Writes the values of a preset in one batch, returns the keys of the sliders that moved"""
+
+        return self.apply_values(self.presets.values(name))
+
+    def apply_values(self, values, is_undoable=True):
+        """Writes values by parameter name in one batch with one recompute
+
+        Parameters that no longer exist, are derived or already have the value are skipped.
+        Returns the keys of the sliders that moved.
+        """
+
+        table = self.table
+        rows = {name: row_number for row_number, name in enumerate(table.names)}
+        writes = {}
+        before = {}
+
+        for name, value in values.items():
+            row_number = rows.get(name)
+            if row_number is None:
+                continue
+
+            key = table.names[row_number]
+            if self.dependency_graph.is_derived(key) or round(table.values[row_number], 5) == value:
+                continue
+
+            writes[key] = value
+            before[name] = round(table.values[row_number], 5)
+            self.slider_values[key] = value * self.units.factor(table.units[row_number])
+            self.sliders_moved[key] = False
+            self.write_scheduler.discard(key)
+
+        if len(writes) > 0:
+            self.write(writes)
+            self._mark_dependents(writes)
+
+            if is_undoable:
+                self.undo_stack.push(
+                    Change(before, {name: values[name] for name in before})
+                )
+
+        return list(writes)
+
+    def finish(self, now):
+        """Writes a gesture that is held back, runs any deferred compute and saves the layout, e.g. when the window is closed"""
+
+        self._apply_input()
+
+        if self.gesture is not None:
+            self.release_slider()
+            self._write(now)
+
+        if self.compute_deferral.is_deferred:
+            self.compute_deferral.finish()
+
+        self.save_layout()
+
+    def write(self, writes):
+        """Commits slider values to the design in one batch and returns the time taken including the recompute"""
+
+        table = self.table
+        start = time.perf_counter()
+
+        rows = [table.index[key] for key in writes if key in table.index]
+        items = [table.items[row_number] for row_number in rows]
+        values = [writes[table.names[row_number]] for row_number in rows]
+
+        # One recompute for the whole batch
+        is_batched = write_values(self.design, items, values, self.create_value_input)
+        self.api_calls.add(len(items) + 1 if is_batched else len(items))
+
+        for row_number, value in zip(rows, values):
+            table.values[row_number] = value
+
+        duration = time.perf_counter() - start
+
+        instrumentation = self.instrumentation
+        if instrumentation.enabled:
+            instrumentation.count("commits")
+            instrumentation.count("batched commits" if is_batched else "individual commits")
+            instrumentation.observe("parameters per commit", len(items))
+            instrumentation.observe("commit ms", duration * 1000)
+            instrumentation.observe_parameters(
+                [table.names[row_number] for row_number in rows], duration * 1000
+            )
+
+        return duration
+
+    def _full_sync(self, now, result):
+        """Re-reads every parameter and reconciles the slider state, returns the rows to compare"""
+
+        active_design = self.get_design()
+        active_design_key = active_design.parentDocument.creationId
+        self.api_calls.add(4)
+
+        if active_design_key != self.design_key:
+            self._switch_design(active_design, active_design_key, result)
+
+        parameters = self.design.userParameters
+        self.api_calls.add(1)
+
+        previous_table = self.table
+        table = self.table = ParameterTable.capture(parameters, self.api_calls)
+        self.api_calls.add(self.units.add(table.units))
+        self.dependency_graph.update(table)
+        self.last_full_sync = now
+
+        # Only the state of parameters that were added or removed changes
+        removed, added, moved = reconcile(
+            previous_table.names if previous_table is not None else [],
+            table.names,
+        )
+
+        # Parameters keep their position when renamed, e.g. in Fusion 360's parameters dialog
+        renamed = []
+        if len(removed) > 0 and len(added) > 0:
+            added_rows = {table.index[key]: key for key in added}
+
+            for key in removed:
+                row_number = previous_table.index[key]
+                new_key = added_rows.get(row_number)
+
+                if new_key is not None and table.units[row_number] == previous_table.units[row_number]:
+                    renamed.append((key, new_key))
+
+            for key, new_key in renamed:
+                removed.remove(key)
+                added.remove(new_key)
+                self._rename_key(key, new_key)
+
+        for key in removed:
+            self.previews.pop(key, None)
+            del self.sliders_moved[key]
+            del self.slider_values[key]
+            self.write_scheduler.discard(key)
+            self.selection_tracker.discard(key)
+
+        # Renamed or edited rows are shown again with their new labels
+        rows = set(table.diff(previous_table))
+        rows.update(table.index[new_key] for _, new_key in renamed)
+
+        # The whole snapshot is converted at once, e.g. on the first sync of a design
+        if len(added) > 0:
+            display_values = self.units.to_display(table.values, table.units)
+
+        for key in added:
+            row_number = table.index[key]
+            self.slider_values[key] = display_values[row_number]
+            self.sliders_moved[key] = True
+            rows.add(row_number)
+
+        if len(removed) > 0 or len(added) > 0 or len(moved) > 0 or len(rows) > 0:
+            result.slider_keys.update(self.update_ranges())
+            result.is_rendered = True
+
+        return rows
+
+    def _switch_design(self, design, design_key, result):
+        """Keeps the state of the previous design and restores the state of the new one
+
+        A design that was active recently is restored from the document cache, so the full sync
+        that follows only has to diff it. Otherwise its layout is loaded from its attributes.
+        """
+
+        if self.design is not None:
+            # The layout of the previous design is kept in that design
+            try:
+                if self.compute_deferral.is_deferred:
+                    self.compute_deferral.finish()
+                self.save_layout()
+            except RuntimeError:
+                pass  # The previous design has been closed
+
+            self.document_cache.store(
+                self.design_key,
+                DocumentState(
+                    self.table,
+                    self.dependency_graph,
+                    self.slider_values,
+                    self.sliders_moved,
+                    self.slider_ranges,
+                    self.base_range,
+                    self.top_key,
+                    self.saved_layout,
+                    self.undo_stack,
+                    self.units,
+                ),
+            )
+
+        # Writes and previews belong to the previous design
+        for key in list(self.slider_values):
+            self.write_scheduler.discard(key)
+            self.selection_tracker.discard(key)
+        self.previews = {}
+        self.stale_keys = set()
+        self.gesture = None
+
+        self.design = design
+        self.design_key = design_key
+        result.is_rendered = True
+        result.is_design_switched = True
+
+        self.presets = load_presets(design)
+        self.api_calls.add(2)
+
+        state = self.document_cache.take(design_key)
+
+        if state is not None:
+            self.table = state.table
+            self.dependency_graph = state.dependency_graph
+            self.slider_values = state.slider_values
+            self.sliders_moved = state.sliders_moved
+            self.slider_ranges = state.slider_ranges
+            self.base_range = state.base_range
+            self.top_key = state.top_key
+            self.saved_layout = state.saved_layout
+            self.undo_stack = state.undo_stack
+            self.units = state.units
+
+            result.is_layout_loaded = True
+            result.top_key = state.top_key
+            return
+
+        self.table = None
+        self.dependency_graph = DependencyGraph()
+        self.slider_values = {}
+        self.sliders_moved = {}
+        self.undo_stack = UndoStack(self.undo_stack.size)
+        self.units = UnitTable.read(design.unitsManager)
+        self.api_calls.add(len(self.units.factors) + 1)
+
+        layout = self.load_layout()
+        if layout is not None:
+            result.is_layout_loaded = True
+            result.top_key = layout.top_key
+
+    def _sync_rows(self, rows, result):
+        """Compares the given rows with their sliders and queues writes or moves sliders"""
+
+        table = self.table
+        selection_tracker = self.selection_tracker
+
+        for row_number in sorted(rows):
+            key = table.names[row_number]
+            multiplier = self.units.factor(table.units[row_number])
+
+            value = round(table.values[row_number], 5)
+            slider_val = round(self.slider_values[key] / multiplier, 5)
+
+            # A reread value replaces any preview
+            if self.previews.pop(key, None) is not None:
+                result.slider_keys.add(key)
+
+            if value == slider_val:
+                self.sliders_moved[key] = False
+
+            elif not self.sliders_moved[key]:
+                self.slider_values[key] = table.values[row_number] * multiplier
+                result.slider_keys.add(key)
+
+            # The write is handed back by the selection tracker when the selection is cleared
+            elif selection_tracker.has_selections and selection_tracker.block(key):
+                if not self.selected_flag:
+                    result.is_selection_blocked = True
+                    self.selected_flag = True
+
+            else:
+                self.write_scheduler.submit(key, slider_val)
+                self.selected_flag = False
+
+    def _write(self, now):
+        """Writes the values released by the scheduler and runs a deferred compute when it is due
+
+        Returns whether any values were written.
+        """
+
+        compute_deferral = self.compute_deferral
+        gesture = self.gesture
+        is_gesture_ended = gesture is not None and gesture.is_ended(now, self.gesture_idle_time)
+
+        if is_gesture_ended:
+            self.write_scheduler.release()
+
+        # A held gesture is written once, when it ends
+        if gesture is not None and self.write_on_release and not is_gesture_ended:
+            writes = {}
+        else:
+            writes = self.write_scheduler.take(now)
+
+        if len(writes) > 0:
+            if compute_deferral.should_defer(self.design_key, now):
+                compute_deferral.defer(self.design, self.design_key)
+                self.api_calls.add(1)
+
+            duration = self.write(writes)
+            self.write_scheduler.record(duration, now + duration)
+
+            # Without deferral the write time includes the recompute
+            if not compute_deferral.is_deferred:
+                compute_deferral.record(self.design_key, duration)
+
+            self._mark_dependents(writes)
+
+        if is_gesture_ended and not self.write_scheduler.pending:
+            self._end_gesture()
+
+        if compute_deferral.is_due(now) and not self.write_scheduler.pending:
+            duration = compute_deferral.finish()
+            self.api_calls.add(1)
+            self.instrumentation.observe("deferred compute ms", duration * 1000)
+
+            # Everything is reread once the design has been computed
+            self.change_tracker.mark_all()
+
+        return len(writes) > 0
+
+    def _apply_input(self):
+        """Applies the slider input posted by the window since the last tick
+
+        Parameters computed from moved sliders are previewed once, from the last position of
+        each slider. Returns the keys of the previewed parameters.
+        """
+
+        moved = {}
+
+        for method, args in self.slider_input.take():
+            if method == "move_slider":
+                key = args[0]
+
+                # Rows removed or renamed since the input was posted are skipped
+                if self.table is None or key not in self.table.index:
+                    continue
+
+                moved[key] = True
+
+            getattr(self, method)(*args)
+
+        previewed = set()
+
+        for key in moved:
+            if not self.dependency_graph.is_derived(key):
+                previewed.update(self.preview(key))
+
+        return previewed
+
+    def _begin_gesture(self, is_pressed, now):
+        if self.gesture is None:
+            self.gesture = Gesture(is_pressed, now)
+        else:
+            self.gesture.is_pressed = self.gesture.is_pressed or is_pressed
+            self.gesture.last_activity = now
+
+    def _end_gesture(self):
+        """Records the parameters a gesture changed as one step of the undo stack"""
+
+        gesture, self.gesture = self.gesture, None
+        table = self.table
+        before = {}
+        after = {}
+
+        for key, value in gesture.before.items():
+            row_number = table.index.get(key)
+            if row_number is None:
+                continue
+
+            factor = self.units.factor(table.units[row_number])
+            new_value = round(self.slider_values[key] / factor, 5)
+
+            if new_value != value:
+                before[table.names[row_number]] = value
+                after[table.names[row_number]] = new_value
+
+        self.undo_stack.push(Change(before, after))
+
+    def _rename_key(self, key, new_key):
+        """Moves the slider state of a renamed parameter to its new name"""
+
+        for state in (self.slider_values, self.sliders_moved, self.previews):
+            if key in state:
+                state[new_key] = state.pop(key)
+
+        if key in self.stale_keys:
+            self.stale_keys.discard(key)
+            self.stale_keys.add(new_key)
+
+        if self.gesture is not None and key in self.gesture.before:
+            self.gesture.before[new_key] = self.gesture.before.pop(key)
+
+        self.write_scheduler.rename(key, new_key)
+        self.selection_tracker.rename(key, new_key)
+
+        if self.top_key == key:
+            self.top_key = new_key
+
+    def _mark_dependents(self, keys):
+        """Marks the parameters whose expressions depend on written ones to be reread on the next tick"""
+
+        for key in self.dependency_graph.dependents_of(keys):
+            self.stale_keys.add(key)
+            self.change_tracker.mark(key)
+
+    def _refresh_stale(self, keys, result):
+        """Rereads the given parameters and updates the slider ranges if their values moved outside them"""
+
+        table = self.table
+        rows = [table.index[key] for key in keys if key in table.index]
+
+        for key, new_key in table.refresh(rows, self.api_calls):
+            self._rename_key(key, new_key)
+            result.is_rendered = True
+
+        # The ranges are only recalculated, which reads every value, if a new value does not fit
+        for row_number in rows:
+            unit = table.units[row_number]
+            slider_range = self.slider_ranges.get(unit)
+
+            if slider_range is None or not slider_range.fits(
+                table.values[row_number] * self.units.factor(unit)
+            ):
+                result.slider_keys.update(self.update_ranges())
+                result.is_rendered = True
+                return
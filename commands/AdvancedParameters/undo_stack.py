@@ -0,0 +1,82 @@
+import collections
+
+
+class Gesture:
+    """One press, drag and release of a slider, or a burst of mouse wheel steps
+
+    The value of each parameter before the gesture first moved it is kept, so the whole
+    gesture becomes one Change however many positions the slider passed through.
+    """
+
+    __slots__ = ("before", "is_pressed", "is_released", "last_activity")
+
+    def __init__(self, is_pressed, now):
+        self.before = {}  # Value of each moved parameter before the gesture, by key
+        self.is_pressed = is_pressed
+        self.is_released = False
+        self.last_activity = now
+
+    def is_ended(self, now, idle_time):
+        """Returns whether the slider has been released, or a mouse wheel burst left idle for idle_time"""
+
+        return self.is_released or (
+            not self.is_pressed and now - self.last_activity >= idle_time
+        )
+
+
+class Change:
+    """The values of the parameters changed by one gesture or batch, by parameter name"""
+
+    __slots__ = ("before", "after")
+
+    def __init__(self, before, after):
+        self.before = before
+        self.after = after
+
+
+class UndoStack:
+    """Changes made from the window that can be undone and redone with one batched write each
+
+    Only the first and last value of each changed parameter are kept, so stepping back never
+    replays the positions a slider passed through.
+    """
+
+    def __init__(self, size=100):
+        self.size = size
+        self._undo = collections.deque(maxlen=size)
+        self._redo = []
+
+    @property
+    def can_undo(self):
+        return len(self._undo) > 0
+
+    @property
+    def can_redo(self):
+        return len(self._redo) > 0
+
+    def push(self, change):
+        """Records a change and forgets the changes that were undone, unless nothing changed"""
+
+        if len(change.after) > 0:
+            self._undo.append(change)
+            self._redo.clear()
+
+    def undo(self):
+        """Returns the last change to undo, or None if there is nothing to undo"""
+
+        if len(self._undo) == 0:
+            return None
+
+        change = self._undo.pop()
+        self._redo.append(change)
+        return change
+
+    def redo(self):
+        """Returns the last undone change to make again, or None if there is nothing to redo"""
+
+        if len(self._redo) == 0:
+            return None
+
+        change = self._redo.pop()
+        self._undo.append(change)
+        return change
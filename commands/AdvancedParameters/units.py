@@ -0,0 +1,68 @@
+import math
+
+# Factors from Fusion 360's internal units (cm/rad) to each unit, used until a design's units
+# manager has been read
+DEFAULT_FACTORS = {
+    "mm": 10,
+    "cm": 1,
+    "m": 0.01,
+    "in": 1 / 2.54,
+    "ft": 1 / 30.48,
+    "deg": 180 / math.pi,
+    "rad": 1,
+    "": 1,
+}
+
+
+class UnitTable:
+    """Factors from Fusion 360's internal units to the units shown on sliders, for every unit of a design
+
+    The factors are read from the design's units manager once per document, and units outside
+    DEFAULT_FACTORS (e.g. mm^2) the first time a parameter uses them. Converting is then only a
+    dictionary lookup, so it is safe from the window thread. Only read() and add() call the API.
+    """
+
+    __slots__ = ("factors", "length_unit", "_units_manager")
+
+    def __init__(self, factors=None, length_unit="mm", units_manager=None):
+        self.factors = dict(factors if factors is not None else DEFAULT_FACTORS)
+        self.length_unit = length_unit  # The design's default length unit
+        self._units_manager = units_manager
+
+    @classmethod
+    def read(cls, units_manager):
+        """Reads the factor of every unit in DEFAULT_FACTORS from a design's units manager"""
+
+        table = cls({}, units_manager.defaultLengthUnits, units_manager)
+        table.add(DEFAULT_FACTORS)
+        return table
+
+    def add(self, units):
+        """Reads the factors of units that are not in the table yet, returns the number of API calls made"""
+
+        calls = 0
+
+        if self._units_manager is None:
+            return calls
+
+        for unit in set(units).difference(self.factors):
+            calls += 1
+
+            try:
+                # One of the unit in internal units, e.g. 0.1 for mm
+                self.factors[unit] = 1 / self._units_manager.evaluateExpression("1", unit)
+            except (RuntimeError, ZeroDivisionError):
+                self.factors[unit] = DEFAULT_FACTORS.get(unit, 1)
+
+        return calls
+
+    def factor(self, unit):
+        """Returns the factor from internal units to a unit, units that have not been read are shown unconverted"""
+
+        return self.factors.get(unit, 1)
+
+    def to_display(self, values, units):
+        """Converts a whole column of internal values to the units shown on their sliders in one pass"""
+
+        factors = self.factors
+        return [value * factors.get(unit, 1) for value, unit in zip(values, units)]
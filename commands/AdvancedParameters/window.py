@@ -0,0 +1,1593 @@
+import adsk.core
+import adsk.fusion
+import os
+from ...lib import fusion360utils as futil
+from tkinter import *
+from tkinter import ttk
+from tkinter import messagebox
+from tkinter import filedialog
+import collections
+import threading
+import traceback
+import time
+from .entry import (
+    BASE_RANGE,
+    SYNC_INTERVAL_MS,
+    dispatcher,
+    engine,
+    instrumentation,
+    probe_cache,
+    selection_tracker,
+)
+from .parameter_io import export_rows, import_rows, validate
+from .probe_cache import design_version
+from .ranges import SliderRange
+from .sweep import (
+    METHODS,
+    SweepFile,
+    SweepRunner,
+    generate_points,
+    measure,
+    parse_spec,
+    point_count,
+)
+
+# How often the status strip shows the latest instrumentation figures
+STATUS_INTERVAL_MS = 1000
+
+# Rows of widgets that are created, parameters beyond these are reached by scrolling
+VISIBLE_ROWS = 12
+
+# Slider trough of derived parameters showing a locally calculated value, until the design recomputes
+PREVIEW_COLOR = "#f5deb3"
+
+# The window is created once and hidden when closed, clicking the button shows it again
+window_thread = None
+isWindowOpen = False
+open_requested = None  # Time the button was clicked, until the window thread has shown the window
+open_started = None  # Time the button was clicked, until the window has synced after being shown
+is_close_requested = False
+
+
+def addParameter(name, value, comment):
+    """Adds a user parameter"""
+
+    global entry_add_name, entry_add_value, entry_add_comment
+
+    if selection_tracker.has_selections:
+        messagebox.showwarning(
+            "Value Error", "Cannot update with selections in the workspace."
+        )
+        return
+
+    def add():
+        unit_type = "deg" if "deg" in value else engine.units.length_unit
+        engine.design.userParameters.add(
+            name.strip(),
+            adsk.core.ValueInput.createByString(value),
+            unit_type,
+            comment,
+        )
+        engine.change_tracker.mark_all()
+
+    def added(_):
+        entry_add_name.delete(0, "end")
+        entry_add_value.delete(0, "end")
+        entry_add_comment.delete(0, "end")
+
+    dispatcher.submit(add, added, showApiError)
+
+
+def deleteParameter(index):
+    """Removes a user parameter"""
+
+    global row_keys
+
+    key = row_keys[index]
+
+    def delete():
+        delete_succesful = engine.table.items[engine.table.index[key]].deleteMe()
+        engine.change_tracker.mark_all()
+        return delete_succesful
+
+    def deleted(delete_succesful):
+        if not delete_succesful:
+            messagebox.showinfo(
+                "Info",
+                "Deletion of this parameter was unsuccessful. This is likely due to it being used in the workspace.",
+            )
+
+    dispatcher.submit(delete, deleted, showApiError)
+
+
+def updateParameter(index):
+    """Update the value/comment/name of a parameter"""
+
+    if not selection_tracker.has_selections:
+
+        global scaleBlocks, row_keys, view, entry_add_value, entry_add_comment
+        global entry_add_name, spinbox_max, spinbox_min, spinbox_min_value, spinbox_max_value
+
+        key = row_keys[index]
+        comment = scaleBlocks[index][3]
+
+        # The row is looked up when the operation runs as the table may have been resynced by then
+        def refresh(row_number):
+            engine.table.refresh([row_number], engine.api_calls)
+
+        # Rows are keyed by name, so later updates find a renamed row by its new name
+        def current_key():
+            return key if key in engine.table.index else name_input
+
+        name_input = entry_add_name.get().strip()
+        if len(name_input) > 0:
+            # Check to see if a parameter with this name already exists
+            if name_input in view.index:
+                messagebox.showwarning(
+                    "Type Error", "Parameter name already exists or is invalid."
+                )
+
+            else:
+
+                def rename():
+                    # Update the parameter name in the workspace and check it was successful
+                    return engine.rename(key, name_input), engine.view()
+
+                def renamed(result):
+                    rename_succesful, new_view = result
+
+                    if rename_succesful:
+                        # Update parameter name in gui
+                        showView(new_view)
+
+                        # Remove text in text entry field
+                        entry_add_name.delete(0, "end")
+                    else:
+                        messagebox.showwarning(
+                            "Type Error", "Parameter name already exists or is invalid."
+                        )
+
+                dispatcher.submit(rename, renamed, showApiError)
+
+        value_input = entry_add_value.get().strip()
+        if len(value_input) > 0:
+
+            def change_expression():
+                table = engine.table
+                row_number = table.index[current_key()]
+                table.items[row_number].expression = value_input
+
+                # Other parameters may depend on this one
+                refresh(row_number)
+                engine.change_tracker.mark_all()
+
+                engine.slider_values[current_key()] = table.values[row_number] * engine.units.factor(
+                    table.units[row_number]
+                )
+                engine.update_ranges()
+
+                return engine.view()
+
+            def expression_changed(new_view):
+                showView(new_view)
+                entry_add_value.delete(0, "end")
+
+            dispatcher.submit(change_expression, expression_changed, showApiError)
+
+        comment_input = entry_add_comment.get()
+        if comment_input == " ":
+            comment.grid_remove()
+            entry_add_comment.delete(0, "end")
+        elif len(comment_input) > 0:
+
+            def change_comment():
+                table = engine.table
+                row_number = table.index[current_key()]
+                table.items[row_number].comment = comment_input
+                table.comments[row_number] = comment_input
+
+                return engine.view()
+
+            comment.configure(text=comment_input)
+            dispatcher.submit(change_comment, showView, showApiError)
+            comment.grid(
+                row=1,
+                column=0,
+                sticky=W,
+                pady=(0, 0),
+                padx=(0, 0),
+                columnspan=10,
+            )
+            entry_add_comment.delete(0, "end")
+
+    else:
+        messagebox.showwarning(
+            "Warning", "Cannot update with selections in the workspace."
+        )
+
+
+def showApiError(err):
+    """Shows an error raised by an operation that was run on the main thread"""
+
+    titles = {
+        NameError: "Name Error",
+        TypeError: "Type Error",
+        ValueError: "Value Error",
+        RuntimeError: "Runtime Error",
+    }
+    messagebox.showwarning(titles.get(type(err), "Error"), err)
+
+
+def updateSettings():
+    """Updates window to reflect changed settings"""
+
+    global spinbox_min, spinbox_max, spinbox_increment
+
+    try:
+        if spinbox_min != None and spinbox_max != None and spinbox_increment != None:
+            base_range = SliderRange(
+                float(spinbox_min.get()),
+                float(spinbox_max.get()),
+                float(spinbox_increment.get()),
+            )
+
+            # The engine keeps the range for every later sync, so it is checked before it is sent
+            if base_range.increment <= 0:
+                raise ValueError("The increment must be more than 0.")
+            if base_range.minimum >= base_range.maximum:
+                raise ValueError("The minimum must be less than the maximum.")
+
+            spinbox_min.configure(increment=base_range.increment)
+            spinbox_max.configure(increment=base_range.increment)
+
+            # Moved sliders are written by the engine so their ranges are updated with it
+            def apply():
+                engine.set_base_range(base_range)
+                return engine.view()
+
+            dispatcher.submit(apply, showView, showApiError)
+
+    except ValueError as err:
+        messagebox.showwarning("Value Error", err)
+
+
+def showBaseRange(base_range):
+    """Shows the range that every unit starts from in the toolbar, e.g. after a layout is loaded"""
+
+    global spinbox_min, spinbox_max, spinbox_increment
+
+    for spinbox, value in (
+        (spinbox_min, base_range.minimum),
+        (spinbox_max, base_range.maximum),
+        (spinbox_increment, base_range.increment),
+    ):
+        spinbox.delete(0, "end")
+        spinbox.insert(0, "%g" % value)
+
+    spinbox_min.configure(increment=base_range.increment)
+    spinbox_max.configure(increment=base_range.increment)
+
+
+def queueSettingsUpdate():
+    """Queues an update for min/min/increment settings in the mainloop"""
+
+    global is_settings_update
+
+    is_settings_update = True
+
+
+def scaleBlockMoved(index):
+    """Records the position of a slider moved by the user in the row of widgets it is shown in"""
+
+    global scaleBlocks, row_keys, view
+
+    key = row_keys[index]
+
+    if key is not None and key not in view.derived:
+        slider_value = scaleBlocks[index][0].get()
+        view.positions[key] = (slider_value, False)
+
+        # Parameters computed from this one are previewed by the next tick, the design follows when written
+        engine.slider_input.move(key, slider_value)
+
+
+def showView(new_view):
+    """Shows a SliderView made on the main thread, which the window keeps as its copy of the parameters"""
+
+    global view, window_bottom
+
+    if new_view is None:
+        return
+
+    if view is None or new_view.base_range != view.base_range:
+        showBaseRange(new_view.base_range)
+
+    view = new_view
+
+    if len(view.names) > 0:
+        window_bottom.grid(row=1, column=0, columnspan=70, padx=(10, 10), pady=(0, 10))
+    else:
+        window_bottom.grid_remove()
+
+    # Only the rows in view are bound, however many parameters there are
+    renderRows()
+    showPresets(view.preset_names)
+
+
+def showPositions(positions):
+    """Shows slider positions calculated on the main thread, e.g. by a tick or an undo"""
+
+    global view
+
+    if view is None:
+        return
+
+    for key, position in positions.items():
+        view.positions[key] = position
+        showSliderValue(key)
+
+
+def showSliderValue(key):
+    """Updates the widgets of a slider if it is in view"""
+
+    global scaleBlocks, row_keys, first_row, view
+
+    row_number = view.index.get(key)
+    if row_number is None:
+        return
+
+    index = row_number - first_row
+    if 0 <= index < len(scaleBlocks) and row_keys[index] == key:
+        showSliderPosition(scaleBlocks[index], key)
+
+
+def showSliderPosition(scaleBlock, key):
+    """Sets a slider to its parameter's value, or to a highlighted preview calculated locally"""
+
+    global default_trough_color, view
+
+    value, is_preview = view.positions[key]
+
+    scaleBlock[0].configure(troughcolor=PREVIEW_COLOR if is_preview else default_trough_color)
+    scaleBlock[4].set(value)
+
+
+def sliderPressed():
+    """Starts a drag gesture on a slider"""
+
+    engine.slider_input.press(time.monotonic())
+
+
+def sliderDragged():
+    """Records slider movement during a drag gesture"""
+
+    engine.slider_input.drag(time.monotonic())
+
+
+def sliderScrolled(slider, event):
+    """Moves a slider by one increment for each step of the mouse wheel"""
+
+    if slider.cget("state") == "disabled":
+        return "break"
+
+    engine.slider_input.scroll(time.monotonic())
+
+    if event.delta == -120:
+        slider.set(slider.get() - float(slider.cget("resolution")))
+    elif event.delta == 120:
+        slider.set(slider.get() + float(slider.cget("resolution")))
+
+    return "break"  # Stops the list scrolling as well
+
+
+def sliderReleased(index):
+    """Sends the final position of a slider to the workspace without waiting"""
+
+    scaleBlockMoved(index)
+    engine.slider_input.release()
+
+
+def undoChange(event, is_redo):
+    """Undoes or redoes the last slider gesture or preset with one write"""
+
+    # Text entries keep their own shortcuts
+    if isinstance(event.widget, (Entry, Spinbox, ttk.Combobox)):
+        return
+
+    if selection_tracker.has_selections:
+        messagebox.showwarning(
+            "Warning", "Cannot update with selections in the workspace."
+        )
+        return "break"
+
+    def change():
+        return engine.positions(engine.redo() if is_redo else engine.undo())
+
+    def changed(positions):
+        showPositions(positions)
+        probeMetrics(False)
+
+    dispatcher.submit(change, changed, showApiError)
+    return "break"
+
+
+def showComment(scaleBlock, comment):
+    """Shows the comment under a parameter name, or hides it if there is no comment"""
+
+    scaleBlock[3].configure(text=comment)
+
+    if len(comment) > 0:
+        scaleBlock[3].grid(
+            row=1,
+            column=0,
+            sticky=W,
+            pady=(0, 0),
+            padx=(0, 0),
+            columnspan=10,
+        )
+    else:
+        scaleBlock[3].grid_remove()
+
+
+def bindScaleBlock(index):
+    """Shows the parameter at the current scroll position in a row of widgets, or hides the row"""
+
+    global scaleBlocks, row_keys, row_ranges, first_row, view
+
+    scaleBlock = scaleBlocks[index]
+    row_number = first_row + index
+    widgets = (scaleBlock[6], scaleBlock[1], scaleBlock[0], scaleBlock[2], scaleBlock[7], scaleBlock[8])
+
+    if row_number >= len(view.names):
+        row_keys[index] = None
+        for widget in widgets:
+            widget.grid_remove()
+        return
+
+    key = view.names[row_number]
+
+    if row_keys[index] is None:
+        for widget in widgets:
+            widget.grid()
+
+    row_keys[index] = key
+
+    # Rows are only reconfigured when they show a slider with a different range
+    slider_range = view.slider_ranges[view.units[row_number]]
+    if row_ranges[index] != slider_range:
+        row_ranges[index] = slider_range
+        scaleBlock[0].configure(
+            from_=slider_range.minimum,
+            to=slider_range.maximum,
+            resolution=slider_range.increment,
+        )
+        scaleBlock[1].configure(text="%g" % slider_range.minimum)
+        scaleBlock[2].configure(text="%g" % slider_range.maximum)
+        instrumentation.count("rows reconfigured")
+
+    # Sliders of parameters computed from other parameters are locked so their expressions are kept
+    state = "disabled" if key in view.derived else "normal"
+    scaleBlock[0].configure(state=state)
+    scaleBlock[5].configure(text=key, state=state)
+    showComment(scaleBlock, view.comments[row_number])
+    showSliderPosition(scaleBlock, key)
+
+    instrumentation.count("rows bound")
+
+
+def renderRows():
+    """Binds the rows of widgets to the parameters in view, creating widgets only up to VISIBLE_ROWS"""
+
+    global scaleBlocks, row_keys, row_ranges, first_row, scrollbar, view
+
+    names = view.names
+    num_rows = min(len(names), VISIBLE_ROWS)
+
+    while len(scaleBlocks) < num_rows:
+        scaleBlocks.append(createScaleBlock(len(scaleBlocks)))
+        row_keys.append(None)
+        row_ranges.append(None)
+
+    first_row = max(0, min(first_row, len(names) - num_rows))
+
+    for index in range(len(scaleBlocks)):
+        bindScaleBlock(index)
+
+    engine.slider_input.show_top(names[first_row] if first_row < len(names) else None)
+
+    if len(names) > VISIBLE_ROWS:
+        scrollbar.grid()
+        scrollbar.set(first_row / len(names), (first_row + num_rows) / len(names))
+    else:
+        scrollbar.grid_remove()
+
+
+def scrollRows(*args):
+    """Callback for the scrollbar and mouse wheel that moves the parameters in view"""
+
+    global first_row, view
+
+    if view is None:
+        return
+
+    if args[0] == "moveto":
+        first_row = round(float(args[1]) * len(view.names))
+    elif args[0] == "scroll":
+        first_row += int(args[1]) * (VISIBLE_ROWS if args[2] == "pages" else 1)
+
+    renderRows()
+
+
+def createScaleBlock(row_number):
+    """Generates a row of information and controls that can be bound to any parameter"""
+
+    global window_bottom, default_trough_color
+
+    instrumentation.count("rows created")
+
+    length_details = Frame(window_bottom)
+    length_details.grid(
+        row=row_number, column=0, sticky=W, pady=(17, 0), padx=(0, 20), columnspan=10
+    )
+    length_label = Label(length_details, width=8, anchor="w")
+    length_label.grid(
+        row=0, column=0, sticky=W, pady=(0, 0), padx=(0, 0), columnspan=10
+    )
+
+    comment_label = Label(
+        length_details,
+        font=("Arial", 7),
+        width=8,
+        state="disabled",
+        anchor="w",
+    )
+
+    slider_min = Label(window_bottom, width=4)
+    slider_min.grid(row=row_number, column=10, pady=(17, 0), columnspan=10)
+
+    slider_value = DoubleVar()
+    slider = Scale(
+        window_bottom,
+        orient="horizontal",
+        command=lambda _: scaleBlockMoved(row_number),
+        length=260,
+        variable=slider_value,
+    )
+    slider.grid(row=row_number, column=20, columnspan=10)
+    default_trough_color = slider.cget("troughcolor")
+    slider.bind("<ButtonPress-1>", lambda _: sliderPressed())
+    slider.bind("<B1-Motion>", lambda _: sliderDragged())
+    slider.bind("<ButtonRelease-1>", lambda _: sliderReleased(row_number))
+    slider.bind("<MouseWheel>", lambda event: sliderScrolled(slider, event))
+
+    slider_max = Label(window_bottom, width=4)
+    slider_max.grid(
+        row=row_number, column=30, padx=(0, 17), pady=(17, 0), columnspan=10
+    )
+
+    button_delete = Button(
+        window_bottom,
+        text="Delete",
+        width=6,
+        command=lambda: deleteParameter(row_number),
+    )
+    button_delete.grid(
+        row=row_number, column=40, pady=(17, 0), padx=(0, 20), columnspan=10
+    )
+
+    button_update = Button(
+        window_bottom,
+        text="Update",
+        width=6,
+        command=lambda: updateParameter(row_number),
+    )
+    button_update.grid(
+        row=row_number, column=50, pady=(17, 0), padx=(0, 0), columnspan=10
+    )
+
+    return (
+        slider,
+        slider_min,
+        slider_max,
+        comment_label,
+        slider_value,
+        length_label,
+        length_details,
+        button_delete,
+        button_update,
+    )
+
+
+def loadToolbar():
+    """Loads the toolbar with text input fields and buttons at the top of the window"""
+
+    global entry_add_value, entry_add_name, window_top, label_probe, combobox_preset
+    global spinbox_min, spinbox_max, spinbox_increment, entry_add_comment
+    global spinbox_min_value, spinbox_max_value, spinbox_increment_value
+
+    window_top.grid(row=0, column=0, columnspan=70, padx=(10, 10), pady=(10, 0))
+
+    label_add_name = Label(window_top, text="Name:", anchor="w")
+    label_add_name.grid(row=0, column=0, sticky=W, padx=(0, 5), columnspan=10)
+
+    entry_add_name = Entry(
+        window_top,
+        width=15,
+        relief=FLAT,
+        highlightbackground="grey",
+        highlightthickness=1,
+    )
+    entry_add_name.grid(row=0, column=10, sticky=W, padx=(0, 20), columnspan=10)
+
+    label_add_value = Label(window_top, text="Value:", anchor="w")
+    label_add_value.grid(row=0, column=20, sticky=W, padx=(0, 5), columnspan=10)
+
+    entry_add_value = Entry(
+        window_top,
+        width=15,
+        relief=FLAT,
+        highlightbackground="grey",
+        highlightthickness=1,
+    )
+    entry_add_value.grid(row=0, column=30, sticky=W, padx=(0, 20), columnspan=10)
+
+    label_add_comment = Label(window_top, text="Comment:", anchor="w")
+    label_add_comment.grid(row=0, column=40, sticky=W, padx=(0, 5), columnspan=10)
+
+    entry_add_comment = Entry(
+        window_top,
+        width=15,
+        relief=FLAT,
+        highlightbackground="grey",
+        highlightthickness=1,
+    )
+    entry_add_comment.grid(row=0, column=50, sticky=W, padx=(0, 20), columnspan=10)
+
+    button_add = Button(
+        window_top,
+        text="Add",
+        width=6,
+        command=lambda: addParameter(
+            entry_add_name.get(),
+            entry_add_value.get(),
+            entry_add_comment.get(),
+        ),
+    )
+    button_add.grid(row=0, column=60, padx=(0, 0), columnspan=10)
+
+    entry_add_name.bind(
+        "<Return>",
+        lambda _: addParameter(
+            entry_add_name.get(),
+            entry_add_value.get(),
+            entry_add_comment.get(),
+        ),
+    )
+    entry_add_value.bind(
+        "<Return>",
+        lambda _: addParameter(
+            entry_add_name.get(),
+            entry_add_value.get(),
+            entry_add_comment.get(),
+        ),
+    )
+    entry_add_comment.bind(
+        "<Return>",
+        lambda _: addParameter(
+            entry_add_name.get(),
+            entry_add_value.get(),
+            entry_add_comment.get(),
+        ),
+    )
+
+    spinbox_increment = ttk.Spinbox(
+        window_top,
+        width=12,
+        command=queueSettingsUpdate,
+        from_=-10000,
+        to=10000,
+    )
+    spinbox_increment.grid(
+        row=1,
+        column=50,
+        sticky=W + E,
+        padx=(0, 20),
+        pady=(6, 0),
+        columnspan=10,
+    )
+    spinbox_increment.delete(0)
+    spinbox_increment.insert(0, str(spinbox_increment_value))
+
+    label_add_min = Label(window_top, text="Min:", anchor="w")
+    label_add_min.grid(
+        row=1, column=0, sticky=W, padx=(0, 5), pady=(6, 0), columnspan=10
+    )
+
+    spinbox_min = ttk.Spinbox(
+        window_top,
+        width=12,
+        command=queueSettingsUpdate,
+        from_=-10000,
+        to=10000,
+        increment=float(spinbox_increment.get()),
+    )
+    spinbox_min.grid(
+        row=1,
+        column=10,
+        sticky=W + E,
+        padx=(0, 20),
+        pady=(6, 0),
+        columnspan=10,
+    )
+    spinbox_min.delete(0)
+    spinbox_min.insert(0, str(spinbox_min_value))
+
+    label_add_max = Label(window_top, text="Max:", anchor="w")
+    label_add_max.grid(
+        row=1,
+        column=20,
+        sticky=W,
+        padx=(0, 5),
+        pady=(6, 0),
+        columnspan=10,
+    )
+
+    spinbox_max = ttk.Spinbox(
+        window_top,
+        width=12,
+        command=queueSettingsUpdate,
+        from_=-10000,
+        to=10000,
+        increment=float(spinbox_increment.get()),
+    )
+    spinbox_max.grid(
+        row=1,
+        column=30,
+        sticky=W + E,
+        padx=(0, 20),
+        pady=(6, 0),
+        columnspan=10,
+    )
+    spinbox_max.delete(0)
+    spinbox_max.insert(0, str(spinbox_max_value))
+
+    label_add_increment = Label(window_top, text="Increment:", anchor="w")
+    label_add_increment.grid(
+        row=1,
+        column=40,
+        sticky=W,
+        padx=(0, 5),
+        pady=(6, 0),
+        columnspan=10,
+    )
+
+    button_apply = Button(window_top, text="Apply", width=6, command=updateSettings)
+    button_apply.grid(row=1, column=60, padx=(0, 0), pady=(6, 0), columnspan=10)
+
+    spinbox_min.bind("<Return>", lambda _: updateSettings())
+    spinbox_max.bind("<Return>", lambda _: updateSettings())
+    spinbox_increment.bind("<Return>", lambda _: updateSettings())
+
+    frame_presets = Frame(window_top)
+    frame_presets.grid(row=2, column=0, sticky=W, pady=(6, 0), columnspan=30)
+
+    label_preset = Label(frame_presets, text="Preset:", anchor="w")
+    label_preset.pack(side=LEFT, padx=(0, 5))
+
+    # Choosing a preset applies it, typing a new name and clicking Save creates one
+    combobox_preset = ttk.Combobox(frame_presets, width=14)
+    combobox_preset.pack(side=LEFT, padx=(0, 5))
+    combobox_preset.bind("<<ComboboxSelected>>", lambda _: applyPreset(combobox_preset.get()))
+
+    button_save_preset = Button(frame_presets, text="Save", width=5, command=savePreset)
+    button_save_preset.pack(side=LEFT, padx=(0, 5))
+
+    button_delete_preset = Button(frame_presets, text="Delete", width=5, command=deletePreset)
+    button_delete_preset.pack(side=LEFT, padx=(0, 5))
+
+    button_toggle_preset = Button(frame_presets, text="A/B", width=4, command=togglePreset)
+    button_toggle_preset.pack(side=LEFT)
+
+    button_import = Button(window_top, text="Import", width=6, command=importParameters)
+    button_import.grid(row=2, column=30, sticky=W, pady=(6, 0), columnspan=10)
+
+    button_export = Button(window_top, text="Export", width=6, command=exportParameters)
+    button_export.grid(row=2, column=40, sticky=W, pady=(6, 0), columnspan=10)
+
+    label_probe = Label(window_top, anchor="w", font=("Arial", 7))
+    label_probe.grid(row=3, column=0, sticky=W, pady=(6, 0), columnspan=70)
+
+    button_measure = Button(
+        window_top, text="Measure", width=6, command=lambda: probeMetrics(True)
+    )
+    button_measure.grid(row=2, column=50, sticky=W, pady=(6, 0), columnspan=10)
+
+    button_sweep = Button(window_top, text="Sweep", width=6, command=openSweepDialog)
+    button_sweep.grid(row=2, column=60, padx=(0, 0), pady=(6, 0), columnspan=10)
+
+
+def updateWindow():
+    """Syncs parameters between the Fusion360 workspace and the external window GUI"""
+
+    global window, is_settings_update, is_tick_pending
+
+    if is_close_requested:
+        window.destroy()
+        return
+
+    # The next update is scheduled first, so nothing below can stop the loop that shows the window
+    window.after(SYNC_INTERVAL_MS, updateWindow)
+
+    try:
+        if open_requested is not None:
+            showWindow()
+
+        if is_settings_update:
+            updateSettings()
+            is_settings_update = False
+
+        dispatcher.poll()
+
+        # Only one tick is queued at a time, and only when there is something to sync in view
+        if isWindowOpen and not is_tick_pending and engine.has_work(time.monotonic()):
+            is_tick_pending = True
+            dispatcher.submit(
+                lambda: engine.tick(time.monotonic()), showSyncResult, syncFailed
+            )
+
+    except Exception:
+        # An error in one callback is logged so the window keeps syncing
+        futil.logger.error("Window update failed\n%s", traceback.format_exc())
+
+
+def showSyncResult(result):
+    """Updates the widgets changed by a tick that has run on the main thread"""
+
+    global is_tick_pending, first_row
+
+    global open_started
+
+    is_tick_pending = False
+
+    # The window is interactive once it shows the parameters of the active design
+    if open_started is not None:
+        open_ms = (time.perf_counter() - open_started) * 1000
+        open_started = None
+        instrumentation.observe("open ms", open_ms)
+        futil.logger.info("Window interactive %.0f ms after the button was clicked", open_ms)
+
+    if result is not None:
+        futil.logger.debug(
+            "Tick",
+            full_sync=result.is_full_sync,
+            rendered=result.is_rendered,
+            sliders=len(result.slider_keys),
+        )
+
+        # Restores the scroll position saved with the layout
+        if result.is_layout_loaded and result.top_key in result.view.index:
+            first_row = result.view.index[result.top_key]
+
+        if result.view is not None:
+            showView(result.view)
+        else:
+            showPositions(result.positions)
+
+        if result.is_design_switched:
+            preset_history.clear()
+
+        # Metrics already measured at the new values are shown straight away
+        if (result.is_written and not result.is_write_pending) or result.is_design_switched:
+            probeMetrics(False)
+
+        if result.is_selection_blocked:
+            messagebox.showwarning(
+                "Warning",
+                "Cannot update with selections in the workspace. "
+                "The change will be applied when the selection is cleared.",
+            )
+
+
+def syncFailed(err):
+    """Logs an error from a tick and lets the next tick be queued, so one failure does not stop syncing"""
+
+    global is_tick_pending
+
+    is_tick_pending = False
+    futil.logger.error(
+        "Sync failed\n%s",
+        "".join(traceback.format_exception(type(err), err, err.__traceback__)),
+    )
+
+
+def loadStatusStrip():
+    """Loads the instrumentation status strip at the bottom of the window"""
+
+    global window, label_status
+
+    window_status = Frame(window)
+    window_status.grid(row=2, column=0, columnspan=70, sticky=W + E, padx=(10, 10), pady=(0, 6))
+
+    label_status = Label(window_status, anchor="w", font=("Arial", 7))
+    label_status.pack(side=LEFT, fill=X, expand=True)
+
+    button_export = Button(
+        window_status, text="Export", width=6, command=exportInstrumentation
+    )
+    button_export.pack(side=RIGHT)
+
+    # The handler statistics are listed in the Text Command window, from the main thread
+    button_handlers = Button(
+        window_status,
+        text="Handlers",
+        width=8,
+        command=lambda: dispatcher.submit(futil.log_handler_stats),
+    )
+    button_handlers.pack(side=RIGHT, padx=(0, 5))
+
+    updateStatusStrip()
+
+
+def updateStatusStrip():
+    """Shows the latest instrumentation figures in the status strip"""
+
+    global window, label_status
+
+    counters = instrumentation.counters
+    label_status.configure(
+        text="Tick p50 %.1f ms p99 %.1f ms | API calls/tick p50 %d | Ops/fire %.1f | Commit p50 %.0f ms p99 %.0f ms | Rows built %d"
+        % (
+            instrumentation.percentile("tick ms", 50),
+            instrumentation.percentile("tick ms", 99),
+            instrumentation.percentile("API calls per tick", 50),
+            dispatcher.operations_per_fire,
+            instrumentation.percentile("commit ms", 50),
+            instrumentation.percentile("commit ms", 99),
+            counters["rows created"],
+        )
+    )
+
+    window.after(STATUS_INTERVAL_MS, updateStatusStrip)
+
+
+def exportInstrumentation():
+    """Saves the instrumentation summary to a JSON or CSV file"""
+
+    path = filedialog.asksaveasfilename(
+        defaultextension=".json",
+        filetypes=[("JSON", "*.json"), ("CSV", "*.csv")],
+        initialfile="advanced_parameters_instrumentation",
+    )
+
+    if path:
+        try:
+            instrumentation.export(path)
+        except OSError as err:
+            messagebox.showwarning("Error", err)
+
+
+def showPresets(names):
+    """Lists the presets of the active design in the toolbar"""
+
+    global combobox_preset, preset_names
+
+    preset_names = names
+    combobox_preset.configure(values=names)
+
+
+def savePreset():
+    """Saves the current values under the name typed in the preset box"""
+
+    global combobox_preset
+
+    name = combobox_preset.get().strip()
+
+    if len(name) == 0:
+        messagebox.showwarning("Value Error", "Type a name for the preset.")
+        return
+
+    def save():
+        engine.save_preset(name)
+        return engine.presets.names()
+
+    dispatcher.submit(save, showPresets, showApiError)
+
+
+def deletePreset():
+    """Deletes the preset named in the preset box"""
+
+    global combobox_preset
+
+    name = combobox_preset.get().strip()
+
+    if name in preset_names:
+
+        def delete():
+            engine.delete_preset(name)
+            return engine.presets.names()
+
+        def deleted(names):
+            combobox_preset.set("")
+            showPresets(names)
+
+        dispatcher.submit(delete, deleted, showApiError)
+
+
+def applyPreset(name):
+    """Writes every value of a preset in one batch"""
+
+    global preset_history
+
+    if selection_tracker.has_selections:
+        messagebox.showwarning(
+            "Warning", "Cannot update with selections in the workspace."
+        )
+        return
+
+    def apply():
+        return engine.positions(engine.apply_preset(name))
+
+    def applied(positions):
+        if len(preset_history) == 0 or preset_history[-1] != name:
+            preset_history.append(name)
+
+        showPositions(positions)
+        probeMetrics(False)
+
+    dispatcher.submit(apply, applied, showApiError)
+
+
+def togglePreset():
+    """Switches between the last two presets that were applied"""
+
+    global combobox_preset, preset_history
+
+    if len(preset_history) == 2 and preset_history[0] in preset_names:
+        combobox_preset.set(preset_history[0])
+        applyPreset(preset_history[0])
+
+
+def importParameters():
+    """Creates or updates user parameters from a CSV, JSON or JSON Lines file with one recompute"""
+
+    global window, view
+
+    if selection_tracker.has_selections:
+        messagebox.showwarning(
+            "Warning", "Cannot update with selections in the workspace."
+        )
+        return
+
+    if view is None:
+        return
+
+    path = filedialog.askopenfilename(
+        filetypes=[
+            ("Parameters", "*.csv *.json *.jsonl"),
+            ("CSV", "*.csv"),
+            ("JSON", "*.json *.jsonl"),
+        ],
+    )
+
+    if not path:
+        return
+
+    # Every row is checked before anything is changed in the design
+    rows, errors = validate(path, view.length_unit)
+
+    if len(rows) == 0:
+        showImportReport(0, 0, errors)
+        return
+
+    def run():
+        table = engine.table
+        result = import_rows(
+            engine.design,
+            rows,
+            dict(zip(table.names, table.items)),
+            adsk.core.ValueInput.createByString,
+        )
+        engine.change_tracker.mark_all()
+        return result
+
+    def imported(result):
+        created, updated, import_errors = result
+        showImportReport(created, updated, sorted(errors + import_errors))
+
+    dispatcher.submit(run, imported, showApiError)
+
+
+def showImportReport(created, updated, errors):
+    """Shows how many parameters were imported and the rows that were not"""
+
+    message = "Created %d and updated %d parameters." % (created, updated)
+
+    if len(errors) > 0:
+        lines = ["Line %d: %s" % error for error in errors[:20]]
+        if len(errors) > 20:
+            lines.append("... and %d more" % (len(errors) - 20))
+        message += "\n\n%d rows were not imported:\n" % len(errors) + "\n".join(lines)
+        messagebox.showwarning("Import", message)
+    else:
+        messagebox.showinfo("Import", message)
+
+
+def exportParameters():
+    """Saves the user parameters to a CSV, JSON or JSON Lines file"""
+
+    path = filedialog.asksaveasfilename(
+        defaultextension=".csv",
+        filetypes=[("CSV", "*.csv"), ("JSON", "*.json"), ("JSON Lines", "*.jsonl")],
+        initialfile="parameters",
+    )
+
+    # The table is only read on the main thread
+    if path:
+        dispatcher.submit(lambda: export_rows(path, engine.table), on_error=showApiError)
+
+
+def probeMetrics(is_measured):
+    """Shows the volume, mass and bounding box at the current values from the cache
+
+    If they have not been measured at these values before they are measured if is_measured is True.
+    Only these lookups, made from the Measure button, are counted in the cache statistics.
+    """
+
+    accuracy = adsk.fusion.CalculationAccuracy.LowCalculationAccuracy
+
+    def probe():
+        design = engine.design
+        key = (engine.design_key, design_version(design), engine.parameter_vector())
+        metrics = probe_cache.get(*key, is_counted=is_measured)
+
+        if metrics is None and is_measured:
+            metrics = measure(design, accuracy)
+            probe_cache.put(*key, metrics)
+
+        return metrics
+
+    dispatcher.submit(probe, showProbe, showApiError)
+
+
+def showProbe(metrics):
+    """Shows measured metrics and the probe cache statistics under the toolbar"""
+
+    global label_probe, view
+
+    summary = probe_cache.summary()
+    statistics = "Cache: %d memory hits, %d disk hits, %d misses" % (
+        summary["memory hits"],
+        summary["disk hits"],
+        summary["misses"],
+    )
+
+    if metrics is None or view is None:
+        label_probe.configure(text="Not measured at these values | " + statistics)
+    else:
+        volume, mass, area, size_x, size_y, size_z = metrics
+        length_unit = view.length_unit
+        factor = view.length_factor
+        label_probe.configure(
+            text="Volume %g cm³ | Mass %g kg | Box %g × %g × %g %s | %s"
+            % (
+                volume,
+                mass,
+                size_x * factor,
+                size_y * factor,
+                size_z * factor,
+                length_unit,
+                statistics,
+            )
+        )
+
+
+def openSweepDialog():
+    """Opens the window for running a sweep of parameter values"""
+
+    global window, sweep_window, text_sweep_spec, combobox_sweep_method, spinbox_sweep_points
+    global entry_sweep_seed, button_sweep_start, button_sweep_cancel, progressbar_sweep, label_sweep
+    global view
+
+    if sweep_window is not None:
+        sweep_window.lift()
+        return
+
+    if view is None:
+        return
+
+    sweep_window = Toplevel(window)
+    sweep_window.title("Sweep")
+    sweep_window.resizable(width=False, height=False)
+    sweep_window.attributes("-topmost", True)
+    sweep_window.protocol("WM_DELETE_WINDOW", closeSweepDialog)
+
+    label_spec = Label(
+        sweep_window,
+        text="Remove the # from each parameter to sweep and set its minimum and maximum:",
+        anchor="w",
+    )
+    label_spec.grid(row=0, column=0, sticky=W, padx=(10, 10), pady=(10, 5), columnspan=6)
+
+    text_sweep_spec = Text(sweep_window, width=50, height=10)
+    text_sweep_spec.grid(row=1, column=0, padx=(10, 10), columnspan=6)
+
+    # Every parameter with a slider is listed with the range of its slider
+    for key, unit in zip(view.names, view.units):
+        if key not in view.derived:
+            slider_range = view.slider_ranges[unit]
+            text_sweep_spec.insert(
+                "end", "# %s %g %g\n" % (key, slider_range.minimum, slider_range.maximum)
+            )
+
+    label_method = Label(sweep_window, text="Method:", anchor="w")
+    label_method.grid(row=2, column=0, sticky=W, padx=(10, 5), pady=(6, 0))
+
+    combobox_sweep_method = ttk.Combobox(
+        sweep_window, values=METHODS, state="readonly", width=15
+    )
+    combobox_sweep_method.current(0)
+    combobox_sweep_method.grid(row=2, column=1, sticky=W, pady=(6, 0))
+
+    label_points = Label(sweep_window, text="Points:", anchor="w")
+    label_points.grid(row=2, column=2, sticky=W, padx=(10, 5), pady=(6, 0))
+
+    spinbox_sweep_points = ttk.Spinbox(sweep_window, width=8, from_=2, to=1000000)
+    spinbox_sweep_points.insert(0, "10")
+    spinbox_sweep_points.grid(row=2, column=3, sticky=W, pady=(6, 0))
+
+    label_seed = Label(sweep_window, text="Seed:", anchor="w")
+    label_seed.grid(row=2, column=4, sticky=W, padx=(10, 5), pady=(6, 0))
+
+    entry_sweep_seed = Entry(
+        sweep_window,
+        width=8,
+        relief=FLAT,
+        highlightbackground="grey",
+        highlightthickness=1,
+    )
+    entry_sweep_seed.insert(0, "0")
+    entry_sweep_seed.grid(row=2, column=5, sticky=W, padx=(0, 10), pady=(6, 0))
+
+    progressbar_sweep = ttk.Progressbar(sweep_window, length=300, mode="determinate")
+    progressbar_sweep.grid(row=3, column=0, padx=(10, 10), pady=(10, 0), columnspan=6)
+
+    label_sweep = Label(
+        sweep_window,
+        text="For a grid, points is the number of steps of each parameter.",
+        anchor="w",
+        font=("Arial", 7),
+    )
+    label_sweep.grid(row=4, column=0, sticky=W, padx=(10, 10), columnspan=6)
+
+    button_sweep_start = Button(sweep_window, text="Start", width=6, command=startSweep)
+    button_sweep_start.grid(row=5, column=4, pady=(6, 10))
+
+    button_sweep_cancel = Button(
+        sweep_window, text="Cancel", width=6, command=cancelSweep, state="disabled"
+    )
+    button_sweep_cancel.grid(row=5, column=5, padx=(0, 10), pady=(6, 10))
+
+
+def closeSweepDialog():
+    """Cancels any running sweep and closes its window"""
+
+    global sweep_window
+
+    cancelSweep()
+    sweep_window.destroy()
+    sweep_window = None
+
+
+def startSweep():
+    """Starts a sweep, or resumes one that was stopped if the chosen file already holds some of it"""
+
+    global sweep_runner, text_sweep_spec, combobox_sweep_method, spinbox_sweep_points
+    global entry_sweep_seed, button_sweep_start, button_sweep_cancel, progressbar_sweep, view
+
+    try:
+        parameters = parse_spec(text_sweep_spec.get("1.0", "end"), view.names, view.derived)
+        method = combobox_sweep_method.get()
+        count = int(spinbox_sweep_points.get())
+        seed = int(entry_sweep_seed.get())
+
+        if count < 1:
+            raise ValueError("The number of points must be at least 1.")
+
+    except ValueError as err:
+        messagebox.showwarning("Value Error", err, parent=sweep_window)
+        return
+
+    path = filedialog.asksaveasfilename(
+        parent=sweep_window,
+        defaultextension=".csv",
+        filetypes=[("CSV", "*.csv")],
+        initialfile="advanced_parameters_sweep",
+        confirmoverwrite=False,
+    )
+
+    if not path:
+        return
+
+    try:
+        sweep_file = SweepFile(path, method, parameters, count, seed)
+    except (ValueError, OSError) as err:
+        messagebox.showwarning("Error", err, parent=sweep_window)
+        return
+
+    total = point_count(method, parameters, count)
+    accuracy = adsk.fusion.CalculationAccuracy.LowCalculationAccuracy
+
+    def create():
+        table = engine.table
+        return SweepRunner(
+            engine.design,
+            [table.items[table.names.index(parameter.name)] for parameter in parameters],
+            generate_points(method, parameters, count, seed),
+            total,
+            sweep_file,
+            adsk.core.ValueInput.createByReal,
+            lambda design: measure(design, accuracy),
+            engine.units,
+        )
+
+    def created(runner):
+        global sweep_runner
+
+        sweep_runner = runner
+        progressbar_sweep.configure(maximum=total, value=runner.index)
+        button_sweep_start.configure(state="disabled")
+        button_sweep_cancel.configure(state="normal")
+
+        # A file that already holds every point only puts the parameters back
+        if runner.is_finished:
+            finishSweep()
+        else:
+            runSweepPoint()
+
+    def failed(err):
+        sweep_file.close()
+        showApiError(err)
+
+    dispatcher.submit(create, created, failed)
+
+
+def runSweepPoint():
+    """Posts the next point of the sweep, each point is run by its own main-thread operation"""
+
+    dispatcher.submit(sweep_runner.step, sweepPointDone, sweepFailed)
+
+
+def sweepPointDone(index):
+    """Shows the progress of the sweep and runs the next point"""
+
+    global sweep_runner, progressbar_sweep, label_sweep
+
+    if sweep_window is not None:
+        progressbar_sweep.configure(value=index)
+        label_sweep.configure(
+            text="%d of %d points, %.1f points per minute"
+            % (index, sweep_runner.total, sweep_runner.points_per_minute)
+        )
+
+    if sweep_runner.is_finished:
+        finishSweep()
+    else:
+        runSweepPoint()
+
+
+def sweepFailed(err):
+    """Stops a sweep after an error, the points already run stay in the file for resuming"""
+
+    finishSweep()
+    showApiError(err)
+
+
+def cancelSweep():
+    """Stops the sweep after the point that is running"""
+
+    if sweep_runner is not None:
+        sweep_runner.is_cancelled = True
+
+
+def finishSweep():
+    """Puts back the expressions the swept parameters had before the sweep"""
+
+    global sweep_runner
+
+    runner, sweep_runner = sweep_runner, None
+
+    def finished(_):
+        if sweep_window is not None:
+            button_sweep_start.configure(state="normal")
+            button_sweep_cancel.configure(state="disabled")
+            label_sweep.configure(
+                text="%s after %d of %d points"
+                % (
+                    "Cancelled" if runner.is_cancelled else "Finished",
+                    runner.index,
+                    runner.total,
+                )
+            )
+
+    dispatcher.submit(runner.finish, finished, showApiError)
+    engine.change_tracker.mark_all()
+
+
+def show(clicked):
+    """Opens the window, or asks the window thread to show it again if it has been hidden
+
+    Arguments:
+    clicked -- The time.perf_counter() of the button click, to measure how long opening takes.
+    """
+
+    global window_thread, open_requested, is_close_requested
+
+    open_requested = clicked
+
+    # A window that is being destroyed would never see the request, so it is replaced once its thread ends
+    if window_thread is not None and is_close_requested:
+        window_thread.join(1)
+
+    if window_thread is None or not window_thread.is_alive():
+        is_close_requested = False
+        window_thread = threading.Thread(target=externalWindow, daemon=True)
+        window_thread.start()
+
+
+def close():
+    """Asks the window thread to destroy the window, e.g. when the add-in is stopped"""
+
+    global is_close_requested
+
+    is_close_requested = True
+
+    if window_thread is not None and window_thread is not threading.current_thread():
+        window_thread.join(1)
+
+        # The request stays set, so the window is destroyed as soon as its thread is free again,
+        # e.g. after a file dialog that blocks it is closed
+        if window_thread.is_alive():
+            futil.logger.warning("The window thread did not stop within 1 s")
+
+
+def showWindow():
+    """Shows the window, after resyncing it with the workspace if it has been hidden"""
+
+    global isWindowOpen, open_requested, open_started
+
+    open_started, open_requested = open_requested, None
+
+    # Only the differences since the window was hidden are shown again
+    if not isWindowOpen:
+        isWindowOpen = True
+        engine.change_tracker.mark_all()
+
+    # A new window has no rows yet, and a full sync only renders the ones that changed
+    if view is None:
+        dispatcher.submit(engine.view, showView, showApiError)
+
+    window.deiconify()
+    window.lift()
+    window.focus_force()
+
+
+def onClosing():
+    """Hides the window, its widgets and the engine's state are kept so it opens again straight away"""
+
+    global window, isWindowOpen
+
+    try:
+        # A running sweep is cancelled, and puts the parameters back to their values before it started
+        if sweep_window is not None:
+            closeSweepDialog()
+
+        # A gesture may still be holding the compute back, and the layout is saved in the design
+        dispatcher.submit(lambda: engine.finish(time.monotonic()))
+
+        if instrumentation.enabled:
+            dispatcher.submit(futil.log_handler_stats)
+    except RuntimeError:
+        pass  # Fusion 360 has been closed
+
+    isWindowOpen = False
+    window.withdraw()
+
+
+def externalWindow():
+    """Creates the external window, it is shown by the first updateWindow()"""
+
+    try:
+
+        global scaleBlocks, window, entry_add_value, spinbox_min_value, spinbox_max_value
+        global spinbox_increment_value, spinbox_min, spinbox_max, spinbox_increment, is_settings_update
+        global entry_add_comment, entry_add_name, window_top, window_bottom
+        global row_keys, row_ranges, first_row, scrollbar, is_tick_pending
+        global sweep_window, sweep_runner, preset_history, preset_names, isWindowOpen, view
+
+        # Default values for global variables
+        entry_add_value = None
+        spinbox_max = None
+        spinbox_min = None
+        spinbox_increment = None
+        scaleBlocks = []
+        row_keys = []
+        row_ranges = []
+        first_row = 0
+        is_settings_update = False
+        is_tick_pending = False
+        sweep_window = None
+        sweep_runner = None
+        preset_history = collections.deque(maxlen=2)  # Last two presets applied, for the A/B toggle
+        preset_names = []
+        view = None  # The SliderView of the last sync, the window never reads the engine's state
+        entry_add_comment = None
+        entry_add_name = None
+        spinbox_min_value = BASE_RANGE.minimum
+        spinbox_max_value = BASE_RANGE.maximum
+        spinbox_increment_value = BASE_RANGE.increment
+        isWindowOpen = False
+
+        window = Tk()
+        window.withdraw()  # Shown once the widgets have been created
+        window_top = Frame(window)
+        window_bottom = Frame(window)
+
+        window.title("Advanced Parameters")
+        window.iconbitmap(
+            os.path.dirname(os.path.abspath(__file__)) + "\\resources\\16x16.ico"
+        )
+        window.resizable(width=False, height=False)
+        window.attributes("-topmost", True)
+        window.protocol("WM_DELETE_WINDOW", onClosing)
+
+        loadToolbar()
+
+        scrollbar = Scrollbar(window_bottom, orient="vertical", command=scrollRows)
+        scrollbar.grid(row=0, column=60, rowspan=VISIBLE_ROWS, sticky=N + S, pady=(17, 0))
+        window.bind(
+            "<MouseWheel>",
+            lambda event: scrollRows("scroll", -1 if event.delta > 0 else 1, "units"),
+        )
+
+        # Slider gestures are undone and redone in the window, without stepping through each position
+        window.bind("<Control-z>", lambda event: undoChange(event, False))
+        window.bind("<Control-y>", lambda event: undoChange(event, True))
+
+        if instrumentation.enabled:
+            loadStatusStrip()
+
+        updateWindow()
+
+        window.mainloop()  # Starts the gui (blocking method)
+
+        # Resets created global variables after the gui is destroyed
+        isWindowOpen = False
+        del (
+            scaleBlocks,
+            row_keys,
+            row_ranges,
+            first_row,
+            scrollbar,
+            is_tick_pending,
+            sweep_window,
+            sweep_runner,
+            preset_history,
+            preset_names,
+            view,
+            window,
+            entry_add_value,
+            spinbox_min,
+            spinbox_max,
+            spinbox_increment,
+            is_settings_update,
+            entry_add_comment,
+            entry_add_name,
+            spinbox_min_value,
+            spinbox_max_value,
+            spinbox_increment_value,
+            window_top,
+            window_bottom,
+        )
+
+    except:
+        messagebox.showerror("Error", traceback.format_exc())
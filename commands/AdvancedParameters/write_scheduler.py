@@ -0,0 +1,64 @@
+class WriteScheduler:
+    """Sits between the sliders and the design and decides when values are written
+
+    Only the newest value of each parameter is kept, so positions a slider passed through
+    while a write was in progress are dropped. The time between writes follows the measured
+    cost of a write and its recompute, and a release always sends the final values straight away.
+    """
+
+    def __init__(self, min_interval=0.05, max_interval=2, smoothing=0.3):
+        self.min_interval = min_interval  # Seconds
+        self.max_interval = max_interval  # Seconds
+        self.smoothing = smoothing
+        self.write_time = 0  # Smoothed seconds taken by a write and recompute
+        self._pending = {}
+        self._next_write = 0
+        self._is_released = False
+
+    @property
+    def pending(self):
+        return len(self._pending) > 0
+
+    def submit(self, key, value):
+        """Queues a value, replacing any value of the same parameter that has not been written"""
+
+        self._pending[key] = value
+
+    def discard(self, key):
+        """Drops the queued value of a parameter, e.g. when it no longer exists"""
+
+        self._pending.pop(key, None)
+
+    def rename(self, key, new_key):
+        """Moves the queued value of a renamed parameter to its new key"""
+
+        if key in self._pending:
+            self._pending[new_key] = self._pending.pop(key)
+
+    def release(self):
+        """Marks the end of a drag so the queued values are written without waiting"""
+
+        self._is_released = True
+
+    def take(self, now):
+        """Returns the values that are due to be written as a {key: value} dictionary"""
+
+        if len(self._pending) == 0 or (now < self._next_write and not self._is_released):
+            return {}
+
+        writes = self._pending
+        self._pending = {}
+        self._is_released = False
+
+        return writes
+
+    def record(self, duration, now):
+        """Records how long a write took and schedules the next one"""
+
+        if self.write_time == 0:
+            self.write_time = duration
+        else:
+            self.write_time += self.smoothing * (duration - self.write_time)
+
+        interval = min(max(self.write_time, self.min_interval), self.max_interval)
+        self._next_write = now + interval
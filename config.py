@@ -2,10 +2,14 @@
 # Adding application wide global variables here is a convenient technique
 # It allows for access across multiple event handlers and modules
 
-# Set to False to remove most log messages from text palette
+# Set to True to record debug messages and write every log message to the text palette
 import os
 
-DEBUG = True
+DEBUG = False
+
+# Log messages are written to this file by a background thread, older messages are kept in
+# numbered copies of it when it gets too big
+LOG_FILE = os.path.join(os.path.expanduser("~"), ".advanced_parameters", "advanced_parameters.log")
 
 ADDIN_NAME = "Advanced Parameters"
 
@@ -19,3 +23,21 @@ my_tab_name = ""  # Only used if creating a custom Tab
 my_panel_id = "SolidModifyPanel"  # f"{ADDIN_NAME}_panel_2"
 my_panel_name = ADDIN_NAME
 my_panel_after = ""
+
+# Slider gestures defer the model compute once a design takes longer than this to recompute (seconds)
+DEFER_COMPUTE_LATENCY = 0.3
+
+# A deferred compute runs when the slider is released or left idle for this long (seconds)
+DEFER_COMPUTE_IDLE_TIME = 0.6
+
+# Set to True to write a slider's value once when it is released (or the mouse wheel stops), so each
+# gesture is one step in Fusion 360's undo history. Set to False to update the workspace while it moves.
+WRITE_ON_RELEASE = True
+
+# Set to True to record sync timings and show them in a status strip at the bottom of the window
+INSTRUMENTATION = False
+
+# Measured volume, mass and bounding box are cached for parameter values that have been seen before,
+# the most recently used are kept in memory and in a file in the user's home folder
+PROBE_CACHE_MEMORY_SIZE = 256
+PROBE_CACHE_DISK_SIZE = 10000
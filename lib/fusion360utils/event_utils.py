@@ -10,22 +10,52 @@
 #  UNINTERRUPTED OR ERROR FREE.
 
 import sys
+import threading
+import time
 from typing import Callable
 
 import adsk.core
-from .general_utils import handle_error
+from .general_utils import LEVEL_INFO, app, handle_error, logger
 
 
 # Global Variable to hold Event Handlers
 _handlers = []
 
+# Handler class of each event type, defined the first time a handler is added to that type of event
+_handler_classes = {}
+
+# Call counts and timings of each handler by name, kept when handlers are cleared
+_stats = {}
+
+# Custom event that delivers the last payload of each burst of a coalesced event on the main thread,
+# named after the add-in's package as custom event IDs are shared by every add-in
+COALESCE_EVENT_ID = f'{__name__}.coalesce'
+_coalesce_event = None
+_coalesce_handler = None
+_coalesce_lock = threading.Lock()
+_coalesced = {}  # Last args and delivery time of each coalescing handler
+
+
+class HandlerStats:
+    """Call counts and timings of an event handler."""
+
+    __slots__ = ('name', 'calls', 'deliveries', 'total_time', 'max_time')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0  # Events received
+        self.deliveries = 0  # Callbacks run, fewer than calls if the event is coalesced
+        self.total_time = 0  # Seconds
+        self.max_time = 0  # Seconds
+
 
 def add_handler(
         event: adsk.core.Event,
         callback: Callable,
         *,
         name: str = None,
-        local_handlers: list = None
+        local_handlers: list = None,
+        coalesce: float = 0
 ):
     """Adds an event handler to the specified event.
 
@@ -42,13 +72,20 @@ def add_handler(
                       be cleared using the clear_handlers function. You may want
                       to maintain your own handler list so it can be managed 
                       independently for each command.
+    coalesce -- Seconds to wait after an event before calling the callback, with only the
+                args of the last event fired in that time. Use it for frequent events where
+                only the latest one matters. This argument must be specified by its keyword.
 
     :returns:
         The event handler that was created.  You don't often need this reference, but it can be useful in some cases.
     """   
-    module = sys.modules[event.__module__]
-    handler_type = module.__dict__[event.add.__annotations__['handler']]
-    handler = _create_handler(handler_type, callback, event, name, local_handlers)
+    handler_class = _handler_class(event)
+    handler = handler_class(callback, name, coalesce)
+    (local_handlers if local_handlers is not None else _handlers).append(handler)
+
+    if coalesce > 0:
+        _register_coalesce_event()
+
     event.add(handler)
     return handler
 
@@ -56,33 +93,128 @@ def add_handler(
 def clear_handlers():
     """Clears the global list of handlers.
     """
-    global _handlers
+    global _handlers, _coalesce_event, _coalesce_handler
     _handlers = []
 
+    with _coalesce_lock:
+        _coalesced.clear()
 
-def _create_handler(
-        handler_type,
-        callback: Callable,
-        event: adsk.core.Event,
-        name: str = None,
-        local_handlers: list = None
-):
-    handler = _define_handler(handler_type, callback, name)()
-    (local_handlers if local_handlers is not None else _handlers).append(handler)
-    return handler
+    if _coalesce_event is not None:
+        app.unregisterCustomEvent(COALESCE_EVENT_ID)
+        _coalesce_event = None
+        _coalesce_handler = None
+
+
+def handler_stats() -> list:
+    """Returns the HandlerStats of every handler that has been added, slowest in total first."""
+    return sorted(_stats.values(), key=lambda stats: stats.total_time, reverse=True)
+
+
+def log_handler_stats():
+    """Lists the call counts and timings of every handler in the Text Command window."""
+    logger.log(LEVEL_INFO, 'Event handlers: calls, deliveries, total ms, max ms', force_console=True)
 
+    for stats in handler_stats():
+        logger.log(
+            LEVEL_INFO,
+            '%s: %d, %d, %.1f, %.1f',
+            stats.name,
+            stats.calls,
+            stats.deliveries,
+            stats.total_time * 1000,
+            stats.max_time * 1000,
+            force_console=True
+        )
 
-def _define_handler(handler_type, callback, name: str = None):
-    name = name or handler_type.__name__
 
+def _handler_class(event: adsk.core.Event):
+    event_type = type(event)
+    handler_class = _handler_classes.get(event_type)
+
+    if handler_class is None:
+        module = sys.modules[event.__module__]
+        handler_type = module.__dict__[event.add.__annotations__['handler']]
+        handler_class = _handler_classes[event_type] = _define_handler(handler_type)
+
+    return handler_class
+
+
+def _define_handler(handler_type):
     class Handler(handler_type):
-        def __init__(self):
+        def __init__(self, callback, name: str = None, coalesce: float = 0):
             super().__init__()
+            self.callback = callback
+            self.name = name or handler_type.__name__
+            self.coalesce = coalesce
+
+            stats_name = name or getattr(callback, '__name__', self.name)
+            self.stats = _stats.get(stats_name)
+            if self.stats is None:
+                self.stats = _stats[stats_name] = HandlerStats(stats_name)
 
         def notify(self, args):
+            self.stats.calls += 1
+
+            if self.coalesce > 0:
+                _coalesce(self, args)
+            else:
+                self.deliver(args)
+
+        def deliver(self, args):
+            start = time.perf_counter()
+
             try:
-                callback(args)
+                self.callback(args)
             except:
-                handle_error(name)
+                handle_error(self.name)
+            finally:
+                duration = time.perf_counter() - start
+                stats = self.stats
+                stats.deliveries += 1
+                stats.total_time += duration
+                if duration > stats.max_time:
+                    stats.max_time = duration
+
+                # Records logged by other threads reach Fusion's log from here, on the main thread
+                logger.flush_console()
 
     return Handler
+
+
+def _coalesce(handler, args):
+    """Keeps the args of the latest event and delivers them once the handler's wait is over."""
+    with _coalesce_lock:
+        is_scheduled = handler in _coalesced
+        _coalesced[handler] = (args, time.monotonic() + handler.coalesce)
+
+    if not is_scheduled:
+        timer = threading.Timer(handler.coalesce, app.fireCustomEvent, (COALESCE_EVENT_ID,))
+        timer.daemon = True
+        timer.start()
+
+
+def _deliver_coalesced(_):
+    now = time.monotonic()
+
+    with _coalesce_lock:
+        due = [handler for handler, (_, due_time) in _coalesced.items() if due_time <= now]
+        deliveries = [(handler, _coalesced.pop(handler)[0]) for handler in due]
+        waiting = [due_time - now for _, due_time in _coalesced.values()]
+
+    for handler, args in deliveries:
+        handler.deliver(args)
+
+    # Events that arrived after the timer started are delivered when their own wait is over
+    if len(waiting) > 0:
+        timer = threading.Timer(min(waiting), app.fireCustomEvent, (COALESCE_EVENT_ID,))
+        timer.daemon = True
+        timer.start()
+
+
+def _register_coalesce_event():
+    global _coalesce_event, _coalesce_handler
+
+    if _coalesce_event is None:
+        _coalesce_event = app.registerCustomEvent(COALESCE_EVENT_ID)
+        _coalesce_handler = _handler_class(_coalesce_event)(_deliver_coalesced, 'coalesced events')
+        _coalesce_event.add(_coalesce_handler)
@@ -9,41 +9,286 @@
 #  AUTODESK, INC. DOES NOT WARRANT THAT THE OPERATION OF THE PROGRAM WILL BE
 #  UNINTERRUPTED OR ERROR FREE.
 
+import collections
 import os
+import threading
+import time
 import traceback
 import adsk.core
 
 app = adsk.core.Application.get()
 ui = app.userInterface
 
-# Attempt to read DEBUG flag from parent config.
+# Attempt to read DEBUG flag and log file from parent config.
 try:
     from ... import config
     DEBUG = config.DEBUG
 except:
     DEBUG = False
 
+try:
+    LOG_FILE = config.LOG_FILE
+except:
+    LOG_FILE = None
+
+# Severity of log records, a logger ignores records below its level
+LEVEL_DEBUG = 10
+LEVEL_INFO = 20
+LEVEL_WARNING = 30
+LEVEL_ERROR = 40
+
+LEVEL_NAMES = {
+    LEVEL_DEBUG: 'DEBUG',
+    LEVEL_INFO: 'INFO',
+    LEVEL_WARNING: 'WARNING',
+    LEVEL_ERROR: 'ERROR',
+}
+
+# Fusion log levels of the records written to the Text Command window and log file
+FUSION_LEVELS = {
+    LEVEL_DEBUG: adsk.core.LogLevels.InfoLogLevel,
+    LEVEL_INFO: adsk.core.LogLevels.InfoLogLevel,
+    LEVEL_WARNING: adsk.core.LogLevels.WarningLogLevel,
+    LEVEL_ERROR: adsk.core.LogLevels.ErrorLogLevel,
+}
+
+
+class Logger:
+    """Records log messages with as little work as possible on the calling thread.
+
+    The level is checked before anything else, so a disabled call costs one comparison.
+    A record is stored unformatted in a bounded ring buffer, and a background thread formats
+    and appends pending records to a rotating file. Errors, and every record when DEBUG is set,
+    are also written to Fusion's log, straight away on the main thread as futil.log always has.
+    Records from other threads, e.g. the add-in's window, are kept until the main thread calls
+    flush_console(), which event handlers do after each event, so print() and app.log() are
+    only ever called from the main thread.
+
+    Arguments:
+    level -- Records below this level are ignored.
+    path -- The log file, or None to only keep records in memory.
+    buffer_size -- The number of recent records kept in memory.
+    max_bytes -- The size of the log file before it is rotated.
+    backup_count -- The number of rotated files kept, e.g. example.log.1 and example.log.2.
+    flush_interval -- Seconds between writes to the log file.
+    """
+
+    def __init__(
+            self,
+            level: int = LEVEL_INFO,
+            path: str = None,
+            buffer_size: int = 1000,
+            max_bytes: int = 1000000,
+            backup_count: int = 3,
+            flush_interval: float = 1
+    ):
+        self.level = level
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self._buffer = collections.deque(maxlen=buffer_size)
+        self._pending = collections.deque(maxlen=buffer_size)  # Records not yet in the file
+        self._console = collections.deque(maxlen=buffer_size)  # (record, is_console) from other threads
+        self._lock = threading.Lock()  # Held while the file is written
+        self._thread_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def is_enabled(self, level: int) -> bool:
+        """Returns whether records of a level are kept, e.g. to skip gathering values to log."""
+        return level >= self.level
+
+    def debug(self, message: str, *args, **fields):
+        if LEVEL_DEBUG >= self.level:
+            self._record(LEVEL_DEBUG, message, args, fields)
+
+    def info(self, message: str, *args, **fields):
+        if LEVEL_INFO >= self.level:
+            self._record(LEVEL_INFO, message, args, fields)
+
+    def warning(self, message: str, *args, **fields):
+        if LEVEL_WARNING >= self.level:
+            self._record(LEVEL_WARNING, message, args, fields)
+
+    def error(self, message: str, *args, **fields):
+        if LEVEL_ERROR >= self.level:
+            self._record(LEVEL_ERROR, message, args, fields)
+
+    def log(self, level: int, message: str, *args, force_console: bool = False, **fields):
+        """Records a message at any level.
+
+        Arguments:
+        level -- One of the LEVEL_ constants.
+        message -- The message, formatted with args by the % operator only if it is kept.
+        force_console -- Also writes the message to the Text Command window.
+        fields -- Values shown after the message as name=value.
+        """
+        if level >= self.level or force_console:
+            self._record(level, message, args, fields, force_console)
+
+    def records(self) -> list:
+        """Returns the recent records in memory as formatted lines, oldest first."""
+        return [_format_record(record) for record in list(self._buffer)]
+
+    def flush_console(self):
+        """Writes the records other threads logged to Fusion's log, must only be called on the main thread."""
+        while len(self._console) > 0:
+            try:
+                record, is_console = self._console.popleft()
+            except IndexError:
+                return
+
+            try:
+                _write_fusion_log(record, is_console)
+            except Exception:
+                pass  # Logging never stops the add-in
+
+    def flush(self):
+        """Writes the pending records to the log file."""
+        if self.path is None:
+            self._pending.clear()
+            return
+
+        with self._lock:
+            lines = []
+            while len(self._pending) > 0:
+                lines.append(_format_record(self._pending.popleft()))
+
+            if len(lines) == 0:
+                return
+
+            try:
+                text = '\n'.join(lines) + '\n'
+                self._rotate(len(text.encode('utf-8')))
+                with open(self.path, 'a', encoding='utf-8') as file:
+                    file.write(text)
+            except OSError:
+                pass  # Logging never stops the add-in
+
+    def close(self):
+        """Stops the background thread and writes the pending records, e.g. when the add-in stops."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._wake.set()
+            thread.join(self.flush_interval + 1)
+        self.flush()
+
+        if threading.current_thread() is threading.main_thread():
+            self.flush_console()
+
+    def _record(self, level, message, args, fields, force_console=False):
+        record = (time.time(), level, message, args, fields)
+        self._buffer.append(record)
+
+        # Errors and debug output keep going to Fusion's log, only ever from the main thread
+        if level >= LEVEL_ERROR or DEBUG or force_console:
+            if threading.current_thread() is threading.main_thread():
+                _write_fusion_log(record, DEBUG or force_console)
+            else:
+                self._console.append((record, DEBUG or force_console))
+
+        if self.path is not None:
+            self._pending.append(record)
+            if self._thread is None:
+                self._start()
+
+    def _start(self):
+        with self._thread_lock:
+            if self._thread is None:
+                self._wake.clear()
+                thread = threading.Thread(target=self._run, name='log writer', daemon=True)
+                self._thread = thread
+                thread.start()
+
+    def _run(self):
+        thread = threading.current_thread()
+        while self._thread is thread:
+            self._wake.wait(self.flush_interval)
+            self.flush()
+
+    def _rotate(self, size):
+        """Moves the log file to example.log.1, and older files up by one, if it would get too big."""
+        try:
+            if os.path.getsize(self.path) + size <= self.max_bytes:
+                return
+        except OSError:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            return
+
+        for index in range(self.backup_count - 1, 0, -1):
+            source = '%s.%d' % (self.path, index)
+            if os.path.exists(source):
+                os.replace(source, '%s.%d' % (self.path, index + 1))
+
+        if self.backup_count > 0:
+            os.replace(self.path, self.path + '.1')
+        else:
+            os.remove(self.path)
+
+
+def _format_message(message, args, fields) -> str:
+    if len(args) > 0:
+        try:
+            message = message % args
+        except (TypeError, ValueError):
+            message = '%s %r' % (message, args)
+
+    if len(fields) > 0:
+        message += ' ' + ' '.join('%s=%s' % field for field in fields.items())
+
+    return message
+
+
+def _format_record(record) -> str:
+    created, level, message, args, fields = record
+
+    return '%s.%03d %-7s %s' % (
+        time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created)),
+        created % 1 * 1000,
+        LEVEL_NAMES.get(level, level),
+        _format_message(message, args, fields)
+    )
+
+
+def _write_fusion_log(record, is_console):
+    _, level, message, args, fields = record
+    message = _format_message(message, args, fields)
+    fusion_level = FUSION_LEVELS.get(level, adsk.core.LogLevels.InfoLogLevel)
+
+    # Always print to console, only seen through IDE.
+    print(message)
+
+    # Log all errors to Fusion log file.
+    if level >= LEVEL_ERROR:
+        app.log(message, fusion_level, adsk.core.LogTypes.FileLogType)
+
+    # If config.DEBUG is True write all log messages to the console.
+    if is_console:
+        app.log(message, fusion_level, adsk.core.LogTypes.ConsoleLogType)
+
+
+# The add-in's logger, debug records are only kept when config.DEBUG is True
+logger = Logger(LEVEL_DEBUG if DEBUG else LEVEL_INFO, LOG_FILE)
+
 
 def log(message: str, level: adsk.core.LogLevels = adsk.core.LogLevels.InfoLogLevel, force_console: bool = False):
     """Utility function to easily handle logging in your app.
 
+    Messages are recorded by the logger, for less overhead on frequent paths use logger.debug()
+    and its relatives with % style arguments so messages are only formatted if they are kept.
+
     Arguments:
     message -- The message to log.
     level -- The logging severity level.
     force_console -- Forces the message to be written to the Text Command window. 
     """    
-    # Always print to console, only seen through IDE.
-    print(message)  
-
-    # Log all errors to Fusion log file.
     if level == adsk.core.LogLevels.ErrorLogLevel:
-        log_type = adsk.core.LogTypes.FileLogType
-        app.log(message, level, log_type)
-
-    # If config.DEBUG is True write all log messages to the console.
-    if DEBUG or force_console:
-        log_type = adsk.core.LogTypes.ConsoleLogType
-        app.log(message, level, log_type)
+        logger.log(LEVEL_ERROR, message, force_console=force_console)
+    elif level == adsk.core.LogLevels.WarningLogLevel:
+        logger.log(LEVEL_WARNING, message, force_console=force_console)
+    else:
+        logger.log(LEVEL_INFO, message, force_console=force_console)
 
 
 def handle_error(name: str, show_message_box: bool = False):
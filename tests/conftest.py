@@ -0,0 +1,13 @@
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The engine's modules are imported without running the add-in's __init__ or importing adsk, the
+# same way as the benchmarks, which also provide the fake design
+package = types.ModuleType("advanced_parameters")
+package.__path__ = [os.path.join(ROOT, "commands", "AdvancedParameters")]
+sys.modules["advanced_parameters"] = package
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
@@ -0,0 +1,57 @@
+from advanced_parameters.dependency_graph import DependencyGraph, parse_references
+from advanced_parameters.parameter_table import ParameterTable
+
+
+def table(expressions, unit="mm"):
+    parameters = ParameterTable()
+
+    for name, expression in expressions.items():
+        parameters.index[name] = len(parameters.names)
+        parameters.names.append(name)
+        parameters.expressions.append(expression)
+        parameters.units.append(unit)
+
+    return parameters
+
+
+def test_parse_references():
+    assert parse_references("a * 2 + b1 / 1e3", {"a", "b1", "c"}) == {"a", "b1"}
+
+
+def test_derived():
+    graph = DependencyGraph()
+    graph.update(table({"a": "10 mm", "b": "a * 2", "c": "d3 * 2", "e": "5"}))
+
+    assert not graph.is_derived("a")
+    assert graph.is_derived("b")
+    assert graph.is_derived("c")
+    assert not graph.is_derived("e")
+
+
+def test_dependents_and_order():
+    graph = DependencyGraph()
+    graph.update(table({"c": "b + 1", "b": "a * 2", "a": "10 mm", "d": "a + c"}))
+
+    assert graph.dependents_of(["a"]) == {"b", "c", "d"}
+    order = graph.ordered(["a", "b", "c", "d"])
+    assert order.index("a") < order.index("b") < order.index("c") < order.index("d")
+
+
+def test_long_chain_is_ordered_without_recursion():
+    expressions = {"p0": "1 mm"}
+    expressions.update({"p%d" % i: "p%d + 1" % (i - 1) for i in range(1, 1500)})
+
+    graph = DependencyGraph()
+    graph.update(table(expressions))
+
+    assert graph.ordered(expressions) == list(expressions)
+    assert len(graph.dependents_of(["p0"])) == 1499
+
+
+def test_only_changed_expressions_are_parsed():
+    graph = DependencyGraph()
+    graph.update(table({"a": "10 mm", "b": "a * 2"}))
+    graph.update(table({"a": "10 mm", "b": "20 mm"}))
+
+    assert not graph.is_derived("b")
+    assert graph.dependents_of(["a"]) == set()
@@ -0,0 +1,82 @@
+import pytest
+
+from advanced_parameters.expression_evaluator import ExpressionEvaluator, is_literal
+
+VALUES = {"a": 1.0, "b": 0.5}  # 10 mm and 5 mm in internal units
+
+
+def evaluate(expression, unit="mm"):
+    return ExpressionEvaluator().evaluate(expression, unit, VALUES.__getitem__)
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("10", 1.0),
+        ("10 mm", 1.0),
+        ("1 cm + 5", 1.5),
+        ("a * 2", 2.0),
+        ("a + b", 1.5),
+        ("a + 5", 1.5),
+        ("2 ^ 3", 0.8),
+        ("-a", -1.0),
+    ],
+)
+def test_arithmetic(expression, expected):
+    assert evaluate(expression) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("abs(a)", 1.0),
+        ("abs(-a)", 1.0),
+        ("round(a)", 1.0),
+        ("floor(a)", 1.0),
+        ("ceil(a)", 1.0),
+        ("sqrt(a * a)", 1.0),
+        ("max(a, 5)", 1.0),
+        ("min(a, 5)", 0.5),
+        ("max(a, b)", 1.0),
+        ("max(2, 3)", 0.3),
+    ],
+)
+def test_functions_keep_units(expression, expected):
+    assert evaluate(expression) == pytest.approx(expected)
+
+
+def test_rounding_is_in_the_parameters_unit():
+    values = {"c": 1.04}  # 10.4 mm
+    evaluator = ExpressionEvaluator()
+
+    assert evaluator.evaluate("round(c)", "mm", values.__getitem__) == pytest.approx(1.0)
+    assert evaluator.evaluate("ceil(c)", "mm", values.__getitem__) == pytest.approx(1.1)
+
+
+@pytest.mark.parametrize("expression", ["(-8) ^ (1 / 3)", "sqrt(-1)", "1 / 0", "a +", "d3 * 2"])
+def test_no_value(expression):
+    assert evaluate(expression) is None
+
+
+def test_results_are_cached():
+    evaluator = ExpressionEvaluator()
+
+    evaluator.evaluate("a * 2", "mm", VALUES.__getitem__)
+    evaluator.evaluate("a * 2", "mm", VALUES.__getitem__)
+
+    assert (evaluator.hits, evaluator.misses) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "expression, unit, expected",
+    [
+        ("10 mm", "mm", True),
+        ("5 kg", "kg", True),
+        ("1.5", "", True),
+        ("a * 2", "mm", False),
+        ("d3 * 2", "mm", False),
+        ("unknown(2)", "mm", False),
+    ],
+)
+def test_is_literal(expression, unit, expected):
+    assert is_literal(expression, unit) == expected
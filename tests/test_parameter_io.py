@@ -0,0 +1,109 @@
+import json
+
+from advanced_parameters.parameter_io import export_rows, validate
+from advanced_parameters.parameter_table import ParameterTable
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_csv(tmp_path):
+    path = write(
+        tmp_path,
+        "parameters.csv",
+        "name,expression,unit,comment\nb,a * 2,,\na,10,mm,width\nangle,45 deg,,\n",
+    )
+
+    rows, errors = validate(path, "cm")
+
+    assert errors == []
+    assert [row.name for row in rows] == ["a", "b", "angle"]
+    assert [row.unit for row in rows] == ["mm", "cm", "deg"]
+    assert [row.line_number for row in rows] == [3, 2, 4]
+
+
+def test_json_array_rows_are_numbered_by_line(tmp_path):
+    path = write(
+        tmp_path,
+        "parameters.json",
+        '\n[\n  {"name": "a", "expression": "10 mm"},\n\n  {"name": "1b", "expression": "2"}\n]\n',
+    )
+
+    rows, errors = validate(path, "mm")
+
+    assert [(row.name, row.line_number) for row in rows] == [("a", 3)]
+    assert errors == [(5, "Invalid name '1b'")]
+
+
+def test_invalid_json_array(tmp_path):
+    path = write(
+        tmp_path, "parameters.json", '[\n{"name": "a", "expression": "1"}\n{"name": "b"}\n]'
+    )
+
+    rows, errors = validate(path, "mm")
+
+    assert [row.name for row in rows] == ["a"]
+    assert [line_number for line_number, _ in errors] == [3]
+
+
+def test_json_lines_carry_on_after_an_invalid_line(tmp_path):
+    path = write(
+        tmp_path,
+        "parameters.jsonl",
+        '{"name": "a", "expression": "1"}\nnot json\n{"name": "a", "expression": "2"}\n',
+    )
+
+    rows, errors = validate(path, "mm")
+
+    assert [row.name for row in rows] == ["a"]
+    assert [line_number for line_number, _ in errors] == [2, 3]
+
+
+def test_cycles_are_reported(tmp_path):
+    path = write(
+        tmp_path,
+        "parameters.csv",
+        "name,expression,unit,comment\na,b + 1,,\nb,a + 1,,\nc,5,,\n",
+    )
+
+    rows, errors = validate(path, "mm")
+
+    assert [row.name for row in rows] == ["a", "c"]
+    assert errors == [(3, "b refers to itself through a")]
+
+
+def test_long_chain_is_ordered_without_recursion(tmp_path):
+    lines = ["name,expression,unit,comment"]
+    lines += ["p%d,p%d + 1,," % (i, i + 1) for i in range(1499)]
+    lines.append("p1499,1,,")
+    path = write(tmp_path, "parameters.csv", "\n".join(lines) + "\n")
+
+    rows, errors = validate(path, "mm")
+
+    assert errors == []
+    assert [row.name for row in rows] == ["p%d" % i for i in reversed(range(1500))]
+
+
+def test_export_round_trip(tmp_path):
+    table = ParameterTable()
+    table.names = ["a", "b"]
+    table.expressions = ["10 mm", "a * 2"]
+    table.units = ["mm", "mm"]
+    table.comments = ["width", ""]
+
+    for name in ("parameters.csv", "parameters.json", "parameters.jsonl"):
+        path = str(tmp_path / name)
+        export_rows(path, table)
+        rows, errors = validate(path, "mm")
+
+        assert errors == []
+        assert [(row.name, row.expression, row.comment) for row in rows] == [
+            ("a", "10 mm", "width"),
+            ("b", "a * 2", ""),
+        ]
+
+    with open(str(tmp_path / "parameters.json")) as file:
+        assert len(json.load(file)) == 2
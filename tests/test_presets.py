@@ -0,0 +1,42 @@
+from advanced_parameters.presets import Presets, load_presets, save_presets
+from fake_adsk import FakeDesign
+
+
+def test_presets_are_stored_as_differences_from_the_first():
+    presets = Presets()
+    presets.save("A", {"a": 1, "b": 2})
+    presets.save("B", {"a": 1, "b": 3})
+
+    assert presets.deltas == {"A": {}, "B": {"b": 3}}
+    assert presets.values("B") == {"a": 1, "b": 3}
+    assert presets.names() == ["A", "B"]
+
+    presets.delete("A")
+    assert presets.names() == ["B"]
+
+
+def test_json_round_trip():
+    presets = Presets()
+    presets.save("A", {"a": 1.5})
+    presets.save("B", {"a": 2.5})
+
+    loaded = Presets.from_json(presets.to_json())
+
+    assert loaded.base == presets.base and loaded.deltas == presets.deltas
+
+
+def test_invalid_json():
+    assert Presets.from_json("not json") is None
+    assert Presets.from_json('{"version": 99, "base": {}, "presets": {}}') is None
+    assert Presets.from_json('{"version": 1}') is None
+
+
+def test_stored_in_the_design():
+    design = FakeDesign()
+    assert load_presets(design).names() == []
+
+    presets = Presets()
+    presets.save("A", {"a": 1})
+    save_presets(design, presets)
+
+    assert load_presets(design).values("A") == {"a": 1}
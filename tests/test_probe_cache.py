@@ -0,0 +1,65 @@
+import pytest
+
+from advanced_parameters.probe_cache import ProbeCache
+
+VECTOR = [["a", 1.0], ["b", 2.0]]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "probes" / "cache.sqlite")
+
+
+def test_memory_and_disk_hits(path):
+    cache = ProbeCache(path)
+    assert cache.get("design", "1", VECTOR) is None
+
+    cache.put("design", "1", VECTOR, [1, 2])
+    assert cache.get("design", "1", VECTOR) == (1, 2)
+    cache.close()
+
+    # A new cache reads the entry back from the file
+    cache = ProbeCache(path)
+    assert cache.get("design", "1", VECTOR) == (1, 2)
+    assert cache.get("design", "1", VECTOR) == (1, 2)
+    assert cache.summary() == {"memory hits": 1, "disk hits": 1, "misses": 0}
+    cache.close()
+
+
+def test_uncounted_lookups(path):
+    cache = ProbeCache(path)
+    cache.get("design", "1", VECTOR, is_counted=False)
+
+    assert cache.summary()["misses"] == 0
+    cache.close()
+
+
+def test_new_version_drops_old_entries(path):
+    cache = ProbeCache(path)
+    cache.put("design", "1", VECTOR, [1])
+    cache.put("other", "1", VECTOR, [2])
+
+    assert cache.get("design", "2", VECTOR) is None
+    assert cache.get("design", "1", VECTOR) is None
+    assert cache.get("other", "1", VECTOR) == (2,)
+    cache.close()
+
+
+def test_clear(path):
+    cache = ProbeCache(path)
+    cache.put("design", "1", VECTOR, [1])
+    cache.clear("design")
+
+    assert cache.get("design", "1", VECTOR) is None
+    cache.close()
+
+
+def test_disk_size(path):
+    cache = ProbeCache(path, memory_size=1, disk_size=2)
+    for index in range(3):
+        cache.put("design", "1", [["a", index]], [index])
+
+    assert cache.get("design", "1", [["a", 0]]) is None
+    assert cache.get("design", "1", [["a", 1]]) == (1,)
+    assert cache.get("design", "1", [["a", 2]]) == (2,)
+    cache.close()
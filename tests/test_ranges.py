@@ -0,0 +1,34 @@
+import pytest
+
+from advanced_parameters.ranges import SliderRange, compute_ranges, precision
+
+
+def test_quantize():
+    slider_range = SliderRange(0, 10, 0.5)
+
+    assert slider_range.quantize(3.3) == 3.5
+    assert slider_range.quantize(-2) == 0
+    assert slider_range.quantize(12) == 10
+
+
+def test_fits():
+    slider_range = SliderRange(0, 10, 0.1)
+
+    assert slider_range.fits(2.5)
+    assert not slider_range.fits(2.55)
+    assert not slider_range.fits(11)
+
+
+@pytest.mark.parametrize("value, expected", [(3, None), (2.5, 0.1), (0.125, 0.001), (1e-7, None)])
+def test_precision(value, expected):
+    assert precision(value) == expected
+
+
+def test_compute_ranges_widens_each_unit():
+    ranges = compute_ranges(
+        [5, 250, -3, 0.25, 90], ["mm", "mm", "mm", "in", "deg"], SliderRange(0, 100, 1)
+    )
+
+    assert ranges["mm"] == SliderRange(-3, 250, 1)
+    assert ranges["in"] == SliderRange(0, 100, 0.01)
+    assert ranges["deg"] == SliderRange(0, 100, 1)
@@ -0,0 +1,13 @@
+from advanced_parameters.reconcile import reconcile
+
+
+def test_unchanged():
+    assert reconcile(["a", "b"], ["a", "b"]) == ([], [], [])
+
+
+def test_added_removed_and_moved():
+    assert reconcile(["a", "b", "c"], ["b", "c", "d"]) == (["a"], ["d"], ["b", "c"])
+
+
+def test_rename_keeps_position():
+    assert reconcile(["a", "b", "c"], ["a", "x", "c"]) == (["b"], ["x"], [])
@@ -0,0 +1,289 @@
+import pytest
+
+from advanced_parameters.presets import load_presets
+from advanced_parameters.ranges import SliderRange
+from advanced_parameters.sync_engine import ParameterSyncEngine
+from fake_adsk import FakeDesign, FakeValueInput
+
+
+class ActiveDesign:
+    """Stands in for the active product so a test can switch designs"""
+
+    def __init__(self, design):
+        self.active = design
+
+
+def create_engine(design, **options):
+    active_design = design if isinstance(design, ActiveDesign) else ActiveDesign(design)
+    return ParameterSyncEngine(
+        lambda: active_design.active,
+        FakeValueInput.createByReal,
+        SliderRange(0, 1000, 1),
+        **options
+    )
+
+
+def synced_engine(design, **options):
+    """Returns an engine that has done its first full sync of a design at time 0"""
+
+    engine = create_engine(design, **options)
+    engine.change_tracker.mark_all()
+    engine.tick(0)
+    return engine
+
+
+def value(design, name):
+    return design.userParameters.itemByName(name)._value
+
+
+def test_first_sync():
+    design = FakeDesign.with_parameters(10)
+    engine = create_engine(design)
+    engine.change_tracker.mark_all()
+
+    result = engine.tick(0)
+
+    assert result.is_full_sync and result.is_rendered and result.is_design_switched
+    assert result.view.names == ["p%d" % index for index in range(10)]
+    assert result.view.derived == {"p9"}
+    assert engine.slider_values["p1"] == pytest.approx(1)  # 0.1 cm in mm
+    assert engine.tick(0.01) is None
+
+
+def test_slider_write():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design)
+    computes = design.computes
+
+    engine.move_slider("p1", 5)
+    result = engine.tick(0.1)
+
+    assert result.is_written
+    assert value(design, "p1") == pytest.approx(0.5)
+    assert design.computes == computes + 1
+
+
+def test_derived_sliders_are_not_written():
+    design = FakeDesign.with_parameters(10)
+    engine = synced_engine(design)
+
+    engine.move_slider("p9", 50)
+
+    assert engine.tick(0.1) is None
+    assert value(design, "p9") == pytest.approx(1.6)
+
+
+def test_gesture_is_one_write_and_one_undo_step():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design, write_on_release=True)
+    computes = design.computes
+
+    engine.press_slider(1)
+    for step in range(1, 6):
+        now = 1 + step * 0.1
+        engine.move_slider("p1", 1 + step)
+        engine.drag_slider(now)
+        assert not engine.tick(now).is_written
+
+    assert design.computes == computes
+    engine.release_slider()
+    assert engine.tick(2).is_written
+    assert design.computes == computes + 1
+    assert value(design, "p1") == pytest.approx(0.6)
+
+    assert engine.undo() == ["p1"]
+    assert value(design, "p1") == pytest.approx(0.1)
+    assert not engine.undo_stack.can_undo
+
+    assert engine.redo() == ["p1"]
+    assert value(design, "p1") == pytest.approx(0.6)
+
+
+def test_scroll_gesture_ends_when_idle():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design, write_on_release=True)
+
+    engine.scroll_slider(1)
+    engine.move_slider("p2", 3)
+    assert not engine.tick(1.1).is_written
+
+    assert engine.tick(1 + engine.gesture_idle_time).is_written
+    assert engine.gesture is None
+    assert engine.undo_stack.can_undo
+
+
+def test_slider_input_previews_dependents():
+    design = FakeDesign.with_parameters(10)
+    engine = synced_engine(design)
+
+    engine.slider_input.move("p8", 20)
+    result = engine.tick(0.1)
+
+    assert result.positions["p9"] == (pytest.approx(40), True)
+
+    result = engine.tick(0.2)
+
+    assert result.positions["p9"] == (pytest.approx(40), False)
+    assert value(design, "p9") == pytest.approx(4)
+
+
+def test_external_change_moves_the_slider():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design)
+
+    design.change_externally(2, 0.7)
+    engine.change_tracker.mark_all()
+    result = engine.tick(0.1)
+
+    assert "p2" in result.slider_keys
+    assert result.positions["p2"] == (pytest.approx(7), False)
+    assert not result.is_written
+
+
+def test_external_rename_keeps_slider_state():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design)
+    engine.move_slider("p1", 5)
+    engine.set_top_key("p1")
+
+    design.userParameters._items[1]._name = "width"
+    engine.change_tracker.mark_all()
+    result = engine.tick(0.1)
+
+    assert result.is_rendered
+    assert "p1" not in engine.slider_values
+    assert engine.top_key == "width"
+    assert result.view.names == ["p0", "width", "p2", "p3"]
+
+    # The move made before the rename is still written
+    assert value(design, "width") == pytest.approx(0.5)
+
+
+def test_rename():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design)
+
+    assert engine.rename("p2", "height")
+    assert engine.table.names[2] == "height"
+    assert engine.slider_values["height"] == pytest.approx(2)
+
+
+def test_deleted_parameters_are_dropped():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design)
+    engine.move_slider("p2", 9)
+
+    design.userParameters._items[2].deleteMe()
+    engine.change_tracker.mark_all()
+    result = engine.tick(0.1)
+
+    assert result.view.names == ["p0", "p1", "p3"]
+    assert "p2" not in engine.slider_values
+    assert not engine.write_scheduler.pending
+
+
+def test_presets():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design)
+    engine.save_preset("A")
+
+    engine.move_slider("p1", 5)
+    engine.move_slider("p2", 6)
+    engine.tick(0.1)
+    engine.save_preset("B")
+
+    assert load_presets(design).names() == ["A", "B"]
+    assert load_presets(design).deltas["B"] == {"p1": 0.5, "p2": 0.6}
+
+    # Switching between the two presets is one batched write each way
+    computes = design.computes
+
+    assert sorted(engine.apply_preset("A")) == ["p1", "p2"]
+    assert (value(design, "p1"), value(design, "p2")) == (pytest.approx(0.1), pytest.approx(0.2))
+    assert sorted(engine.apply_preset("B")) == ["p1", "p2"]
+    assert (value(design, "p1"), value(design, "p2")) == (pytest.approx(0.5), pytest.approx(0.6))
+    assert engine.apply_preset("B") == []
+    assert design.computes == computes + 2
+
+    engine.undo()
+    assert value(design, "p1") == pytest.approx(0.1)
+
+    engine.delete_preset("A")
+    assert load_presets(design).names() == ["B"]
+
+
+def test_selection_blocks_writes_until_cleared():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design)
+    engine.selection_tracker.update(1)
+
+    engine.move_slider("p1", 5)
+    result = engine.tick(0.1)
+
+    assert result.is_selection_blocked and not result.is_written
+    assert value(design, "p1") == pytest.approx(0.1)
+
+    # As the active selection event does when the selection is cleared
+    for key in engine.selection_tracker.update(0):
+        engine.change_tracker.mark(key)
+
+    assert engine.tick(0.2).is_written
+    assert value(design, "p1") == pytest.approx(0.5)
+
+
+def test_design_switch_restores_cached_state():
+    first = FakeDesign.with_parameters(4)
+    active_design = ActiveDesign(first)
+    engine = synced_engine(active_design)
+    engine.move_slider("p1", 5)
+    engine.tick(0.1)
+    undo_stack = engine.undo_stack
+
+    active_design.active = FakeDesign.with_parameters(6)
+    engine.change_tracker.mark_all()
+    result = engine.tick(0.2)
+
+    assert result.is_design_switched
+    assert result.view.names == ["p%d" % index for index in range(6)]
+    assert engine.slider_values["p1"] == pytest.approx(1)
+
+    active_design.active = first
+    engine.change_tracker.mark_all()
+    calls = first.calls
+    result = engine.tick(0.3)
+
+    assert result.is_design_switched and result.is_layout_loaded
+    assert engine.undo_stack is undo_stack
+    assert engine.slider_values["p1"] == pytest.approx(5)
+
+    # The units and the layout are not read again, unlike on a design's first sync
+    fresh = FakeDesign.with_parameters(4)
+    synced_engine(fresh)
+    assert first.calls - calls < fresh.calls
+
+
+def test_finish_writes_a_held_gesture():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design, write_on_release=True)
+
+    engine.press_slider(1)
+    engine.move_slider("p1", 3)
+    engine.drag_slider(1.1)
+    engine.tick(1.1)
+    engine.finish(1.2)
+
+    assert value(design, "p1") == pytest.approx(0.3)
+    assert engine.gesture is None
+
+
+def test_has_work():
+    design = FakeDesign.with_parameters(4)
+    engine = synced_engine(design)
+
+    assert not engine.has_work(1)
+    engine.slider_input.move("p1", 2)
+    assert engine.has_work(1)
+    engine.tick(1)
+    engine.tick(1.1)
+    assert not engine.has_work(1.2)
+    assert engine.has_work(1.2 + engine.safety_net_interval)
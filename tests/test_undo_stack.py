@@ -0,0 +1,53 @@
+from advanced_parameters.undo_stack import Change, Gesture, UndoStack
+
+
+def test_undo_and_redo():
+    stack = UndoStack()
+    first = Change({"a": 1}, {"a": 2})
+    second = Change({"a": 2}, {"a": 3})
+    stack.push(first)
+    stack.push(second)
+
+    assert stack.undo() is second
+    assert stack.undo() is first
+    assert stack.undo() is None
+    assert stack.redo() is first
+    assert stack.can_undo and stack.can_redo
+
+
+def test_a_new_change_forgets_undone_changes():
+    stack = UndoStack()
+    stack.push(Change({"a": 1}, {"a": 2}))
+    stack.undo()
+    stack.push(Change({"b": 1}, {"b": 2}))
+
+    assert not stack.can_redo
+
+
+def test_empty_changes_are_not_recorded():
+    stack = UndoStack()
+    stack.push(Change({}, {}))
+
+    assert not stack.can_undo
+
+
+def test_size():
+    stack = UndoStack(2)
+    for value in range(3):
+        stack.push(Change({"a": value}, {"a": value + 1}))
+
+    assert stack.undo().before == {"a": 2}
+    assert stack.undo().before == {"a": 1}
+    assert stack.undo() is None
+
+
+def test_gesture_ends():
+    drag = Gesture(True, 0)
+    scroll = Gesture(False, 0)
+
+    assert not drag.is_ended(10, 0.6)
+    assert not scroll.is_ended(0.5, 0.6)
+    assert scroll.is_ended(0.6, 0.6)
+
+    drag.is_released = True
+    assert drag.is_ended(0, 0.6)